@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped binary dictionary: compile all dictionaries once, open instantly.
+
+Parsing every CSV at startup costs each process the same work. The compiler
+writes all dictionary records (one per translation, as in TermIndex) into a
+single versioned file:
+
+    header          magic, format version, counts, section offsets
+    string table    deduplicated UTF-8 strings, referenced by (offset, length)
+    records         fixed-width structs, sorted by normalised source term
+    source index    sorted (key, first record, record count) entries
+    target index    sorted (key, first posting, posting count) entries
+    postings        record numbers for the target index
+    inputs          (path, mtime, size) of every dictionary file compiled in
+
+The reader mmaps the file read-only and answers exact, reverse and prefix
+lookups with binary search over the key indexes, decoding only the records
+it returns. Nothing is deserialised up front, so opening the file costs
+about as much as opening any file. Forked workers that open the same file
+share its pages through the OS page cache.
+
+Opening the file also stats the dictionary files and compares them with the
+inputs section, so a dictionary that was edited, added or removed after the
+build is noticed without re-reading any CSV.
+
+The only reader is term_index.py --binary (exact, target and prefix
+lookups). The lookup server keeps the in-memory TermIndex because it also
+serves fuzzy, reverse and language-filtered prefix queries, and
+validate_extraction.py checks its spot-check terms during its own
+streaming pass over the dictionaries.
+
+Usage:
+    python scripts/binary_dictionary.py build           # skipped when inputs are unchanged
+    python scripts/binary_dictionary.py info
+    python scripts/term_index.py "vaste inrichting" --binary
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from dictionary_loader import BASE_DIR, DATA_DIR, iter_dictionary_files, load_dictionaries, normalise_key
+from term_index import FIELDS, TermRecord
+
+DEFAULT_BINARY_PATH = BASE_DIR / 'lexlink.dict'
+MAGIC = b'LXLDICT\x00'
+FORMAT_VERSION = 2
+BUILD_HINT = "run python scripts/binary_dictionary.py build first"
+
+# magic, version, reserved, records, source keys, target keys, postings, inputs,
+# strings/records/source index/target index/postings/inputs offsets, strings size
+HEADER = struct.Struct('<8sHHIIIII7Q')
+RECORD = struct.Struct('<' + 'II' * len(FIELDS) + 'B3x')
+INDEX_ENTRY = struct.Struct('<IIII')
+POSTING = struct.Struct('<I')
+# path offset, path length, mtime in nanoseconds, size in bytes
+INPUT_ENTRY = struct.Struct('<IIqQ')
+
+
+def input_stats(data_dir=DATA_DIR):
+    """(relative path, mtime_ns, size) of every dictionary file, sorted by path."""
+    data_dir = Path(data_dir)
+    stats = []
+    for path in iter_dictionary_files(data_dir):
+        stat = path.stat()
+        stats.append((path.relative_to(data_dir).as_posix(), stat.st_mtime_ns, stat.st_size))
+    return stats
+
+
+class _StringTable:
+    """Deduplicating UTF-8 string table."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._offsets = {}
+
+    def add(self, text):
+        """Return (offset, length) of text, appending it once."""
+        ref = self._offsets.get(text)
+        if ref is None:
+            encoded = text.encode('utf-8')
+            ref = self._offsets[text] = (len(self.data), len(encoded))
+            self.data += encoded
+        return ref
+
+
+def compile_dictionary(output_path=DEFAULT_BINARY_PATH, data_dir=DATA_DIR):
+    """
+    Compile every dictionary under data/ into one binary file.
+
+    The file is written next to the destination and moved into place with
+    os.replace, so readers never see a partial file. The inputs are stat'ed
+    before they are read, so a file edited during the build shows up as
+    stale on the next open.
+
+    Returns:
+        Dict with record, key and byte counts
+    """
+    data_dir = Path(data_dir)
+    output_path = Path(output_path)
+    inputs = input_stats(data_dir)
+
+    records = []
+    for entry in load_dictionaries(data_dir):
+        for target, lang_target in entry['targets'] or [('', '')]:
+            records.append(dict(entry, target=target, lang_target=lang_target))
+    for record in records:
+        record['source_key'] = normalise_key(record['source']).encode('utf-8')
+    records.sort(key=lambda record: record['source_key'])
+
+    strings = _StringTable()
+    record_data = bytearray(RECORD.size * len(records))
+    source_keys = []     # [key, first record, count]
+    target_keys = {}     # key -> [record numbers]
+    for number, record in enumerate(records):
+        refs = []
+        for field in FIELDS:
+            refs.extend(strings.add(record.get(field) or ''))
+        RECORD.pack_into(record_data, number * RECORD.size, *refs, 1 if record.get('reviewed') else 0)
+
+        if source_keys and source_keys[-1][0] == record['source_key']:
+            source_keys[-1][2] += 1
+        else:
+            source_keys.append([record['source_key'], number, 1])
+        if record['target']:
+            target_keys.setdefault(normalise_key(record['target']).encode('utf-8'), []).append(number)
+
+    source_index = bytearray()
+    for key, first, count in source_keys:
+        offset, length = strings.add(key.decode('utf-8'))
+        source_index += INDEX_ENTRY.pack(offset, length, first, count)
+
+    target_index = bytearray()
+    postings = bytearray()
+    posting_count = 0
+    for key in sorted(target_keys):
+        offset, length = strings.add(key.decode('utf-8'))
+        numbers = target_keys[key]
+        target_index += INDEX_ENTRY.pack(offset, length, posting_count, len(numbers))
+        for number in numbers:
+            postings += POSTING.pack(number)
+        posting_count += len(numbers)
+
+    input_data = bytearray()
+    for relative_path, mtime_ns, size in inputs:
+        input_data += INPUT_ENTRY.pack(*strings.add(relative_path), mtime_ns, size)
+
+    strings_offset = HEADER.size
+    records_offset = strings_offset + len(strings.data)
+    source_offset = records_offset + len(record_data)
+    target_offset = source_offset + len(source_index)
+    postings_offset = target_offset + len(target_index)
+    inputs_offset = postings_offset + len(postings)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(records), len(source_keys), len(target_keys),
+                         posting_count, len(inputs), strings_offset, records_offset, source_offset,
+                         target_offset, postings_offset, inputs_offset, len(strings.data))
+
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        for section in (header, strings.data, record_data, source_index, target_index, postings, input_data):
+            f.write(section)
+    os.replace(tmp_path, output_path)
+
+    return {
+        'records': len(records),
+        'source_keys': len(source_keys),
+        'target_keys': len(target_keys),
+        'string_bytes': len(strings.data),
+        'bytes': output_path.stat().st_size,
+    }
+
+
+class _KeyIndex:
+    """Sequence view of a sorted key index, so bisect can search it in place."""
+
+    def __init__(self, reader, offset, count):
+        self._reader = reader
+        self._offset = offset
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        key_offset, key_length, _, _ = INDEX_ENTRY.unpack_from(
+            self._reader._mm, self._offset + i * INDEX_ENTRY.size)
+        return self._reader._bytes(key_offset, key_length)
+
+    def entry(self, i):
+        return INDEX_ENTRY.unpack_from(self._reader._mm, self._offset + i * INDEX_ENTRY.size)[2:]
+
+
+class BinaryDictionary:
+    """
+    Read-only, memory-mapped view of a compiled dictionary.
+
+    Offers the same lookup methods as TermIndex (exact, reverse and prefix)
+    and returns TermRecord objects. `stale_inputs` lists the dictionary
+    files changed since the build; it is empty when the file is current.
+
+    Usage:
+        with BinaryDictionary() as dictionary:
+            dictionary.lookup('vaste inrichting')
+            dictionary.prefix('belasting', limit=10)
+    """
+
+    def __init__(self, path=DEFAULT_BINARY_PATH, data_dir=DATA_DIR):
+        self.path = Path(path)
+        try:
+            with open(self.path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{self.path} does not exist; {BUILD_HINT}") from None
+        if len(self._mm) < 10 or self._mm[:8] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a LexLink binary dictionary")
+        version = struct.unpack_from('<H', self._mm, 8)[0]
+        if version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} has format version {version}, expected {FORMAT_VERSION}; "
+                             "rebuild it with python scripts/binary_dictionary.py build")
+        (_, _, _, self._record_count, source_count, target_count, _, self._input_count,
+         self._strings_offset, self._records_offset, source_offset, target_offset,
+         self._postings_offset, self._inputs_offset, _) = HEADER.unpack_from(self._mm, 0)
+        self._source_index = _KeyIndex(self, source_offset, source_count)
+        self._target_index = _KeyIndex(self, target_offset, target_count)
+        self.stale_inputs = self.changed_inputs(data_dir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+
+    def __len__(self):
+        return self._record_count
+
+    def inputs(self):
+        """(relative path, mtime_ns, size) of the dictionary files compiled in."""
+        inputs = []
+        for i in range(self._input_count):
+            path_offset, path_length, mtime_ns, size = INPUT_ENTRY.unpack_from(
+                self._mm, self._inputs_offset + i * INPUT_ENTRY.size)
+            inputs.append((self._bytes(path_offset, path_length).decode('utf-8'), mtime_ns, size))
+        return inputs
+
+    def changed_inputs(self, data_dir=DATA_DIR):
+        """
+        Dictionary files added, removed or modified since the build.
+
+        Compares path, mtime and size only; nothing is re-read.
+        """
+        built = {path: (mtime_ns, size) for path, mtime_ns, size in self.inputs()}
+        current = {path: (mtime_ns, size) for path, mtime_ns, size in input_stats(data_dir)}
+        return sorted(path for path in built.keys() | current.keys() if built.get(path) != current.get(path))
+
+    def is_stale(self, data_dir=DATA_DIR):
+        """True when the dictionary files changed since the file was compiled."""
+        return bool(self.changed_inputs(data_dir))
+
+    def _bytes(self, offset, length):
+        start = self._strings_offset + offset
+        return self._mm[start:start + length]
+
+    def record(self, number):
+        values = RECORD.unpack_from(self._mm, self._records_offset + number * RECORD.size)
+        fields = {field: self._bytes(values[2 * i], values[2 * i + 1]).decode('utf-8')
+                  for i, field in enumerate(FIELDS)}
+        return TermRecord.from_values(number, reviewed=values[-1], **fields)
+
+    def _find(self, index, term):
+        key = normalise_key(term).encode('utf-8')
+        i = bisect_left(index, key)
+        if i < len(index) and index[i] == key:
+            return index.entry(i)
+        return None
+
+    def lookup(self, term, lang=None):
+        """Records whose source term matches `term` exactly (case-insensitive)."""
+        entry = self._find(self._source_index, term)
+        records = [self.record(n) for n in range(entry[0], entry[0] + entry[1])] if entry else []
+        if lang:
+            records = [r for r in records if r.lang_source == lang]
+        return records
+
+    def lookup_target(self, term, lang=None):
+        """Records whose target term matches `term` exactly (case-insensitive)."""
+        entry = self._find(self._target_index, term)
+        if not entry:
+            return []
+        first, count = entry
+        numbers = struct.unpack_from(f'<{count}I', self._mm, self._postings_offset + first * POSTING.size)
+        records = [self.record(n) for n in numbers]
+        if lang:
+            records = [r for r in records if r.lang_target == lang]
+        return records
+
+    def __contains__(self, term):
+        return self._find(self._source_index, term) is not None
+
+    def prefix(self, prefix, limit=20):
+        """
+        Records whose source term starts with `prefix` (autocomplete).
+
+        At most `limit` distinct source terms are returned, alphabetically.
+        """
+        key = normalise_key(prefix).encode('utf-8')
+        records = []
+        i = bisect_left(self._source_index, key)
+        for i in range(i, min(i + limit, len(self._source_index))):
+            if not self._source_index[i].startswith(key):
+                break
+            first, count = self._source_index.entry(i)
+            records.extend(self.record(n) for n in range(first, first + count))
+        return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile or inspect the binary LexLink dictionary.")
+    parser.add_argument('command', choices=('build', 'info'))
+    parser.add_argument('--output', type=Path, default=DEFAULT_BINARY_PATH, help="Binary dictionary path")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the inputs are unchanged")
+    args = parser.parse_args()
+
+    print("="*80)
+    print("LEXLINK BINARY DICTIONARY")
+    print("="*80)
+
+    if args.command == 'info':
+        try:
+            dictionary = BinaryDictionary(args.output)
+        except (FileNotFoundError, ValueError) as error:
+            print(f"[X] {error}")
+            sys.exit(1)
+        with dictionary:
+            print(f"File:        {args.output} ({args.output.stat().st_size:,} bytes)")
+            print(f"Records:     {len(dictionary)}")
+            print(f"Source keys: {len(dictionary._source_index)}")
+            print(f"Target keys: {len(dictionary._target_index)}")
+            if dictionary.stale_inputs:
+                print(f"[X] Stale: {len(dictionary.stale_inputs)} dictionary file(s) changed since build")
+                for path in dictionary.stale_inputs:
+                    print(f"      {path}")
+            else:
+                print("[OK] Up to date with data/dictionaries")
+        return
+
+    if not args.force and args.output.exists():
+        try:
+            with BinaryDictionary(args.output) as dictionary:
+                up_to_date = not dictionary.stale_inputs
+        except ValueError:
+            up_to_date = False
+        if up_to_date:
+            print(f"[OK] {args.output} is up to date")
+            return
+
+    started = time.perf_counter()
+    summary = compile_dictionary(args.output)
+    elapsed = time.perf_counter() - started
+    print(f"Records:     {summary['records']}")
+    print(f"Source keys: {summary['source_keys']}")
+    print(f"Target keys: {summary['target_keys']}")
+    print(f"Strings:     {summary['string_bytes']:,} bytes")
+    print(f"\n[OK] Wrote {summary['bytes']:,} bytes to {args.output} in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+"""
+Build instrumentation for the LexLink static site generator.
+
+Collects per-phase wall and CPU time, time spent parsing CSVs, linking terms
+to examples, rendering templates and writing files, pages per second, bytes written and the slowest
+pages, with optional cProfile and tracemalloc capture and the @timed function
+table (see instrumentation.py). Results are written to a machine-readable
+build-report.json and checked against per-phase budgets.
+"""
+
+import heapq
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from instrumentation import Instrumentation, function_timings
+from instrumentation import print_summary as print_instrumentation
+
+CATEGORIES = ('parse', 'link', 'render', 'write')
+
+
+def parse_budgets(specs):
+    """
+    Parse budget specs of the form PHASE=SECONDS.
+
+    Args:
+        specs: Iterable of strings such as "terms:nl-nl_en-gb=2.5" or "total=30"
+
+    Returns:
+        Dict mapping phase name to maximum wall time in seconds
+    """
+    budgets = {}
+    for spec in specs or []:
+        name, sep, seconds = spec.rpartition('=')
+        if not sep or not name:
+            raise ValueError(f"Invalid budget '{spec}', expected PHASE=SECONDS")
+        budgets[name] = float(seconds)
+    return budgets
+
+
+class _PhaseStats:
+    """Counters for a single build phase."""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.pages = 0
+        self.bytes = 0
+        self.categories = dict.fromkeys(CATEGORIES, 0.0)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'wall_seconds': round(self.wall, 4),
+            'cpu_seconds': round(self.cpu, 4),
+            'pages': self.pages,
+            'bytes_written': self.bytes,
+            'pages_per_second': round(self.pages / self.wall, 1) if self.wall else 0.0,
+            **{f'{cat}_seconds': round(secs, 4) for cat, secs in self.categories.items()},
+        }
+
+
+class BuildMetrics:
+    """
+    Collect timings for a site build.
+
+    Usage:
+        metrics = BuildMetrics(profile_path='build.pstats', trace_memory=True)
+        metrics.start()
+        with metrics.phase('terms:nl-nl_en-gb'):
+            with metrics.measure('parse'):
+                rows = list(reader)
+            for row in rows:
+                metrics.render_page(path, create_term_page, row, 'nl-en')
+        metrics.finish()
+        metrics.write_report('build-report.json', budgets={'total': 60})
+    """
+
+    def __init__(self, slowest=10, profile_path=None, trace_memory=False, memory_top=10):
+        self.slowest = slowest
+        self.instrumentation = Instrumentation(profile_path, trace_memory, memory_top)
+        self.phases = {}
+        self._current = None
+        self._slowest_pages = []   # min-heap of (seconds, path, bytes)
+        self._started_wall = None
+        self._started_cpu = None
+        self.total_wall = 0.0
+        self.total_cpu = 0.0
+
+    # ------------------------------------------------------------------ lifecycle
+
+    def start(self):
+        """Start the build clock and optional profilers."""
+        self.instrumentation.start()
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    def finish(self):
+        """Stop the build clock and collect profiler output."""
+        self.total_wall = time.perf_counter() - self._started_wall
+        self.total_cpu = time.process_time() - self._started_cpu
+        self.instrumentation.finish()
+
+    # ------------------------------------------------------------------ recording
+
+    @contextmanager
+    def phase(self, name):
+        """Time a named build phase (wall and CPU)."""
+        stats = self.phases.setdefault(name, _PhaseStats(name))
+        previous, self._current = self._current, stats
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield stats
+        finally:
+            stats.wall += time.perf_counter() - wall
+            stats.cpu += time.process_time() - cpu
+            self._current = previous
+
+    @contextmanager
+    def measure(self, category):
+        """Attribute the enclosed wall time to a category (parse/link/render/write)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(category, time.perf_counter() - started)
+
+    def render_page(self, output_path, render, *args, **kwargs):
+        """
+        Render a page with `render(*args, **kwargs)` and write it to disk.
+
+        Render and write time are recorded separately and the page is
+        considered for the slowest-pages list.
+
+        Returns:
+            Number of bytes written
+        """
+        started = time.perf_counter()
+        html = render(*args, **kwargs)
+        rendered = time.perf_counter()
+        self._add('render', rendered - started)
+        size = self.write_text(output_path, html)
+        self._record_page(output_path, time.perf_counter() - started, size)
+        return size
+
+    def write_text(self, output_path, text):
+        """Write a UTF-8 text file, recording write time and bytes."""
+        data = text.encode('utf-8')
+        started = time.perf_counter()
+        Path(output_path).write_bytes(data)
+        self._add('write', time.perf_counter() - started)
+        if self._current is not None:
+            self._current.bytes += len(data)
+        return len(data)
+
+    def _add(self, category, seconds):
+        if self._current is not None:
+            self._current.categories[category] = self._current.categories.get(category, 0.0) + seconds
+
+    def _record_page(self, output_path, seconds, size):
+        if self._current is not None:
+            self._current.pages += 1
+        entry = (seconds, str(output_path), size)
+        if len(self._slowest_pages) < self.slowest:
+            heapq.heappush(self._slowest_pages, entry)
+        elif entry > self._slowest_pages[0]:
+            heapq.heapreplace(self._slowest_pages, entry)
+
+    # ------------------------------------------------------------------ reporting
+
+    def check_budgets(self, budgets):
+        """
+        Compare phase wall times against budgets.
+
+        The special phase name "total" applies to the whole build. A budget
+        for a phase that did not run (usually a typo) is a violation too, with
+        wall_seconds None and an 'error'.
+
+        Returns:
+            List of violation dicts (empty when every phase is within budget)
+        """
+        violations = []
+        for name, limit in (budgets or {}).items():
+            if name == 'total':
+                actual = self.total_wall
+            elif name in self.phases:
+                actual = self.phases[name].wall
+            else:
+                violations.append({
+                    'phase': name,
+                    'budget_seconds': limit,
+                    'wall_seconds': None,
+                    'error': f"unknown phase (known: total, {', '.join(self.phases)})",
+                })
+                continue
+            if actual > limit:
+                violations.append({
+                    'phase': name,
+                    'budget_seconds': limit,
+                    'wall_seconds': round(actual, 4),
+                })
+        return violations
+
+    def report(self, budgets=None):
+        """Build the report dict."""
+        phases = [stats.to_dict() for stats in self.phases.values()]
+        pages = sum(stats.pages for stats in self.phases.values())
+        written = sum(stats.bytes for stats in self.phases.values())
+        totals = {cat: round(sum(s.categories.get(cat, 0.0) for s in self.phases.values()), 4)
+                  for cat in CATEGORIES}
+
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'total': {
+                'wall_seconds': round(self.total_wall, 4),
+                'cpu_seconds': round(self.total_cpu, 4),
+                'pages': pages,
+                'bytes_written': written,
+                'pages_per_second': round(pages / self.total_wall, 1) if self.total_wall else 0.0,
+                **{f'{cat}_seconds': secs for cat, secs in totals.items()},
+            },
+            'phases': phases,
+            'slowest_pages': [
+                {'path': path, 'seconds': round(seconds, 6), 'bytes': size}
+                for seconds, path, size in sorted(self._slowest_pages, reverse=True)
+            ],
+            'budgets': budgets or {},
+            'budget_violations': self.check_budgets(budgets),
+            'functions': function_timings(),
+            'profile': self.instrumentation.profile,
+            'memory': self.instrumentation.memory,
+        }
+
+    def write_report(self, report_path, budgets=None):
+        """Write build-report.json and return the report dict."""
+        report = self.report(budgets)
+        report_path = Path(report_path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        return report
+
+    def print_summary(self, report):
+        """Print a short human-readable summary of a report."""
+        total = report['total']
+        print(f"{'Phase':<32} {'wall (s)':>9} {'cpu (s)':>9} {'pages':>7} {'pages/s':>9}")
+        for phase in report['phases']:
+            print(f"{phase['name']:<32} {phase['wall_seconds']:>9.3f} {phase['cpu_seconds']:>9.3f} "
+                  f"{phase['pages']:>7} {phase['pages_per_second']:>9.1f}")
+        print(f"{'total':<32} {total['wall_seconds']:>9.3f} {total['cpu_seconds']:>9.3f} "
+              f"{total['pages']:>7} {total['pages_per_second']:>9.1f}")
+        print(f"\nParse: {total['parse_seconds']:.3f}s | Link: {total['link_seconds']:.3f}s | "
+              f"Render: {total['render_seconds']:.3f}s | "
+              f"Write: {total['write_seconds']:.3f}s | Bytes written: {total['bytes_written']:,}")
+        if report.get('functions') or report.get('profile') or report.get('memory'):
+            print()
+            print_instrumentation(report, limit=5)
+        for violation in report['budget_violations']:
+            if violation.get('error'):
+                print(f"[X] Budget for {violation['phase']}: {violation['error']}")
+                continue
+            print(f"[X] Budget exceeded: {violation['phase']} took {violation['wall_seconds']:.3f}s "
+                  f"(budget {violation['budget_seconds']:.3f}s)")
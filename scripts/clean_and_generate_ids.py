@@ -6,6 +6,13 @@ import uuid
 from io import StringIO
 from pathlib import Path
 
+FIELDNAMES = ['id', 'source', 'lang-source', 'target', 'lang-target',
+              'author', 'license', 'sme-reviewed', 'premium', 'lang-target-dict']
+
+# Namespace for name-based term ids: the same pair always gets the same UUID,
+# so re-running a cleanup or re-importing a file keeps existing ids stable.
+TERM_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'lexlink:dictionary-term')
+
 # The extracted data
 RAW_DATA = """id	source	lang-source	target	lang-target	author	license	sme-reviewed	premium	lang-target-dict
 	Verdrag	nl-nl	Abkommen	de-de	van Gassen	All rights reserved	TRUE	FALSE
@@ -215,54 +222,96 @@ RAW_DATA = """id	source	lang-source	target	lang-target	author	license	sme-review
 	investeringsregelingen of samenwerkingsverbanden	nl-nl	Investmentvermögen oder Personengesellschaften	de-de	van Gassen	All rights reserved	TRUE	FALSE"""
 
 
-def main():
-    """Generate UUIDs and create cleaned dataset."""
+def term_id(source, lang_source, target='', lang_target='', scope='', sense=''):
+    """
+    Stable UUID (v5) for a term pair within a dictionary (scope).
 
-    # Parse the TSV data
-    reader = csv.DictReader(StringIO(RAW_DATA), delimiter='\t')
-    rows = list(reader)
+    sense (a definition) tells apart homonyms of a monolingual dictionary;
+    it is only mixed in when given, so other ids do not change.
+    """
+    name = f"{scope}\t{lang_source}\t{source}\t{lang_target}\t{target}"
+    return str(uuid.uuid5(TERM_ID_NAMESPACE, f"{name}\t{sense}" if sense else name))
 
-    print(f"Original dataset: {len(rows)} entries")
 
-    # Track unique pairs to remove exact duplicates
+def iter_clean_rows(rows, fieldnames=FIELDNAMES, scope='', duplicates_removed=None):
+    """
+    Strip values, drop exact duplicate pairs and assign ids, one row at a time.
+
+    Rows without a target (monolingual dictionaries) are only duplicates when
+    the definition (lang-source-dict) matches too, so homonyms are kept.
+    Rows that already carry an id keep it; others get a stable term_id().
+
+    Args:
+        rows: Iterable of dicts with at least 'source' (and 'target')
+        fieldnames: Columns to keep in the cleaned rows
+        scope: Dictionary name mixed into generated ids, so the same pair in
+            two dictionaries gets two ids
+        duplicates_removed: Optional list that receives the dropped duplicates
+
+    Yields:
+        Cleaned rows
+    """
     seen_pairs = {}
-    cleaned_rows = []
-    duplicates_removed = []
+    seen_monolingual = set()
 
     for idx, row in enumerate(rows, 1):
-        source = row.get('source', '').strip()
-        target = row.get('target', '').strip()
-        pair_key = (source, target)
+        source = (row.get('source') or '').strip()
+        target = (row.get('target') or '').strip()
+        definition = '' if target else (row.get('lang-source-dict') or '').strip()
+        pair_key = (source, target, definition)
 
         # Check if we've seen this exact pair before
         if pair_key in seen_pairs:
-            duplicates_removed.append({
-                'row': idx,
-                'source': source,
-                'target': target,
-                'first_seen': seen_pairs[pair_key]
-            })
+            if duplicates_removed is not None:
+                duplicates_removed.append({
+                    'row': idx,
+                    'source': source,
+                    'target': target,
+                    'first_seen': seen_pairs[pair_key]
+                })
             continue
 
-        # Generate UUID
-        term_uuid = str(uuid.uuid4())
-
-        # Create cleaned row with UUID
-        cleaned_row = {
-            'id': term_uuid,
-            'source': source,
-            'lang-source': row.get('lang-source', '').strip(),
-            'target': target,
-            'lang-target': row.get('lang-target', '').strip(),
-            'author': row.get('author', '').strip(),
-            'license': row.get('license', '').strip(),
-            'sme-reviewed': row.get('sme-reviewed', '').strip(),
-            'premium': row.get('premium', '').strip(),
-            'lang-target-dict': ''  # Explicitly empty as requested
-        }
-
-        cleaned_rows.append(cleaned_row)
+        cleaned_row = {field: (row.get(field) or '').strip() for field in fieldnames}
+        cleaned_row['source'] = source
+        if 'target' in cleaned_row:
+            cleaned_row['target'] = target
+        if not cleaned_row.get('id'):
+            # The first entry of a term keeps the plain id; later homonyms add their definition
+            sense = definition if not target and source in seen_monolingual else ''
+            cleaned_row['id'] = term_id(source, cleaned_row.get('lang-source', ''),
+                                        target, cleaned_row.get('lang-target', ''), scope, sense)
+
         seen_pairs[pair_key] = idx
+        if not target:
+            seen_monolingual.add(source)
+        yield cleaned_row
+
+
+def clean_rows(rows, fieldnames=FIELDNAMES, scope=''):
+    """
+    Clean a whole dataset (see iter_clean_rows).
+
+    Returns:
+        (cleaned_rows, duplicates_removed)
+    """
+    duplicates_removed = []
+    cleaned_rows = list(iter_clean_rows(rows, fieldnames, scope, duplicates_removed))
+    return cleaned_rows, duplicates_removed
+
+
+def main():
+    """Generate UUIDs and create cleaned dataset."""
+
+    # Parse the TSV data
+    reader = csv.DictReader(StringIO(RAW_DATA), delimiter='\t')
+    rows = list(reader)
+
+    print(f"Original dataset: {len(rows)} entries")
+
+    # lang-target-dict is left empty for every entry
+    for row in rows:
+        row['lang-target-dict'] = ''
+    cleaned_rows, duplicates_removed = clean_rows(rows)
 
     print(f"Cleaned dataset: {len(cleaned_rows)} entries")
     print(f"Duplicates removed: {len(duplicates_removed)}")
@@ -275,8 +324,7 @@ def main():
 
     # Export to CSV
     output_file = Path('legislation_terms_cleaned.csv')
-    fieldnames = ['id', 'source', 'lang-source', 'target', 'lang-target',
-                  'author', 'license', 'sme-reviewed', 'premium', 'lang-target-dict']
+    fieldnames = FIELDNAMES
 
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Cluster near-duplicate dictionary entries with MinHash and LSH banding.
+
+Exact-match deduplication misses entries that differ slightly: "inwoner" ->
+"ansässig" / "ansässige Person", "directeursbeloningen" with "oder"/"und"
+variants, or the same term repeated with different casing and punctuation.
+Comparing every pair of entries is O(n²); this script instead:
+
+    1. shingles each entry (character 3-grams of the normalised source and
+       target, kept apart so "source" grams never match "target" grams)
+    2. computes a MinHash signature per entry (NUM_PERM hash functions)
+    3. splits signatures into BANDS bands; entries of the same language
+       pair that agree on any whole band land in the same bucket
+       (near-linear candidate generation)
+    4. confirms every pair within a bucket by its estimated Jaccard
+       similarity and merges confirmed pairs, most similar first; a cluster
+       only takes in entries that are similar to its representative (first
+       entry), so "A ~ B ~ C" does not chain A and C together
+
+Entries with different source or target languages are never candidates, so
+"Ministerie van Defensie" -> FR, ES and DE rows stay in separate clusters.
+Clusters of two or more entries are written to a CSV with one row per entry
+and a cluster id, for curators to review and merge.
+
+Usage:
+    python scripts/cluster_near_duplicates.py
+    python scripts/cluster_near_duplicates.py --field source --threshold 0.6
+    python scripts/cluster_near_duplicates.py --output near-duplicates.csv
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from dictionary_loader import BASE_DIR, DATA_DIR, load_dictionaries
+from example_index import normalise
+
+DEFAULT_OUTPUT = BASE_DIR / 'near-duplicates.csv'
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16                  # 16 bands x 4 rows: pairs above ~0.5 Jaccard collide
+DEFAULT_THRESHOLD = 0.5
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+OUTPUT_FIELDS = ['cluster_id', 'cluster_size', 'similarity', 'id', 'dictionary',
+                 'source', 'lang_source', 'target', 'lang_target']
+
+
+def shingles(text, size=SHINGLE_SIZE, prefix=''):
+    """Character n-grams of normalised text, padded so short terms still shingle."""
+    text = ' '.join(normalise(text or '').split())
+    if not text:
+        return set()
+    padded = f' {text} '
+    if len(padded) <= size:
+        return {prefix + padded}
+    return {prefix + padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def entry_shingles(entry, field='pair'):
+    """Shingle set of an entry for the chosen field (source, target or pair)."""
+    grams = set()
+    if field in ('source', 'pair'):
+        grams |= shingles(entry['source'], prefix='s:')
+    if field in ('target', 'pair'):
+        grams |= shingles(entry['target'], prefix='t:')
+    return grams
+
+
+class MinHasher:
+    """
+    MinHash signatures with universal hashing, deterministic across runs.
+
+    The NUM_PERM hash values of each distinct shingle are computed once and
+    cached; shingles repeat heavily across entries, so a signature is mostly
+    an element-wise min over cached tuples.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._cache = {}
+
+    def _hashes(self, shingle):
+        values = self._cache.get(shingle)
+        if values is None:
+            base = zlib.crc32(shingle.encode('utf-8'))
+            values = self._cache[shingle] = tuple(
+                ((a * base + b) % _PRIME) & _MAX_HASH for a, b in self._coefficients)
+        return values
+
+    def signature(self, grams):
+        """Element-wise minimum of the shingle hashes, or None for no shingles."""
+        if not grams:
+            return None
+        if len(grams) == 1:
+            return self._hashes(next(iter(grams)))
+        return tuple(map(min, *(self._hashes(g) for g in grams)))
+
+
+def estimated_similarity(sig_a, sig_b):
+    """Fraction of agreeing MinHash values (estimates Jaccard similarity)."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def candidate_pairs(signatures, bands=BANDS, keys=None):
+    """
+    Pairs of entries that share a bucket in at least one band.
+
+    With `keys` (one per entry, e.g. its language pair) only entries with
+    equal keys share a bucket.
+
+    Returns:
+        Set of (i, j) index pairs with i < j
+    """
+    rows = len(next((sig for sig in signatures if sig is not None), ())) // bands
+    pairs = set()
+    for band in range(bands):
+        start = band * rows
+        buckets = {}
+        for i, signature in enumerate(signatures):
+            if signature is not None:
+                key = (keys[i] if keys else None, signature[start:start + rows])
+                buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            for position, first in enumerate(members):
+                for other in members[position + 1:]:
+                    pairs.add((first, other))
+    return pairs
+
+
+def cluster(entries, field='pair', threshold=DEFAULT_THRESHOLD, bands=BANDS, num_perm=NUM_PERM):
+    """
+    Group near-duplicate entries.
+
+    Only entries of the same language pair are compared. Confirmed candidate
+    pairs are merged from the most similar down. Two clusters are joined only
+    when every entry of the smaller one reaches the threshold against the
+    representative of the larger one.
+
+    Args:
+        entries: List of dicts with 'source', 'lang_source', 'target' and
+            'lang_target'
+        field: Compare 'source', 'target' or the whole 'pair'
+        threshold: Minimum estimated Jaccard similarity to merge two entries
+
+    Returns:
+        (clusters, signatures): clusters as lists of entry indexes (size >= 2,
+        largest first, representative first) and the MinHash signature of
+        every entry
+    """
+    hasher = MinHasher(num_perm)
+    signatures = [hasher.signature(entry_shingles(entry, field)) for entry in entries]
+
+    confirmed = []
+    languages = [(entry.get('lang_source', ''), entry.get('lang_target', '')) for entry in entries]
+    for first, other in candidate_pairs(signatures, bands, languages):
+        similarity = estimated_similarity(signatures[first], signatures[other])
+        if similarity >= threshold:
+            confirmed.append((-similarity, first, other))
+    confirmed.sort()
+
+    owner = list(range(len(entries)))       # entry -> representative of its cluster
+    groups = {}                             # representative -> entries, representative first
+    for _, first, other in confirmed:
+        a, b = owner[first], owner[other]
+        if a == b:
+            continue
+        members_a, members_b = groups.get(a, [a]), groups.get(b, [b])
+        if len(members_a) < len(members_b):
+            a, b, members_a, members_b = b, a, members_b, members_a
+        if all(estimated_similarity(signatures[a], signatures[i]) >= threshold for i in members_b):
+            groups[a] = members_a + members_b
+            groups.pop(b, None)
+            for i in members_b:
+                owner[i] = a
+
+    clusters = list(groups.values())
+    clusters.sort(key=lambda members: (-len(members), entries[members[0]]['source'].casefold()))
+    return clusters, signatures
+
+
+def load_entries(data_dir=DATA_DIR):
+    """One entry per translation (monolingual entries get an empty target)."""
+    entries = []
+    for entry in load_dictionaries(data_dir):
+        for target, lang_target in entry['targets'] or [('', '')]:
+            entries.append({
+                'id': entry['id'],
+                'dictionary': entry['dictionary'],
+                'source': entry['source'],
+                'lang_source': entry['lang_source'],
+                'target': target,
+                'lang_target': lang_target,
+            })
+    return entries
+
+
+def mixed_language_clusters(entries, clusters):
+    """Numbers (1-based) of clusters whose entries differ in source or target language."""
+    return [number for number, members in enumerate(clusters, 1)
+            if len({(entries[i]['lang_source'], entries[i]['lang_target']) for i in members}) > 1]
+
+
+def write_clusters(path, entries, clusters, signatures):
+    """Write one CSV row per clustered entry."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        for number, members in enumerate(clusters, 1):
+            representative = signatures[members[0]]
+            for i in members:
+                writer.writerow(dict(
+                    entries[i],
+                    cluster_id=f'cluster-{number:05d}',
+                    cluster_size=len(members),
+                    similarity=f'{estimated_similarity(representative, signatures[i]):.2f}',
+                ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate dictionary entries (MinHash LSH).")
+    parser.add_argument('--field', choices=('pair', 'source', 'target'), default='pair',
+                        help="Compare whole translation pairs (default), or only source/target terms")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum estimated Jaccard similarity (default %(default)s)")
+    parser.add_argument('--lang-target', help="Only cluster entries with this target language")
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    print("="*80)
+    print("NEAR-DUPLICATE CLUSTERING (MinHash LSH)")
+    print("="*80)
+
+    started = time.perf_counter()
+    entries = load_entries()
+    if args.lang_target:
+        entries = [entry for entry in entries if entry['lang_target'] == args.lang_target]
+    print(f"\nEntries: {len(entries)}")
+
+    clusters, signatures = cluster(entries, args.field, args.threshold)
+    mixed = mixed_language_clusters(entries, clusters)
+    if mixed:
+        print(f"[X] {len(mixed)} cluster(s) mix language pairs, first: cluster-{mixed[0]:05d}")
+        sys.exit(1)
+    write_clusters(args.output, entries, clusters, signatures)
+    elapsed = time.perf_counter() - started
+
+    clustered = sum(len(members) for members in clusters)
+    print(f"Clusters: {len(clusters)} ({clustered} entries)")
+    print("\nLargest clusters:")
+    for number, members in enumerate(clusters[:10], 1):
+        print(f"  cluster-{number:05d} ({len(members)} entries)")
+        for i in members[:4]:
+            entry = entries[i]
+            print(f"     {entry['source']} -> {entry['target'] or '-'}  [{entry['dictionary']}]")
+        if len(members) > 4:
+            print(f"     ... {len(members) - 4} more")
+
+    print(f"\n[OK] {args.output} written in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
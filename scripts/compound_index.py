@@ -0,0 +1,133 @@
+"""
+Dutch compound decomposition index for sub-term lookup.
+
+Dutch writes compounds as one word ("belastingverrekening",
+"socialezekerheidspensioenen"), so a user looking up "verrekening" or
+"pensioen" finds nothing with an exact or prefix lookup. The splitter here
+is seeded from the dictionary vocabulary itself: every word that occurs in
+a Dutch term is a known constituent, and a longer word is split greedily
+into the longest known head plus a remainder that splits again, allowing
+the linking morphemes -s-, -e- and -en- between parts:
+
+    socialezekerheidspensioenen -> sociale + zekerheid + (s) + pensioenen
+
+Every term is then indexed under each of its words, each constituent of
+those words and the singular of plural constituents ("pensioenen" ->
+"pensioen"), so a constituent query is a single dict lookup.
+"""
+
+from example_index import tokenize
+
+MIN_PART = 3
+LINKING_MORPHEMES = ('', 's', 'e', 'en')
+PLURAL_SUFFIXES = ('en', 's')
+
+# Function words that would otherwise split words at the wrong place
+# ("terrein" -> "ter" + "rein").
+STOPWORDS = frozenset({
+    'aan', 'als', 'bij', 'dan', 'dat', 'den', 'der', 'des', 'die', 'een', 'het', 'hun',
+    'met', 'niet', 'ons', 'ook', 'ten', 'ter', 'tot', 'uit', 'van', 'wel', 'zij', 'zijn',
+})
+
+
+class CompoundSplitter:
+    """
+    Longest-match compound splitter over a known vocabulary.
+
+    Usage:
+        splitter = CompoundSplitter(['belasting', 'verrekening'])
+        splitter.split('belastingverrekening')   # ['belasting', 'verrekening']
+    """
+
+    def __init__(self, vocabulary=()):
+        self.vocabulary = set()
+        self._cache = {}
+        for word in vocabulary:
+            self.add(word)
+
+    def add(self, word):
+        if len(word) >= MIN_PART and word not in STOPWORDS and word.isalpha():
+            self.vocabulary.add(word)
+            self._cache.clear()
+
+    def split(self, word):
+        """
+        Split a word into known constituents.
+
+        Returns:
+            List of at least two parts, or None when the word is not a compound
+            of known words
+        """
+        if word not in self._cache:
+            self._cache[word] = self._split(word, whole=False)
+        return self._cache[word]
+
+    def _split(self, word, whole=True):
+        if whole and word in self.vocabulary:
+            return [word]
+        for end in range(len(word) - MIN_PART, MIN_PART - 1, -1):
+            head = word[:end]
+            if head not in self.vocabulary:
+                continue
+            for link in LINKING_MORPHEMES:
+                if not word.startswith(link, end) or len(word) - end - len(link) < MIN_PART:
+                    continue
+                rest = self._split(word[end + len(link):])
+                if rest:
+                    return [head] + rest
+        return None
+
+
+def singular(part):
+    """Singular candidates of a (possibly plural) constituent."""
+    return [part[:-len(suffix)] for suffix in PLURAL_SUFFIXES
+            if part.endswith(suffix) and len(part) - len(suffix) >= MIN_PART + 1]
+
+
+class CompoundIndex:
+    """
+    Constituent -> terms index.
+
+    Usage:
+        index = CompoundIndex(['belastingverrekening', 'socialezekerheidspensioenen'])
+        index.lookup('verrekening')    # ['belastingverrekening']
+        index.lookup('pensioen')       # ['socialezekerheidspensioenen']
+    """
+
+    def __init__(self, terms=()):
+        self.terms = []         # term id -> term
+        self.postings = {}      # constituent -> list of term ids
+        terms = list(terms)
+        self.splitter = CompoundSplitter(token for term in terms for token in tokenize(term))
+        for term in terms:
+            self.add(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def constituents(self, term):
+        """
+        Keys a term is indexed under: its words, their compound parts and
+        the singular of plural parts.
+        """
+        keys = []
+        for token in tokenize(term):
+            parts = [token] + (self.splitter.split(token) or [])
+            for part in parts:
+                for key in [part] + singular(part):
+                    if key not in keys:
+                        keys.append(key)
+        return keys
+
+    def add(self, term):
+        """Index a term and return its id."""
+        term_id = len(self.terms)
+        self.terms.append(term)
+        for key in self.constituents(term):
+            self.postings.setdefault(key, []).append(term_id)
+        return term_id
+
+    def lookup(self, word):
+        """Terms containing `word` as a word or compound constituent."""
+        key = ' '.join(tokenize(word))
+        return [self.terms[term_id] for term_id in self.postings.get(key, ())]
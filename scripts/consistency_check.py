@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Terminology consistency check for translated documents.
+
+Takes a bilingual document and flags every segment whose source contains a
+dictionary term while its target contains none of the approved translations
+of that term:
+
+    tmx     <tu> with one <tuv> per language (source language from --source-lang)
+    xliff   XLIFF 1.2 <trans-unit> and XLIFF 2.x <unit>/<segment>
+    csv     parallel example files (sentence_nl_nl, sentence_en_gb, ...)
+
+Documents are streamed. TMX and XLIFF are read with iterparse, clearing each
+unit once it is read. Segments are handed to worker processes in chunks of
+CHUNK_SIZE, with a bounded number of chunks in flight, so memory use does not
+grow with the document.
+
+Source terms are matched with a token trie built once per language pair from
+every dictionary entry: the variants of each term (example_index.term_variants)
+are inserted token by token and each segment is scanned leftmost-longest, so
+"vaste inrichting" wins over "inrichting" and the cost is linear in the
+segment length whatever the dictionary size. Approved translations are
+matched on the same normalised tokens; their last token may carry up to
+SUFFIX_SLACK extra characters (Staat/Staaten, court/courts) and a leading
+article is optional.
+
+Usage:
+    python scripts/consistency_check.py project.tmx
+    python scripts/consistency_check.py project.xlf --target-lang de-de
+    python scripts/consistency_check.py data/examples/*.csv --jobs 4 --show 20
+
+Output: consistency-report.csv (one row per flagged term in a segment);
+exit code 1 when segments are flagged.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from pathlib import Path
+
+from dictionary_loader import BASE_DIR, DATA_DIR, load_dictionaries, load_examples, normalise_key
+from example_index import term_variants, tokenize
+from process_imports import XML_LANG, detect_format, normalise_lang
+
+DEFAULT_OUTPUT = BASE_DIR / 'consistency-report.csv'
+DEFAULT_SOURCE_LANG = 'nl-nl'
+CHUNK_SIZE = 2000
+MAX_TERM_TOKENS = 6         # longer "terms" are sentence fragments from the treaty extraction
+SUFFIX_SLACK = 2
+LEADING_ARTICLES = {'the', 'a', 'an', 'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine',
+                    'le', 'la', 'les', 'un', 'une', 'el', 'los', 'las', 'de', 'het', 'een'}
+
+REPORT_FIELDS = ['file', 'segment_id', 'position', 'term', 'approved', 'source', 'target']
+
+NUMBERING_RE = re.compile(r'(?:^|(?<=;))\s*\d+[.)]\s*')
+ELLIPSES = ('…', '..')     # "bij…" is a usage pattern, not a term
+
+_TERMS = ''     # trie key holding the term ids that end at a node (tokens are never empty)
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _text(element):
+    return ' '.join(''.join(element.itertext()).split()) if element is not None else ''
+
+
+class TermMatcher:
+    """
+    Dictionary terms of one language pair, compiled into a token trie.
+
+    Usage:
+        matcher = TermMatcher(load_dictionaries(), 'nl-nl', 'en-gb')
+        matcher.find(tokenize(source))          # [(start, end, [term ids])]
+        matcher.check(source, target)           # (matched term ids, missing term ids)
+    """
+
+    def __init__(self, entries, lang_source, lang_target):
+        self.lang_source = lang_source
+        self.lang_target = lang_target
+        self.terms = []             # term id -> source term
+        self.approved = []          # term id -> approved translations
+        self.phrases = []           # term id -> token phrases of the approved translations
+        self.trie = {}
+        ids = {}
+        for entry in entries:
+            if entry['lang_source'] != lang_source:
+                continue
+            targets = [target for target, lang in entry['targets'] if lang == lang_target]
+            if not targets:
+                continue
+            key = normalise_key(entry['source'])
+            term_id = ids.get(key)
+            if term_id is None:
+                if any(ellipsis in entry['source'] for ellipsis in ELLIPSES):
+                    continue
+                variants = term_variants(entry['source'])
+                if len(variants[0]) > MAX_TERM_TOKENS:
+                    continue
+                term_id = ids[key] = len(self.terms)
+                self.terms.append(entry['source'])
+                self.approved.append([])
+                self.phrases.append([])
+                for variant in variants:
+                    self._insert(variant, term_id)
+            for target in targets:
+                if target not in self.approved[term_id]:
+                    self.approved[term_id].append(target)
+                    self.phrases[term_id].extend(_target_phrases(target))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def _insert(self, tokens, term_id):
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_TERMS, []).append(term_id)
+
+    def find(self, tokens):
+        """
+        Leftmost-longest, non-overlapping term matches in a token list.
+
+        Returns:
+            List of (start, end, term ids); several ids when terms share a variant
+        """
+        matches = []
+        i, n = 0, len(tokens)
+        while i < n:
+            node, longest = self.trie, None
+            j = i
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERMS in node:
+                    longest = (i, j, node[_TERMS])
+            if longest is None:
+                i += 1
+            else:
+                matches.append(longest)
+                i = longest[1]
+        return matches
+
+    def translated(self, term_ids, target_tokens):
+        """Whether the target contains an approved translation of any of the terms."""
+        token_set = set(target_tokens)
+        for term_id in term_ids:
+            for phrase in self.phrases[term_id]:
+                if _contains(target_tokens, token_set, phrase):
+                    return True
+        return False
+
+    def check(self, source, target):
+        """
+        Match the terms of a source segment and check them in the target.
+
+        Returns:
+            (matched, missing): lists of term id lists, one per occurrence in the source
+        """
+        matched, missing = [], []
+        target_tokens = None
+        for _, _, term_ids in self.find(tokenize(source)):
+            if term_ids in matched:
+                continue
+            matched.append(term_ids)
+            if target_tokens is None:
+                target_tokens = tokenize(target)
+            if not self.translated(term_ids, target_tokens):
+                missing.append(term_ids)
+        return matched, missing
+
+
+def _target_phrases(target):
+    """
+    Token phrases of an approved translation, also without a leading article.
+
+    Dictionary targets list alternatives separated by commas and sometimes
+    numbered ("judgment, award (arbitration)", "1. (academisch) title; degree").
+    """
+    phrases = []
+    for alternative in target.split(','):
+        for variant in term_variants(NUMBERING_RE.sub('', alternative)):
+            if variant not in phrases:
+                phrases.append(variant)
+            if len(variant) > 1 and variant[0] in LEADING_ARTICLES and variant[1:] not in phrases:
+                phrases.append(variant[1:])
+    return phrases
+
+
+def _inflected(token, base):
+    return token.startswith(base) and len(token) - len(base) <= SUFFIX_SLACK
+
+
+def _contains(tokens, token_set, phrase):
+    """Whether tokens contain phrase, allowing SUFFIX_SLACK extra characters on its last token."""
+    last = len(phrase) - 1
+    if last and phrase[0] not in token_set:
+        return False
+    if not last and phrase[0] in token_set:
+        return True
+    head = phrase[:last]
+    for i in range(len(tokens) - last):
+        if tuple(tokens[i:i + last]) == head and _inflected(tokens[i + last], phrase[last]):
+            return True
+    return False
+
+
+def iter_tmx_segments(path, lang_source, lang_target=None):
+    """Yield segments of a TMX file, one per <tu> with both languages."""
+    body = None
+    position = 0
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if element.tag == 'body':
+                body = element
+            continue
+        if element.tag != 'tu':
+            continue
+        position += 1
+        texts = {}
+        for tuv in element.findall('tuv'):
+            lang = normalise_lang(tuv.get(XML_LANG) or tuv.get('lang'))
+            text = _text(tuv.find('seg'))
+            if lang and text and lang not in texts:
+                texts[lang] = text
+        tuid = element.get('tuid', '')
+        if body is not None:
+            body.clear()
+
+        target_lang = lang_target or next((lang for lang in texts if lang != lang_source), '')
+        if lang_source in texts and target_lang in texts:
+            yield {'id': tuid or str(position), 'position': position, 'source': texts[lang_source],
+                   'target': texts[target_lang], 'lang_source': lang_source, 'lang_target': target_lang}
+
+
+def iter_xliff_segments(path, lang_source, lang_target=None):
+    """
+    Yield segments of an XLIFF 1.2 or 2.x file.
+
+    The file's declared languages are used unless its source language differs
+    from lang_source (then the file is skipped) or lang_target is given.
+    """
+    declared_source, declared_target = '', ''
+    stack, unit_id, position = [], '', 0
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        tag = _local(element.tag)
+        if event == 'start':
+            stack.append(element)
+            if tag == 'xliff' and element.get('srcLang'):
+                declared_source = normalise_lang(element.get('srcLang'))
+                declared_target = normalise_lang(element.get('trgLang'))
+            elif tag == 'file' and element.get('source-language'):
+                declared_source = normalise_lang(element.get('source-language'))
+                declared_target = normalise_lang(element.get('target-language'))
+            elif tag in ('trans-unit', 'unit'):
+                unit_id = element.get('id', '')
+            continue
+        stack.pop()
+        if tag not in ('trans-unit', 'segment', 'unit'):
+            continue
+        if tag in ('trans-unit', 'segment'):
+            position += 1
+            source, target = '', ''
+            for child in element:
+                if _local(child.tag) == 'source':
+                    source = _text(child)
+                elif _local(child.tag) == 'target':
+                    target = _text(child)
+            segment_id = unit_id if tag == 'trans-unit' else element.get('id') or unit_id
+            if source and target and (not declared_source or declared_source == lang_source):
+                yield {'id': segment_id or str(position), 'position': position, 'source': source,
+                       'target': target, 'lang_source': lang_source,
+                       'lang_target': lang_target or declared_target}
+        if tag in ('trans-unit', 'unit') and stack:
+            stack[-1].remove(element)
+
+
+def iter_csv_segments(path, lang_source, lang_target=None):
+    """Yield segments of a parallel example file (see dictionary_loader.load_examples)."""
+    for position, example in enumerate(load_examples(path), 1):
+        if example['lang_source'] != lang_source or lang_target and example['lang_target'] != lang_target:
+            continue
+        yield {'id': example['id'] or str(position), 'position': position,
+               'source': example['sentence_source'], 'target': example['sentence_target'],
+               'lang_source': lang_source, 'lang_target': example['lang_target']}
+
+
+READERS = {'tmx': iter_tmx_segments, 'xliff': iter_xliff_segments, 'csv': iter_csv_segments}
+
+
+def iter_segments(path, lang_source=DEFAULT_SOURCE_LANG, lang_target=None):
+    """
+    Stream the segments of a bilingual document.
+
+    Yields:
+        Dicts with 'id', 'position', 'source', 'target', 'lang_source', 'lang_target'
+
+    Raises:
+        ValueError: The format is not one of READERS
+    """
+    fmt = detect_format(path)
+    if fmt not in READERS:
+        raise ValueError(f"{path}: unsupported format '{fmt or 'unknown'}' (expected TMX, XLIFF or CSV)")
+    return READERS[fmt](path, lang_source, lang_target)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_matcher = None
+
+
+def _init_worker(matcher):
+    global _matcher
+    _matcher = matcher
+
+
+def check_chunk(segments, matcher=None):
+    """
+    Check a list of segments (runs in a worker process).
+
+    Returns:
+        (segments with terms, Counter of term id -> occurrences,
+        Counter of term id -> misses, issue dicts)
+    """
+    matcher = matcher or _matcher
+    with_terms = 0
+    seen, missed = Counter(), Counter()
+    issues = []
+    for segment in segments:
+        matched, missing = matcher.check(segment['source'], segment['target'])
+        if matched:
+            with_terms += 1
+        for term_ids in matched:
+            seen[term_ids[0]] += 1
+        for term_ids in missing:
+            missed[term_ids[0]] += 1
+            issues.append({
+                'segment_id': segment['id'],
+                'position': segment['position'],
+                'term': ' / '.join(matcher.terms[term_id] for term_id in term_ids),
+                'approved': ' | '.join(dict.fromkeys(
+                    target for term_id in term_ids for target in matcher.approved[term_id])),
+                'source': segment['source'],
+                'target': segment['target'],
+            })
+    return with_terms, seen, missed, issues
+
+
+def check_document(path, lang_source=DEFAULT_SOURCE_LANG, lang_target=None, jobs=None,
+                   chunk_size=CHUNK_SIZE, data_dir=DATA_DIR, matchers=None):
+    """
+    Check one bilingual document against the dictionaries.
+
+    Args:
+        matchers: Optional dict (lang_source, lang_target) -> TermMatcher,
+            reused across documents
+
+    Returns:
+        Result dict with 'file', 'lang_target', 'segments', 'with_terms',
+        'terms', 'seen', 'missed' (Counters by term) and 'issues'
+    """
+    segments = iter_segments(path, lang_source, lang_target)
+    first = next(segments, None)
+    result = {'file': str(path), 'lang_target': first['lang_target'] if first else lang_target or '',
+              'segments': 0, 'with_terms': 0, 'terms': 0, 'seen': Counter(), 'missed': Counter(), 'issues': []}
+    if first is None:
+        return result
+
+    matchers = {} if matchers is None else matchers
+    pair = (lang_source, result['lang_target'])
+    if pair not in matchers:
+        matchers[pair] = TermMatcher(load_dictionaries(data_dir), *pair)
+    matcher = matchers[pair]
+    result['terms'] = len(matcher)
+
+    def collect(chunk_result, size):
+        with_terms, seen, missed, issues = chunk_result
+        result['segments'] += size
+        result['with_terms'] += with_terms
+        result['seen'].update({matcher.terms[term_id]: count for term_id, count in seen.items()})
+        result['missed'].update({matcher.terms[term_id]: count for term_id, count in missed.items()})
+        for issue in issues:
+            issue['file'] = str(path)
+        result['issues'].extend(issues)
+
+    chunks = _chunks(chain([first], segments), chunk_size)
+    if jobs == 1:
+        for chunk in chunks:
+            collect(check_chunk(chunk, matcher), len(chunk))
+        return result
+
+    window = 2 * (jobs or os.cpu_count() or 1)      # chunks in flight
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(matcher,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((executor.submit(check_chunk, chunk), len(chunk)))
+            if len(pending) >= window:
+                future, size = pending.popleft()
+                collect(future.result(), size)
+        while pending:
+            future, size = pending.popleft()
+            collect(future.result(), size)
+    return result
+
+
+def write_report(path, results):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerows(result['issues'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag translated segments that do not use the approved terminology.")
+    parser.add_argument('paths', nargs='+', type=Path, help="TMX, XLIFF or parallel CSV files")
+    parser.add_argument('--source-lang', default=DEFAULT_SOURCE_LANG)
+    parser.add_argument('--target-lang', default=None, help="Target language (default: from the document)")
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Segments per worker task")
+    parser.add_argument('--show', type=int, default=10, metavar='N', help="Print the first N flagged segments")
+    args = parser.parse_args()
+
+    lang_source = normalise_lang(args.source_lang) or args.source_lang
+    lang_target = normalise_lang(args.target_lang) if args.target_lang else None
+
+    print("="*80)
+    print("TERMINOLOGY CONSISTENCY CHECK")
+    print("="*80)
+
+    started = time.perf_counter()
+    matchers, results = {}, []
+    for path in args.paths:
+        try:
+            result = check_document(path, lang_source, lang_target, args.jobs, args.chunk_size, matchers=matchers)
+        except (ValueError, ET.ParseError, OSError) as error:
+            print(f"\n[X] {error}")
+            continue
+        results.append(result)
+        flagged = len({issue['position'] for issue in result['issues']})
+        status = "[X]" if flagged else "[OK]"
+        print(f"\n{status} {path} ({lang_source} -> {result['lang_target'] or '?'}, {result['terms']} terms): "
+              f"{result['segments']} segments, {result['with_terms']} with terms, {flagged} flagged")
+    elapsed = time.perf_counter() - started
+
+    write_report(args.output, results)
+    issues = [issue for result in results for issue in result['issues']]
+    seen = sum((result['seen'] for result in results), Counter())
+    missed = sum((result['missed'] for result in results), Counter())
+
+    if issues and args.show:
+        print(f"\nFirst {min(args.show, len(issues))} flagged:")
+        for issue in issues[:args.show]:
+            print(f"   [{issue['segment_id']}] '{issue['term']}' -> expected '{issue['approved']}'")
+            print(f"       {issue['target'][:100]}")
+
+    if missed:
+        print("\nMost often not translated as approved:")
+        for term, count in missed.most_common(10):
+            print(f"   {term:<40} {count:>5} of {seen[term]:>5} segment(s)")
+
+    segments = sum(result['segments'] for result in results)
+    print("\n" + "="*80)
+    print(f"Segments: {segments} | Flagged terms: {len(issues)} | {elapsed:.2f}s "
+          f"({segments / elapsed if elapsed else 0:.0f} segments/s)")
+    print("="*80)
+    print(f"[OK] Report: {args.output}")
+    if issues or len(results) < len(args.paths):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
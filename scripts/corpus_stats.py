@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Term frequency, document frequency and n-gram statistics over the corpus.
+
+The corpus is every Dutch text the library holds:
+
+    civil_procedure   the example sentences under data/examples (one document per sentence)
+    tax_treaty        the Dutch version of every treaty XML (one document per article;
+                      read through document_cache, so warm runs skip XML parsing)
+
+Each corpus file is tokenised once (example_index.tokenize) in a worker
+process. Workers count 1..MAX_N-grams and dictionary-term occurrences in
+Counter shards; the parent merges the shards per legal source. Dictionary
+terms are matched by their token variants (example_index.term_variants),
+looked up by first token, so the cost is linear in the number of tokens.
+
+For every Dutch dictionary term this gives:
+
+    tf / df          occurrences and documents, per domain and in total
+    idf              log(N / df), over all documents
+    specificity      log2 of the term's relative frequency in its top domain
+                     against the rest of the corpus (add-0.5 smoothing)
+
+Usage:
+    python scripts/corpus_stats.py                    # write term-frequencies.csv
+    python scripts/corpus_stats.py --top 20           # also print the top n-grams per domain
+    python scripts/corpus_stats.py --update-usage     # fill term_appears_in_source_count
+"""
+
+import argparse
+import csv
+import math
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from dictionary_loader import (BASE_DIR, DATA_DIR, iter_example_files, load_dictionaries,
+                               load_examples, normalise_key)
+from document_cache import load_treaty
+from example_index import term_variants, tokenize
+from legal_registry import get_registry
+
+DEFAULT_OUTPUT = BASE_DIR / 'term-frequencies.csv'
+USAGE_PATH = BASE_DIR / 'examples_term_usage_in_sources.csv'
+TREATY_GLOB = 'treaty/**/*.xml'
+CORPUS_LANG = 'nl-nl'
+MAX_N = 3
+
+OUTPUT_FIELDS = ['rank', 'term', 'tf', 'df', 'idf', 'domain', 'specificity']
+
+
+def corpus_files(base_dir=BASE_DIR, data_dir=DATA_DIR):
+    """(kind, path) of every corpus file: example CSVs and treaty XMLs."""
+    files = [('examples', path) for path in iter_example_files(data_dir)]
+    files += [('treaty', path) for path in sorted(Path(base_dir).glob(TREATY_GLOB))]
+    return files
+
+
+def iter_documents(kind, path):
+    """
+    Yield (legal source id, domain, text) for each document of a corpus file.
+
+    Treaties map to their registry source_id (falling back to the BWB id) and
+    the registry's source_subtype as domain.
+    """
+    if kind == 'examples':
+        for example in load_examples(path):
+            if example['lang_source'] == CORPUS_LANG:
+                yield example['legal_source_id'] or Path(path).stem, 'civil_procedure', example['sentence_source']
+        return
+
+    registry = get_registry()
+    source_id = registry.source_for_path(path) or Path(path).stem.split('_')[0]
+    domain = (registry.get(source_id) or {}).get('source_subtype') or 'tax_treaty'
+    version = load_treaty(path)['versions'].get(CORPUS_LANG.split('-')[0])
+    if version is None:
+        return
+    for article in version['articles']:
+        yield source_id, domain, ' '.join([article['title']] + article['paragraphs'])
+
+
+def term_phrases(entries):
+    """
+    Token variants of the Dutch dictionary terms.
+
+    Returns:
+        (terms, phrases): terms maps key -> display term; phrases maps a
+        first token -> {variant token tuple: [term keys]}
+    """
+    terms, phrases = {}, {}
+    for entry in entries:
+        if entry['lang_source'] != CORPUS_LANG:
+            continue
+        key = normalise_key(entry['source'])
+        if key in terms:
+            continue
+        terms[key] = entry['source']
+        # ';' ends a clause in the long treaty "terms" rather than separating alternatives
+        for variant in term_variants(entry['source'].replace(';', ',')):
+            phrases.setdefault(variant[0], {}).setdefault(variant, []).append(key)
+    return terms, phrases
+
+
+def count_file(kind, path, phrases, max_n=MAX_N):
+    """
+    Count one corpus file (runs in a worker process).
+
+    Returns:
+        Dict of legal source id -> shard with 'domain', 'documents', 'tokens'
+        and Counters 'ngram_tf', 'ngram_df', 'term_tf', 'term_df'
+    """
+    shards = {}
+    for source_id, domain, text in iter_documents(kind, path):
+        shard = shards.get(source_id)
+        if shard is None:
+            shard = shards[source_id] = {'domain': domain, 'documents': 0, 'tokens': 0,
+                                         'ngram_tf': Counter(), 'ngram_df': Counter(),
+                                         'term_tf': Counter(), 'term_df': Counter()}
+        tokens = tokenize(text)
+        shard['documents'] += 1
+        shard['tokens'] += len(tokens)
+
+        ngrams = [' '.join(tokens[i:i + n]) for n in range(1, max_n + 1) for i in range(len(tokens) - n + 1)]
+        shard['ngram_tf'].update(ngrams)
+        shard['ngram_df'].update(set(ngrams))
+
+        found = Counter()
+        for i, token in enumerate(tokens):
+            candidates = phrases.get(token)
+            if not candidates:
+                continue
+            keys = set()    # a term counts once per position, whichever variant matched
+            for phrase, phrase_keys in candidates.items():
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    keys.update(phrase_keys)
+            found.update(keys)
+        shard['term_tf'].update(found)
+        shard['term_df'].update(found.keys())
+    return shards
+
+
+def merge_shards(results):
+    """Merge per-file shards into one shard per legal source."""
+    merged = {}
+    for shards in results:
+        for source_id, shard in shards.items():
+            target = merged.get(source_id)
+            if target is None:
+                merged[source_id] = shard
+                continue
+            target['documents'] += shard['documents']
+            target['tokens'] += shard['tokens']
+            for field in ('ngram_tf', 'ngram_df', 'term_tf', 'term_df'):
+                target[field].update(shard[field])
+    return merged
+
+
+def by_domain(sources):
+    """Combine per-source shards into per-domain shards."""
+    domains = {}
+    for shard in sources.values():
+        target = domains.setdefault(shard['domain'], {
+            'documents': 0, 'tokens': 0, 'ngram_tf': Counter(), 'ngram_df': Counter(),
+            'term_tf': Counter(), 'term_df': Counter()})
+        target['documents'] += shard['documents']
+        target['tokens'] += shard['tokens']
+        for field in ('ngram_tf', 'ngram_df', 'term_tf', 'term_df'):
+            target[field].update(shard[field])
+    return domains
+
+
+def term_statistics(terms, domains):
+    """
+    Per-term frequency, document frequency, idf and domain-specificity.
+
+    Returns:
+        List of row dicts (OUTPUT_FIELDS plus tf_/df_ per domain), ranked by
+        total frequency; terms that never occur are left out
+    """
+    names = sorted(domains)
+    total_documents = sum(domain['documents'] for domain in domains.values())
+    total_tokens = sum(domain['tokens'] for domain in domains.values())
+    rows = []
+    for key, term in terms.items():
+        tf = sum(domains[name]['term_tf'][key] for name in names)
+        if not tf:
+            continue
+        df = sum(domains[name]['term_df'][key] for name in names)
+        row = {'term': term, 'tf': tf, 'df': df, 'idf': f'{math.log(total_documents / df):.3f}'}
+
+        best, best_rate = '', -1.0
+        for name in names:
+            row[f'tf_{name}'] = domains[name]['term_tf'][key]
+            row[f'df_{name}'] = domains[name]['term_df'][key]
+            rate = (row[f'tf_{name}'] + 0.5) / (domains[name]['tokens'] + 0.5)
+            if rate > best_rate:
+                best, best_rate = name, rate
+        rest_tf = tf - row[f'tf_{best}']
+        rest_tokens = total_tokens - domains[best]['tokens']
+        rest_rate = (rest_tf + 0.5) / (rest_tokens + 0.5)
+        row['domain'] = best
+        row['specificity'] = f'{math.log2(best_rate / rest_rate):.2f}' if rest_tokens else ''
+        rows.append(row)
+
+    rows.sort(key=lambda row: (-row['tf'], -row['df'], row['term'].casefold()))
+    for rank, row in enumerate(rows, 1):
+        row['rank'] = rank
+    return rows
+
+
+def compute(workers=None, base_dir=BASE_DIR, data_dir=DATA_DIR):
+    """
+    Count the whole corpus.
+
+    Returns:
+        (terms, sources): Dutch dictionary terms (key -> term) and the merged
+        per-legal-source shards (see count_file)
+    """
+    terms, phrases = term_phrases(load_dictionaries(data_dir))
+    files = corpus_files(base_dir, data_dir)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(count_file, kind, path, phrases) for kind, path in files]
+        results = [future.result() for future in futures]
+    return terms, merge_shards(results)
+
+
+def write_statistics(path, rows, domain_names):
+    fieldnames = OUTPUT_FIELDS + [f'{prefix}_{name}' for name in domain_names for prefix in ('tf', 'df')]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+_CSV_FIELD_RE = re.compile(r'"(?:[^"]|"")*"|[^,\r\n]*')
+
+
+def _raw_csv_records(text):
+    """
+    Split CSV text into records of raw fields (quotes kept as written).
+
+    Lets a hand-maintained file be rewritten with a few fields changed and
+    every other byte, quoting and line ending as it was.
+
+    Returns:
+        List of (fields, line ending) pairs
+    """
+    records, pos = [], 0
+    while pos < len(text):
+        fields = []
+        while True:
+            match = _CSV_FIELD_RE.match(text, pos)
+            fields.append(match.group())
+            pos = match.end()
+            if not text.startswith(',', pos):
+                break
+            pos += 1
+        ending = '\r\n' if text.startswith('\r\n', pos) else text[pos:pos + 1]
+        pos += len(ending)
+        records.append((fields, ending))
+    return records
+
+
+def _unquote(field):
+    return field[1:-1].replace('""', '"') if field.startswith('"') else field
+
+
+def update_usage(path, terms, sources, data_dir=DATA_DIR):
+    """
+    Fill term_appears_in_source_count in the term usage file from the counts.
+
+    Rows are matched to a term through dictionary_term_id and to a source
+    through legal_source_id. Only the count fields that change are
+    rewritten, and the file is left alone when none do. Returns the number
+    of rows updated.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        records = _raw_csv_records(f.read())
+    header = [_unquote(field) for field in records[0][0]] if records else []
+    if 'term_appears_in_source_count' not in header:
+        return 0
+    column = header.index('term_appears_in_source_count')
+
+    ids = {entry['id']: normalise_key(entry['source']) for entry in load_dictionaries(data_dir) if entry['id']}
+    updated = 0
+    for fields, _ in records[1:]:
+        row = dict(zip(header, map(_unquote, fields)))
+        key = ids.get(row.get('dictionary_term_id', ''))
+        shard = sources.get(row.get('legal_source_id', ''))
+        if key in terms and shard is not None and column < len(fields):
+            count = str(shard['term_tf'][key])
+            if row['term_appears_in_source_count'] != count:
+                fields[column] = count
+                updated += 1
+
+    if updated:
+        tmp_path = Path(path).with_name(Path(path).name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(','.join(fields) + ending for fields, ending in records)
+        os.replace(tmp_path, path)
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Term frequency and n-gram statistics over the corpus.")
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--top', type=int, default=0, metavar='N', help="Print the top N n-grams per domain")
+    parser.add_argument('--update-usage', action='store_true',
+                        help=f"Fill term_appears_in_source_count in {USAGE_PATH.name}")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    print("="*80)
+    print("CORPUS STATISTICS")
+    print("="*80)
+
+    started = time.perf_counter()
+    terms, sources = compute(args.jobs)
+    domains = by_domain(sources)
+    rows = term_statistics(terms, domains)
+    write_statistics(args.output, rows, sorted(domains))
+    elapsed = time.perf_counter() - started
+
+    print()
+    for source_id, shard in sorted(sources.items()):
+        print(f"{source_id:<40} {shard['domain']:<18} {shard['documents']:>6} documents {shard['tokens']:>8} tokens")
+    print(f"\nDictionary terms: {len(terms)} | Found in corpus: {len(rows)}")
+
+    for name in sorted(domains):
+        specific = [row for row in rows if row['domain'] == name and row['specificity']]
+        specific.sort(key=lambda row: (-float(row['specificity']), -row['tf']))
+        print(f"\nMost {name}-specific terms:")
+        for row in specific[:10]:
+            print(f"   {row['term']:<40} tf {row[f'tf_{name}']:>5}  specificity {row['specificity']}")
+
+    if args.top:
+        for name in sorted(domains):
+            for n in range(1, MAX_N + 1):
+                ngrams = Counter({gram: count for gram, count in domains[name]['ngram_tf'].items()
+                                  if gram.count(' ') == n - 1})
+                print(f"\nTop {n}-grams ({name}): " + ', '.join(
+                    f"{gram} ({count})" for gram, count in ngrams.most_common(args.top)))
+
+    if args.update_usage and USAGE_PATH.exists():
+        print(f"\n[OK] {USAGE_PATH.name}: {update_usage(USAGE_PATH, terms, sources)} count(s) updated")
+
+    print(f"\n[OK] {args.output} written in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -324,6 +324,52 @@ main {
     color: var(--text-color);
 }
 
+/* Term Examples / Example Terms (cross-links) */
+.term-examples,
+.example-terms {
+    margin: 2rem 0;
+}
+
+.term-examples h3,
+.example-terms h3 {
+    color: var(--primary-color);
+    margin-bottom: 1rem;
+}
+
+.term-examples ul,
+.example-terms ul {
+    list-style: none;
+}
+
+.term-example {
+    padding: 1rem 0;
+    border-bottom: 1px solid var(--border-color);
+}
+
+.example-source {
+    margin-bottom: 0.5rem;
+}
+
+.example-target {
+    color: #6c757d;
+    margin-bottom: 0.5rem;
+}
+
+.example-link {
+    font-size: 0.9rem;
+    color: var(--secondary-color);
+}
+
+.example-terms li {
+    padding: 0.25rem 0;
+}
+
+mark {
+    background-color: #fff3bf;
+    padding: 0 0.15em;
+    border-radius: 2px;
+}
+
 /* Term/Article Headers */
 .term-header,
 .article-header {
@@ -415,6 +461,15 @@ main {
     border-color: var(--secondary-color);
 }
 
+.search-suggestions {
+    margin-top: 0.75rem;
+    color: #6c757d;
+}
+
+.search-suggestions a {
+    font-weight: 600;
+}
+
 /* Term List Table */
 .term-list table {
     width: 100%;
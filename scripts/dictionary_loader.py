@@ -0,0 +1,222 @@
+"""
+Shared loader for the dictionary and example files under data/.
+
+The dictionaries come in several shapes (plain `source`/`target` pairs,
+monolingual definitions, the trilingual `target-de-de`/`target-fr-fr` file,
+the TMX-derived `term_nl_nl`/`term_en_gb` glossary and the treaty extraction
+with `term_fr_fr`). This module maps every shape onto one entry layout so
+tools do not each re-implement the column juggling:
+
+    {
+        'id': 'a7714aec-...',
+        'source': 'Verdrag',
+        'lang_source': 'nl-nl',
+        'targets': [('Abkommen', 'de-de')],     # empty for monolingual files
+        'definition': '',
+        'author': 'van Gassen',
+        'license': 'All rights reserved',
+        'domain': '',
+        'reviewed': True,
+        'dictionary': 'nl-nl_de-de/dictionary_nl-nl_de-de',
+        'translation_date': '',                 # TMX-derived files keep their
+        'tmx_tuid': '',                         # translation unit's metadata
+        'tmx_source_file': '',                  # (the .tmx file, and its
+        'source_project': '',                   # x-project and x-filename props)
+        'source_filename': '',
+    }
+"""
+
+import csv
+import hashlib
+import re
+import unicodedata
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+
+LANG_COLUMN_RE = re.compile(r'^(?:term|sentence)_([a-z]{2})_([a-z]{2})$')
+TARGET_COLUMN_RE = re.compile(r'^target-([a-z]{2}-[a-z]{2})$')
+
+
+def normalise_key(text):
+    """Normalise a term for exact lookups: NFC, casefolded, single spaces."""
+    text = unicodedata.normalize('NFC', text or '')
+    return ' '.join(text.casefold().split())
+
+
+def _first(row, *columns, default=''):
+    for column in columns:
+        value = row.get(column)
+        if value:
+            return value.strip()
+    return default
+
+
+def _is_true(value):
+    return (value or '').strip().lower() in ('true', 'yes', '1')
+
+
+def dictionary_name(path, data_dir=DATA_DIR):
+    """Short dictionary name: folder/stem relative to data/dictionaries."""
+    path = Path(path)
+    try:
+        relative = path.relative_to(Path(data_dir) / 'dictionaries')
+    except ValueError:
+        return path.stem
+    return str(relative.with_suffix('')).replace('\\', '/')
+
+
+def iter_dictionary_files(data_dir=DATA_DIR):
+    """
+    Yield every dictionary file under data/dictionaries, sorted.
+
+    A .tsv file is skipped when a .csv with the same stem exists next to it
+    (nl-nl-to-de-de.tsv duplicates nl-nl-to-de-de.csv).
+    """
+    dict_dir = Path(data_dir) / 'dictionaries'
+    for path in sorted(dict_dir.rglob('*')):
+        if path.suffix == '.csv':
+            yield path
+        elif path.suffix == '.tsv' and not path.with_suffix('.csv').exists():
+            yield path
+
+
+def iter_example_files(data_dir=DATA_DIR):
+    """Yield every example sentence file under data/examples, sorted."""
+    yield from sorted((Path(data_dir) / 'examples').glob('examples_*.csv'))
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _open_rows(path):
+    delimiter = '\t' if Path(path).suffix == '.tsv' else ','
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def _source_column(fieldnames, lang_source):
+    if 'source' in fieldnames:
+        return 'source'
+    wanted = f"term_{lang_source.replace('-', '_')}"
+    if wanted in fieldnames:
+        return wanted
+    for column in fieldnames:
+        if LANG_COLUMN_RE.match(column):
+            return column
+    return None
+
+
+def normalise_row(row, dictionary=''):
+    """
+    Map one raw dictionary row onto the shared entry layout.
+
+    Returns:
+        Entry dict, or None when the row has no source term
+    """
+    fieldnames = list(row)
+    lang_source = _first(row, 'lang-source', 'language_source')
+    source_column = _source_column(fieldnames, lang_source)
+    source = _first(row, source_column) if source_column else ''
+    if not source:
+        return None
+    if not lang_source:
+        match = LANG_COLUMN_RE.match(source_column)
+        lang_source = f'{match.group(1)}-{match.group(2)}' if match else ''
+
+    targets = []
+    if 'target' in row:
+        target = _first(row, 'target')
+        if target:
+            targets.append((target, _first(row, 'lang-target', 'language_target')))
+    else:
+        for column in fieldnames:
+            match = TARGET_COLUMN_RE.match(column)
+            if match:
+                if _first(row, column):
+                    targets.append((_first(row, column), match.group(1)))
+                continue
+            match = LANG_COLUMN_RE.match(column)
+            if match and column != source_column and _first(row, column):
+                targets.append((_first(row, column), f'{match.group(1)}-{match.group(2)}'))
+
+    return {
+        'id': _first(row, 'id', 'dictionary_term_id', 'term_id'),
+        'source': source,
+        'lang_source': lang_source,
+        'targets': targets,
+        'definition': _first(row, 'lang-source-dict'),
+        'author': _first(row, 'author', 'translator_name'),
+        'license': _first(row, 'license', 'usage_license'),
+        'domain': _first(row, 'legal_domain', 'term_category'),
+        'reviewed': _is_true(_first(row, 'sme-reviewed', 'expert_reviewed')),
+        'dictionary': dictionary,
+        'translation_date': _first(row, 'translation_date'),
+        'tmx_tuid': _first(row, 'tmx_tuid'),
+        'tmx_source_file': _first(row, 'tmx_source_file'),
+        'source_project': _first(row, 'source_project'),
+        'source_filename': _first(row, 'source_filename'),
+    }
+
+
+def load_dictionary(path, data_dir=DATA_DIR):
+    """Yield normalised entries from one dictionary file."""
+    name = dictionary_name(path, data_dir)
+    for row in _open_rows(path):
+        entry = normalise_row(row, name)
+        if entry is not None:
+            yield entry
+
+
+def load_dictionaries(data_dir=DATA_DIR):
+    """Yield normalised entries from every dictionary file under data/."""
+    for path in iter_dictionary_files(data_dir):
+        yield from load_dictionary(path, data_dir)
+
+
+def normalise_example(row):
+    """
+    Map one example sentence row onto the shared example layout.
+
+    Returns:
+        Example dict, or None when either sentence is missing
+    """
+    sentences = [(column, match) for column in row
+                 for match in [LANG_COLUMN_RE.match(column)] if match and column.startswith('sentence_')]
+    if len(sentences) < 2:
+        return None
+    (source_column, source_match), (target_column, target_match) = sentences[:2]
+    sentence_source = _first(row, source_column)
+    sentence_target = _first(row, target_column)
+    if not sentence_source or not sentence_target:
+        return None
+    return {
+        'id': _first(row, 'example_id', 'id'),
+        'sentence_source': sentence_source,
+        'lang_source': f'{source_match.group(1)}-{source_match.group(2)}',
+        'sentence_target': sentence_target,
+        'lang_target': f'{target_match.group(1)}-{target_match.group(2)}',
+        'legal_source_id': _first(row, 'legal_source_id'),
+        'book': _first(row, 'book_identifier'),
+        'article_number': _first(row, 'article_number'),
+        'translation_date': _first(row, 'translation_date'),
+        'tmx_tuid': _first(row, 'tmx_tuid'),
+        'tmx_source_file': _first(row, 'tmx_source_file'),
+        'source_project': _first(row, 'source_project'),
+        'source_filename': _first(row, 'source_filename'),
+    }
+
+
+def load_examples(path):
+    """Yield normalised example sentence pairs from one example file."""
+    for row in _open_rows(path):
+        example = normalise_example(row)
+        if example is not None:
+            yield example
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of pre-extracted treaty and TMX documents.
+
+Parsing the treaty XML and the TMX files is the slow part of every
+extraction run, and each script used to do it again. This module parses a
+document once, extracts a compact record form, and pickles it under
+.cache/documents/ keyed by the file's SHA-256 and the extractor version:
+
+    treaty   {'versions': {lang: {'intitule', 'chapters', 'articles'}}}
+             chapters/articles as returned by extract_titles_and_content,
+             plus the 'xpath' of each element in the source document
+    tmx      {'header': {...}, 'units': [{'tuid', 'xpath', 'props',
+             'variants': {lang: {'text', 'creationdate', 'creationid'}}}]}
+
+A warm run reads the pickle and skips XML parsing entirely. A changed file
+has a new hash and is parsed again. Bump TREATY_VERSION or TMX_VERSION when
+an extractor changes what it returns, and old entries are simply no longer
+read.
+
+Usage:
+    python scripts/document_cache.py                 # warm the cache for all treaties and TMX files
+    python scripts/document_cache.py path/to/file.tmx
+    python scripts/document_cache.py --clear
+
+    from document_cache import load_treaty, load_tmx
+    versions = load_treaty(xml_path)['versions']
+    for unit in load_tmx(tmx_path)['units']:
+        ...
+"""
+
+import argparse
+import os
+import pickle
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from dictionary_loader import BASE_DIR, file_sha256
+
+CACHE_DIR = BASE_DIR / '.cache' / 'documents'
+TREATY_VERSION = 1
+TMX_VERSION = 1
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# Where the documents handled by the extraction scripts live
+DOCUMENT_GLOBS = (('treaty', 'treaty/**/*.xml'), ('treaty', 'legislation/**/*.xml'),
+                  ('tmx', 'translation-dictionaries/**/*.tmx'), ('tmx', 'data/raw/tmx/*.tmx'))
+
+
+def _element_paths(element, path):
+    """Yield (element, positional xpath) for an element and its descendants, in document order."""
+    yield element, path
+    counts = {}
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        counts[child.tag] = counts.get(child.tag, 0) + 1
+        yield from _element_paths(child, f'{path}/{child.tag}[{counts[child.tag]}]')
+
+
+def _parse_with_fallback(path):
+    """
+    Parse an XML file; on a parse error retry with the encoding chardet detects (UTF-16 TMX).
+
+    Parsed directly rather than through the legal registry's document cache:
+    the tree is only needed until the compact record is extracted.
+    """
+    try:
+        return ET.parse(path)
+    except ET.ParseError:
+        import chardet
+        with open(path, 'rb') as f:
+            encoding = chardet.detect(f.read(10000))['encoding']
+        with open(path, 'r', encoding=encoding) as f:
+            return ET.ElementTree(ET.fromstring(f.read()))
+
+
+def extract_treaty(path):
+    """Chapter and article records of every language version (<verdrag xml:lang>) of a treaty."""
+    from extract_treaty_translations import extract_titles_and_content
+
+    root = _parse_with_fallback(path).getroot()
+    versions = {}
+    for element, xpath in _element_paths(root, f'/{root.tag}'):
+        if element.tag != 'verdrag':
+            continue
+        lang = element.get(XML_LANG, '')
+        data = extract_titles_and_content(element)
+        # extract_titles_and_content visits chapters and articles in document order
+        paths = {'hoofdstuk': [], 'artikel': []}
+        for child, child_path in _element_paths(element, xpath):
+            if child.tag in paths:
+                paths[child.tag].append(child_path)
+        for record, record_path in zip(data['chapters'], paths['hoofdstuk']):
+            record['xpath'] = record_path
+        for record, record_path in zip(data['articles'], paths['artikel']):
+            record['xpath'] = record_path
+        data['xpath'] = xpath
+        versions[lang] = data
+    return {'versions': versions}
+
+
+def extract_tmx(path):
+    """Header attributes and translation units of a TMX file."""
+    root = _parse_with_fallback(path).getroot()
+    header = root.find('header')
+    units = []
+    body = root.find('body')
+    for number, tu in enumerate(body.findall('tu') if body is not None else [], 1):
+        variants = {}
+        for tuv in tu.findall('tuv'):
+            seg = tuv.find('seg')
+            lang = tuv.get(XML_LANG, '')
+            # A later variant with text replaces an earlier one, as the TMX parsers did
+            if seg is not None and seg.text is not None or lang not in variants:
+                variants[lang] = {
+                    'text': seg.text if seg is not None and seg.text is not None else '',
+                    'creationdate': tuv.get('creationdate', ''),
+                    'creationid': tuv.get('creationid', ''),
+                }
+        units.append({
+            'tuid': tu.get('tuid', ''),
+            'xpath': f'/{root.tag}/body/tu[{number}]',
+            'props': {prop.get('type', ''): prop.text for prop in tu.findall('prop')},
+            'variants': variants,
+        })
+    return {'header': dict(header.attrib) if header is not None else {}, 'units': units,
+            'has_body': body is not None}
+
+
+EXTRACTORS = {'treaty': (extract_treaty, TREATY_VERSION), 'tmx': (extract_tmx, TMX_VERSION)}
+
+
+class ExtractCache:
+    """
+    Pickled document extracts keyed by (kind, SHA-256, extractor version).
+
+    Usage:
+        cache = ExtractCache()
+        records = cache.load(path, 'tmx')
+        cache.stats      # {'hits': ..., 'misses': ...}
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.stats = {'hits': 0, 'misses': 0}
+        self._hashes = {}   # resolved path -> (mtime_ns, size, sha256), for repeated loads in one process
+
+    def _digest(self, path):
+        path = Path(path).resolve()
+        stat = path.stat()
+        known = self._hashes.get(path)
+        if known is None or known[:2] != (stat.st_mtime_ns, stat.st_size):
+            known = self._hashes[path] = (stat.st_mtime_ns, stat.st_size, file_sha256(path))
+        return known[2]
+
+    def entry_path(self, path, kind):
+        """Cache file for a document (whether or not it exists yet)."""
+        version = EXTRACTORS[kind][1]
+        return self.cache_dir / f'{kind}-{self._digest(path)}-v{version}.pickle'
+
+    def load(self, path, kind):
+        """
+        Extracted records of a document, parsed only when not cached.
+
+        Args:
+            path: Document file
+            kind: 'treaty' or 'tmx'
+        """
+        entry_path = self.entry_path(path, kind)
+        if entry_path.exists():
+            try:
+                with open(entry_path, 'rb') as f:
+                    records = pickle.load(f)
+                self.stats['hits'] += 1
+                return records
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass    # unreadable entry: parse again and overwrite it
+
+        self.stats['misses'] += 1
+        records = EXTRACTORS[kind][0](path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_name(f'{entry_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+        return records
+
+    def clear(self):
+        """Delete every cache entry; returns the number removed."""
+        removed = 0
+        for entry in self.cache_dir.glob('*.pickle'):
+            entry.unlink()
+            removed += 1
+        return removed
+
+
+_cache = None
+
+
+def get_cache():
+    """The process-wide document cache."""
+    global _cache
+    if _cache is None:
+        _cache = ExtractCache()
+    return _cache
+
+
+def load_treaty(path):
+    """Cached treaty records (see extract_treaty)."""
+    return get_cache().load(path, 'treaty')
+
+
+def load_tmx(path):
+    """Cached TMX records (see extract_tmx)."""
+    return get_cache().load(path, 'tmx')
+
+
+def kind_of(path):
+    return 'tmx' if Path(path).suffix.lower() == '.tmx' else 'treaty'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm or clear the parsed-document cache.")
+    parser.add_argument('paths', nargs='*', type=Path, help="Documents to cache (default: all treaties and TMX files)")
+    parser.add_argument('--clear', action='store_true', help="Delete every cached document")
+    args = parser.parse_args()
+
+    cache = get_cache()
+    if args.clear:
+        print(f"[OK] Removed {cache.clear()} cached document(s) from {cache.cache_dir}")
+        return
+
+    print("="*80)
+    print("DOCUMENT CACHE")
+    print("="*80)
+
+    if args.paths:
+        documents = [(kind_of(path), path) for path in args.paths]
+    else:
+        documents = [(kind, path) for kind, pattern in DOCUMENT_GLOBS for path in sorted(BASE_DIR.glob(pattern))]
+
+    started = time.perf_counter()
+    for kind, path in documents:
+        misses = cache.stats['misses']
+        document_started = time.perf_counter()
+        records = cache.load(path, kind)
+        elapsed = time.perf_counter() - document_started
+        status = 'parsed' if cache.stats['misses'] > misses else 'cached'
+        size = len(records['units']) if kind == 'tmx' else sum(
+            len(version['articles']) for version in records['versions'].values())
+        unit = 'units' if kind == 'tmx' else 'articles'
+        print(f"   [{status}] {path.name}: {size} {unit} ({elapsed * 1000:.0f} ms)")
+
+    print(f"\n[OK] {len(documents)} document(s), {cache.stats['hits']} from cache, "
+          f"{cache.stats['misses']} parsed in {time.perf_counter() - started:.2f}s: {cache.cache_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Inverted index over example sentences for term-to-example cross-linking.
+
+Sentences are tokenised once into casefolded, diacritic-free tokens and every
+token is mapped to the sentences it occurs in. A dictionary term is located by
+intersecting the posting lists of its tokens (rarest first) and verifying the
+phrase only on the surviving candidates, so joining thousands of terms against
+thousands of sentences costs roughly the size of the posting lists instead of
+terms x sentences substring scans.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+
+TOKEN_RE = re.compile(r"\w+(?:['’]\w+)*")
+PARENTHESES_RE = re.compile(r'\(([^)]*)\)')
+
+# Sentences close to this many tokens make the most readable examples;
+# very short ones are usually headings, very long ones are hard to scan.
+IDEAL_EXAMPLE_TOKENS = 20
+
+
+def normalise(text):
+    """Casefold text and strip diacritics ("Beëindiging" -> "beeindiging")."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    """Split text into normalised word tokens."""
+    return [normalise(match.group()) for match in TOKEN_RE.finditer(text)]
+
+
+def tokenize_with_spans(text):
+    """Split text into (normalised token, start, end) tuples."""
+    return [(normalise(m.group()), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+
+
+def term_variants(term):
+    """
+    Expand a dictionary term into the token phrases to search for.
+
+    Parenthesised parts are optional ("(steen)groeve" matches both "steengroeve"
+    and "groeve"; "aanbrengen (een geschil bij de rechter)" matches
+    "aanbrengen"), and " / " or ";" separate alternatives.
+
+    Returns:
+        List of unique token tuples, longest first
+    """
+    variants = []
+    for alternative in re.split(r'\s+/\s+|;', term):
+        alternative = alternative.strip()
+        if not alternative:
+            continue
+        with_parts = PARENTHESES_RE.sub(r'\1', alternative)
+        without_parts = PARENTHESES_RE.sub(' ', alternative)
+        for text in (with_parts, without_parts):
+            tokens = tuple(tokenize(text))
+            if tokens and tokens not in variants:
+                variants.append(tokens)
+    return sorted(variants, key=len, reverse=True)
+
+
+def _find_phrase(tokens, phrase):
+    """Return start positions of phrase in tokens."""
+    first, length = phrase[0], len(phrase)
+    return [i for i, token in enumerate(tokens)
+            if token == first and tuple(tokens[i:i + length]) == phrase]
+
+
+def highlight(text, term, tag='mark'):
+    """
+    Wrap every occurrence of term in text with an HTML tag.
+
+    Matching uses the same normalisation as the index, so "beeindiging"
+    highlights "beëindiging" in the original sentence.
+    """
+    spans = tokenize_with_spans(text)
+    tokens = [token for token, _, _ in spans]
+    ranges = []
+    for phrase in term_variants(term):
+        for start in _find_phrase(tokens, phrase):
+            begin, end = spans[start][1], spans[start + len(phrase) - 1][2]
+            if not any(begin < r_end and end > r_begin for r_begin, r_end in ranges):
+                ranges.append((begin, end))
+    if not ranges:
+        return text
+
+    parts, last = [], 0
+    for begin, end in sorted(ranges):
+        parts.append(text[last:begin])
+        parts.append(f'<{tag}>{text[begin:end]}</{tag}>')
+        last = end
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+class ExampleIndex:
+    """
+    Token inverted index over a list of sentences.
+
+    Usage:
+        index = ExampleIndex(row['sentence_nl_nl'] for row in rows)
+        doc_ids = index.find_term('gerechtelijk bevel', limit=5)
+    """
+
+    def __init__(self, sentences=()):
+        self.documents = []                 # doc id -> tuple of tokens
+        self.postings = defaultdict(list)   # token -> sorted doc ids
+        for sentence in sentences:
+            self.add(sentence)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, sentence):
+        """Index a sentence and return its document id."""
+        doc_id = len(self.documents)
+        tokens = tuple(tokenize(sentence or ''))
+        self.documents.append(tokens)
+        for token in set(tokens):
+            self.postings[token].append(doc_id)
+        return doc_id
+
+    def find_phrase(self, phrase):
+        """
+        Find documents containing a token phrase.
+
+        Returns:
+            Dict mapping doc id to number of occurrences
+        """
+        if not phrase:
+            return {}
+        lists = []
+        for token in set(phrase):
+            posting = self.postings.get(token)
+            if not posting:
+                return {}
+            lists.append(posting)
+        lists.sort(key=len)
+
+        candidates = set(lists[0])
+        for posting in lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return {}
+
+        if len(phrase) == 1:
+            return {doc_id: self.documents[doc_id].count(phrase[0]) for doc_id in candidates}
+
+        matches = {}
+        for doc_id in candidates:
+            count = len(_find_phrase(self.documents[doc_id], phrase))
+            if count:
+                matches[doc_id] = count
+        return matches
+
+    def find_term(self, term, limit=None):
+        """
+        Find documents containing any variant of a dictionary term.
+
+        Results are ranked by number of occurrences, then by how close the
+        sentence length is to IDEAL_EXAMPLE_TOKENS, then by document order.
+
+        Returns:
+            List of doc ids
+        """
+        matches = {}
+        for phrase in term_variants(term):
+            for doc_id, count in self.find_phrase(phrase).items():
+                matches[doc_id] = max(matches.get(doc_id, 0), count)
+
+        ranked = sorted(matches, key=lambda doc_id: (
+            -matches[doc_id],
+            abs(len(self.documents[doc_id]) - IDEAL_EXAMPLE_TOKENS),
+            doc_id,
+        ))
+        return ranked[:limit] if limit else ranked
+
+    def link_terms(self, terms, limit=None):
+        """
+        Join a list of terms against the index in one pass.
+
+        Args:
+            terms: Iterable of term strings
+            limit: Maximum examples kept per term (all are used for back-links)
+
+        Returns:
+            (term_examples, example_terms): list of ranked doc ids per term, and
+            dict mapping doc id to the indexes of the terms it contains
+        """
+        term_examples = []
+        example_terms = defaultdict(list)
+        for term_idx, term in enumerate(terms):
+            doc_ids = self.find_term(term)
+            for doc_id in doc_ids:
+                example_terms[doc_id].append(term_idx)
+            term_examples.append(doc_ids[:limit] if limit else doc_ids)
+        return term_examples, example_terms
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Export dictionaries, example sentences and concept tables to TMX 1.4b and TBX.
+
+Translators work in CAT tools, which read TMX (translation memories) and TBX
+(termbases), not our CSV files. This script streams any of the CSV layouts
+in data/ back into those formats:
+
+    dictionaries    data/dictionaries/**      one <tu> / <termEntry> per entry
+    examples        data/examples/*.csv       one <tu> per sentence pair
+    concepts        lexlink-concepts.csv      one <tu> / <termEntry> per Dutch concept
+                                              (see pivot_join.py), all languages in one unit
+
+Every unit is written as soon as it is read, as XML text (no DOM), so
+memory use does not depend on the number of units. With --chunk-size the
+output is split into numbered files of at most that many units
+(lexlink-examples-0001.tmx, ...). Each file is written to a temporary name
+and moved into place when complete.
+
+Rows that came from TMX files (parse_tmx_to_dictionary.py) keep their
+origin: the original tuid and creation date, the x-project and x-filename
+props of the translation unit (the CAT project and source document), and
+the TMX file they were read from (x-tmx-file). Other rows use their id as
+tuid.
+
+Usage:
+    python scripts/export_translations.py tmx                          # all dictionaries
+    python scripts/export_translations.py tmx --examples --chunk-size 50000
+    python scripts/export_translations.py tbx --concepts               # lexlink-concepts.csv
+    python scripts/export_translations.py tbx data/dictionaries/nl-nl_de-de --lang-target de-de
+    python scripts/export_translations.py tmx --reviewed --domain civil_procedure
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from dictionary_loader import (BASE_DIR, DATA_DIR, dictionary_name, iter_dictionary_files, iter_example_files,
+                               load_dictionary, load_examples)
+from pivot_join import DEFAULT_OUTPUT as CONCEPTS_PATH
+from pivot_join import PIVOT_LANG, TERM_SEPARATOR
+
+EXPORT_DIR = BASE_DIR / 'exports'
+CREATION_TOOL = 'LexLink'
+CREATION_TOOL_VERSION = '1'
+
+LANG_CODE_RE = re.compile(r'^[a-z]{2}-[a-z]{2}$')
+TMX_DATE_RE = re.compile(r'^\d{8}T\d{6}Z$')
+INVALID_XML_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]')
+
+# A unit, whatever its input:
+#   {'id', 'tuid', 'creationdate', 'creationid', 'lang_source', 'source',
+#    'targets': [(text, lang)], 'definition', 'domain', 'props': {type: value}}
+
+
+def xml_lang(code):
+    """Language tag as written in TMX/TBX: 'nl-nl' -> 'nl-NL'."""
+    language, _, region = (code or '').partition('-')
+    return f'{language}-{region.upper()}' if region else language
+
+
+def tmx_date(value):
+    """
+    TMX creation date (YYYYMMDDThhmmssZ) of a stored date.
+
+    Accepts TMX dates as they are, and ISO dates or datetimes
+    ('2025-02-25', '2025-02-25T14:31:22'). Returns '' otherwise.
+    """
+    value = (value or '').strip()
+    if TMX_DATE_RE.match(value):
+        return value
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return ''
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.strftime('%Y%m%dT%H%M%SZ')
+
+
+def _text(value):
+    return escape(INVALID_XML_RE.sub('', value or ''))
+
+
+def _attr(value):
+    return quoteattr(INVALID_XML_RE.sub('', value or ''))
+
+
+def input_kind(path):
+    """'concepts', 'examples' or 'dictionary', from the header of a CSV/TSV file."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        header = f.readline()
+    columns = [column.strip() for column in re.split(r'[,\t]', header)]
+    if 'concept_id' in columns:
+        return 'concepts'
+    if any(column.startswith('sentence_') for column in columns):
+        return 'examples'
+    return 'dictionary'
+
+
+def dictionary_units(path, data_dir=DATA_DIR):
+    """Units of one dictionary file (monolingual entries have no targets)."""
+    for entry in load_dictionary(path, data_dir):
+        props = {'x-dictionary': entry['dictionary'], 'x-domain': entry['domain'],
+                 'x-license': entry['license'], 'x-reviewed': 'true' if entry['reviewed'] else 'false',
+                 'x-project': entry['source_project'], 'x-filename': entry['source_filename'],
+                 'x-tmx-file': entry['tmx_source_file']}
+        yield {
+            'id': entry['id'],
+            'tuid': entry['tmx_tuid'] or entry['id'],
+            'creationdate': tmx_date(entry['translation_date']),
+            'creationid': entry['author'],
+            'lang_source': entry['lang_source'],
+            'source': entry['source'],
+            'targets': entry['targets'],
+            'definition': entry['definition'],
+            'domain': entry['domain'],
+            'reviewed': entry['reviewed'],
+            'props': props,
+        }
+
+
+def example_units(path):
+    """Units of one example sentence file."""
+    for example in load_examples(path):
+        props = {'x-legal-source': example['legal_source_id'], 'x-book': example['book'],
+                 'x-article': example['article_number'], 'x-project': example['source_project'],
+                 'x-filename': example['source_filename'], 'x-tmx-file': example['tmx_source_file']}
+        yield {
+            'id': example['id'],
+            'tuid': example['tmx_tuid'] or example['id'],
+            'creationdate': tmx_date(example['translation_date']),
+            'creationid': '',
+            'lang_source': example['lang_source'],
+            'source': example['sentence_source'],
+            'targets': [(example['sentence_target'], example['lang_target'])],
+            'definition': '',
+            'domain': '',
+            'reviewed': True,
+            'props': props,
+        }
+
+
+def concept_units(path):
+    """Units of a concept table written by pivot_join.py (one column per language)."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        languages = [column for column in reader.fieldnames
+                     if LANG_CODE_RE.match(column) and column != PIVOT_LANG]
+        for row in reader:
+            targets = [(term, lang) for lang in languages
+                       for term in (row.get(lang) or '').split(TERM_SEPARATOR) if term.strip()]
+            yield {
+                'id': row['concept_id'],
+                'tuid': row['concept_id'],
+                'creationdate': '',
+                'creationid': '',
+                'lang_source': PIVOT_LANG,
+                'source': row[PIVOT_LANG],
+                'targets': targets,
+                'definition': '',
+                'domain': '',
+                'reviewed': False,
+                'props': {'x-dictionaries': row.get('dictionaries', '')},
+            }
+
+
+def iter_units(paths, data_dir=DATA_DIR):
+    """Units of every input file, by the kind of each file."""
+    for path in paths:
+        kind = input_kind(path)
+        if kind == 'concepts':
+            yield from concept_units(path)
+        elif kind == 'examples':
+            yield from example_units(path)
+        else:
+            yield from dictionary_units(path, data_dir)
+
+
+def filter_units(units, lang_target=None, reviewed=False, domain=None):
+    """Keep only targets in lang_target, reviewed units and units of a domain."""
+    for unit in units:
+        if reviewed and not unit['reviewed']:
+            continue
+        if domain and unit['domain'] != domain:
+            continue
+        if lang_target:
+            targets = [target for target in unit['targets'] if target[1] == lang_target]
+            if not targets:
+                continue
+            unit = dict(unit, targets=targets)
+        yield unit
+
+
+def tmx_header(lang_source=PIVOT_LANG, segtype='phrase'):
+    created = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<tmx version="1.4">\n'
+            f'  <header creationtool="{CREATION_TOOL}" creationtoolversion="{CREATION_TOOL_VERSION}" '
+            f'datatype="plaintext" segtype="{segtype}" adminlang="en-GB" srclang={_attr(xml_lang(lang_source))} '
+            f'o-tmf="{CREATION_TOOL}" creationdate="{created}"/>\n'
+            '  <body>\n')
+
+
+TMX_FOOTER = '  </body>\n</tmx>\n'
+
+
+def tmx_unit(unit):
+    """One <tu> (props and note first, then the source and target <tuv>s), or '' without targets."""
+    if not unit['targets']:
+        return ''
+    attributes = f' tuid={_attr(unit["tuid"])}' if unit['tuid'] else ''
+    if unit['creationdate']:
+        attributes += f' creationdate="{unit["creationdate"]}"'
+    if unit['creationid']:
+        attributes += f' creationid={_attr(unit["creationid"])}'
+    lines = [f'    <tu{attributes}>']
+    lines += [f'      <prop type={_attr(kind)}>{_text(value)}</prop>' for kind, value in unit['props'].items() if value]
+    if unit['definition']:
+        lines.append(f'      <note>{_text(unit["definition"])}</note>')
+    for text, lang in [(unit['source'], unit['lang_source'])] + list(unit['targets']):
+        lines.append(f'      <tuv xml:lang={_attr(xml_lang(lang))}><seg>{_text(text)}</seg></tuv>')
+    lines.append('    </tu>\n')
+    return '\n'.join(lines)
+
+
+def tbx_header(title='LexLink terminology'):
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<martif type="TBX-Basic" xml:lang="en">\n'
+            '  <martifHeader>\n'
+            f'    <fileDesc><titleStmt><title>{_text(title)}</title></titleStmt>'
+            f'<sourceDesc><p>Exported by {CREATION_TOOL} on '
+            f'{datetime.now(timezone.utc).strftime("%Y-%m-%d")}</p></sourceDesc></fileDesc>\n'
+            '    <encodingDesc><p type="XCSURI">TBXBasicXCSV02.xcs</p></encodingDesc>\n'
+            '  </martifHeader>\n'
+            '  <text>\n'
+            '    <body>\n')
+
+
+TBX_FOOTER = '    </body>\n  </text>\n</martif>\n'
+
+
+def tbx_entry(unit):
+    """One <termEntry>: a <langSet> per language, the source language first."""
+    entry_id = unit['id'] or unit['tuid']
+    # XML ids may not start with a digit (UUIDs often do)
+    attributes = f' id={_attr(entry_id if entry_id[:1].isalpha() else "c-" + entry_id)}' if entry_id else ''
+    lines = [f'      <termEntry{attributes}>']
+    if unit['domain']:
+        lines.append(f'        <descrip type="subjectField">{_text(unit["domain"])}</descrip>')
+    origin = [f'{kind[2:]}: {value}' for kind, value in unit['props'].items() if value and kind != 'x-domain']
+    if unit['tuid'] != unit['id']:
+        origin.insert(0, f'tuid: {unit["tuid"]}')
+    if origin:
+        lines.append(f'        <note>{_text("; ".join(origin))}</note>')
+
+    by_lang = {unit['lang_source']: [unit['source']]}
+    for text, lang in unit['targets']:
+        by_lang.setdefault(lang, []).append(text)
+    for lang, terms in by_lang.items():
+        lines.append(f'        <langSet xml:lang={_attr(xml_lang(lang))}>')
+        if lang == unit['lang_source'] and unit['definition']:
+            lines.append(f'          <descrip type="definition">{_text(unit["definition"])}</descrip>')
+        for term in dict.fromkeys(terms):
+            lines.append('          <tig>')
+            lines.append(f'            <term>{_text(term)}</term>')
+            if lang != unit['lang_source'] and (unit['creationdate'] or unit['creationid']):
+                lines.append('            <transacGrp><transac type="transactionType">origination</transac>')
+                if unit['creationid']:
+                    lines.append(f'              <transacNote type="responsibility">{_text(unit["creationid"])}</transacNote>')
+                if unit['creationdate']:
+                    created = datetime.strptime(unit['creationdate'], '%Y%m%dT%H%M%SZ').strftime('%Y-%m-%d')
+                    lines.append(f'              <date>{created}</date>')
+                lines.append('            </transacGrp>')
+            lines.append('          </tig>')
+        lines.append('        </langSet>')
+    lines.append('      </termEntry>\n')
+    return '\n'.join(lines)
+
+
+class ChunkedWriter:
+    """
+    Writes units to one file, or to numbered parts of at most chunk_size units.
+
+    Each part gets the header and footer and is moved into place once closed.
+
+    Usage:
+        with ChunkedWriter(path, header, footer, chunk_size=50000) as writer:
+            writer.write(text)
+        writer.paths    # files written
+    """
+
+    def __init__(self, path, header, footer, chunk_size=0):
+        self.path = Path(path)
+        self.header = header
+        self.footer = footer
+        self.chunk_size = chunk_size
+        self.paths = []
+        self.units = 0
+        self._file = None
+        self._tmp_path = None
+        self._in_part = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self._abort()
+
+    def _part_path(self):
+        if not self.chunk_size:
+            return self.path
+        return self.path.with_name(f'{self.path.stem}-{len(self.paths) + 1:04d}{self.path.suffix}')
+
+    def _open(self):
+        destination = self._part_path()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = destination.with_name(destination.name + '.tmp')
+        self._file = open(self._tmp_path, 'w', encoding='utf-8', newline='\n')
+        self._file.write(self.header)
+        self.paths.append(destination)
+        self._in_part = 0
+
+    def _finish(self):
+        self._file.write(self.footer)
+        self._file.close()
+        os.replace(self._tmp_path, self.paths[-1])
+        self._file = None
+
+    def write(self, text):
+        if not text:
+            return
+        if self._file is None:
+            self._open()
+        elif self.chunk_size and self._in_part >= self.chunk_size:
+            self._finish()
+            self._open()
+        self._file.write(text)
+        self._in_part += 1
+        self.units += 1
+
+    def close(self):
+        if self._file is None and not self.paths:
+            self._open()            # nothing matched: still write a valid, empty document
+        if self._file is not None:
+            self._finish()
+
+    def _abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._tmp_path.unlink(missing_ok=True)
+            self.paths.pop()
+            self._file = None
+
+
+def export(units, path, fmt, chunk_size=0, lang_source=PIVOT_LANG, segtype='phrase'):
+    """
+    Stream units to TMX or TBX.
+
+    Returns:
+        (number of units written, list of files)
+    """
+    if fmt == 'tmx':
+        header, footer, render = tmx_header(lang_source, segtype), TMX_FOOTER, tmx_unit
+    else:
+        header, footer, render = tbx_header(), TBX_FOOTER, tbx_entry
+    with ChunkedWriter(path, header, footer, chunk_size) as writer:
+        for unit in units:
+            writer.write(render(unit))
+    return writer.units, writer.paths
+
+
+def resolve_inputs(paths, examples=False, concepts=None, data_dir=DATA_DIR):
+    """
+    Input files and the name of the export.
+
+    Directories are expanded to the CSV/TSV files below them; without paths,
+    all dictionaries (or all example files with --examples) are used.
+    """
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files += [p for p in sorted(path.rglob('*')) if p.suffix in ('.csv', '.tsv')
+                      and not (p.suffix == '.tsv' and p.with_suffix('.csv').exists())]
+        else:
+            files.append(path)
+    if examples:
+        files += list(iter_example_files(data_dir))
+    if concepts:
+        files.append(Path(concepts))
+    if not files:
+        files = list(iter_dictionary_files(data_dir))
+
+    if concepts and len(files) == 1:
+        name = 'concepts'
+    elif examples and not paths and not concepts:
+        name = 'examples'
+    elif len(files) == 1:
+        name = dictionary_name(files[0], data_dir).replace('/', '_')
+    else:
+        name = 'dictionaries' if not examples else 'export'
+    return files, name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dictionaries, examples or concepts to TMX or TBX.")
+    parser.add_argument('format', choices=('tmx', 'tbx'))
+    parser.add_argument('paths', nargs='*', type=Path, help="CSV/TSV files or folders (default: all dictionaries)")
+    parser.add_argument('--examples', action='store_true', help="Export the example sentence pairs")
+    parser.add_argument('--concepts', nargs='?', const=CONCEPTS_PATH, type=Path,
+                        help=f"Export a concept table (default: {CONCEPTS_PATH.name})")
+    parser.add_argument('--lang-target', help="Only this target language")
+    parser.add_argument('--reviewed', action='store_true', help="Only expert-reviewed entries")
+    parser.add_argument('--domain', help="Only entries of this legal domain")
+    parser.add_argument('--chunk-size', type=int, default=0, metavar='N', help="Split into files of N units")
+    parser.add_argument('--output', type=Path, help=f"Output file (default: {EXPORT_DIR.name}/lexlink-NAME.FORMAT)")
+    args = parser.parse_args()
+
+    files, name = resolve_inputs(args.paths, args.examples, args.concepts)
+    missing = [path for path in files if not path.exists()]
+    if missing:
+        print(f"[X] Not found: {', '.join(str(path) for path in missing)}")
+        if args.concepts in missing:
+            print("    Run python scripts/pivot_join.py first")
+        sys.exit(1)
+    output = args.output or EXPORT_DIR / f'lexlink-{name}.{args.format}'
+
+    print("="*80)
+    print(f"EXPORT TO {args.format.upper()}")
+    print("="*80)
+    for path in files:
+        print(f"   {input_kind(path):<10} {path}")
+
+    started = time.perf_counter()
+    units = filter_units(iter_units(files), args.lang_target, args.reviewed, args.domain)
+    segtype = 'sentence' if all(input_kind(path) == 'examples' for path in files) else 'phrase'
+    count, paths = export(units, output, args.format, args.chunk_size, segtype=segtype)
+    elapsed = time.perf_counter() - started
+
+    print()
+    for path in paths:
+        print(f"[OK] {path} ({path.stat().st_size / 1024:.0f} KB)")
+    print(f"\nUnits: {count} | Files: {len(paths)} | {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
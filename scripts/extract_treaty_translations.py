@@ -6,13 +6,16 @@ Parses treaty XML files that contain both Dutch (nl) and French (fr) authentic t
 extracting matching article titles, chapter titles, and key terms.
 """
 
-import xml.etree.ElementTree as ET
 import csv
 import uuid
 import re
 from pathlib import Path
 from datetime import datetime
 
+from document_cache import load_treaty
+from instrumentation import timed
+from legal_registry import get_registry
+
 
 def clean_text(text):
     """Clean and normalize text."""
@@ -23,6 +26,7 @@ def clean_text(text):
     return text
 
 
+@timed
 def get_all_text(element):
     """Get all text content from an element and its children."""
     if element is None:
@@ -37,6 +41,7 @@ def get_all_text(element):
     return clean_text(' '.join(texts))
 
 
+@timed
 def extract_titles_and_content(verdrag_element):
     """Extract titles and content from a verdrag (treaty) element."""
     data = {
@@ -129,31 +134,20 @@ def extract_treaty_translations(xml_path, output_csv_path):
     """
     print(f"Parsing: {xml_path}")
 
-    # Parse XML
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    # Find Dutch and French versions
-    nl_verdrag = None
-    fr_verdrag = None
-
-    for verdrag in root.findall('.//verdrag'):
-        lang = verdrag.get('{http://www.w3.org/XML/1998/namespace}lang', '')
-        if lang == 'nl':
-            nl_verdrag = verdrag
-            print(f"Found Dutch version (xml:lang='nl')")
-        elif lang == 'fr':
-            fr_verdrag = verdrag
-            print(f"Found French version (xml:lang='fr')")
-
-    if nl_verdrag is None or fr_verdrag is None:
+    # Chapter and article records of each language version (see document_cache;
+    # the XML is only parsed when the file changed since the last run)
+    versions = load_treaty(xml_path)['versions']
+    nl_data = versions.get('nl')
+    fr_data = versions.get('fr')
+    if nl_data is not None:
+        print(f"Found Dutch version (xml:lang='nl')")
+    if fr_data is not None:
+        print(f"Found French version (xml:lang='fr')")
+
+    if nl_data is None or fr_data is None:
         print("ERROR: Could not find both Dutch and French versions")
         return 0
 
-    # Extract data from both versions
-    nl_data = extract_titles_and_content(nl_verdrag)
-    fr_data = extract_titles_and_content(fr_verdrag)
-
     print(f"Dutch version: {len(nl_data['chapters'])} chapters, {len(nl_data['articles'])} articles")
     print(f"French version: {len(fr_data['chapters'])} chapters, {len(fr_data['articles'])} articles")
 
@@ -252,12 +246,15 @@ def main():
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python extract_treaty_translations.py <xml_file> [output_csv]")
+        print("Usage: python extract_treaty_translations.py <xml_file | source_id> [output_csv]")
         print("\nExample:")
         print("  python extract_treaty_translations.py ../treaty/netherlands/BWBV0004110_2005-07-24_0/BWBV0004110_2005-07-24_0.xml")
         sys.exit(1)
 
     xml_path = Path(sys.argv[1])
+    registry = get_registry()
+    if not xml_path.exists() and sys.argv[1] in registry:
+        xml_path = registry.resolve(sys.argv[1]) or xml_path
 
     if not xml_path.exists():
         print(f"ERROR: File not found: {xml_path}")
@@ -0,0 +1,165 @@
+"""
+Typo-tolerant term lookup with a SymSpell deletion index.
+
+Every term is folded (casefolded, diacritics and apostrophes removed, so
+"Beëindiging" -> "beeindiging" and "royalty's" -> "royaltys") and all
+strings reachable by deleting up to `max_distance` characters from the
+first `prefix_length` characters of the folded key are precomputed. A query
+generates the same deletes, so candidate terms come from a handful of dict
+lookups and only those candidates are checked with a bounded
+Damerau-Levenshtein distance - no scan over the whole vocabulary.
+
+Suggestions are ranked by edit distance, then by frequency (how often the
+term occurs), then alphabetically.
+
+Exposed through TermIndex.fuzzy() and `python scripts/term_index.py --fuzzy`.
+"""
+
+from example_index import term_variants, tokenize
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+
+def fuzzy_key(text):
+    """Fold a term for fuzzy matching ("(Steen)groeve" -> "steengroeve")."""
+    return ' '.join(tokenize(text or '')).replace("'", '').replace('’', '')
+
+
+def fuzzy_keys(term):
+    """Fuzzy keys of every variant of a dictionary term (see term_variants)."""
+    keys = []
+    for tokens in term_variants(term):
+        key = ' '.join(tokens).replace("'", '').replace('’', '')
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance, abandoned once it exceeds max_distance.
+
+    Works on any sequences (strings, token tuples). Only the diagonal band
+    |i - j| <= max_distance is computed: cells outside it cannot lie on an
+    alignment within the bound.
+
+    Returns:
+        Distance, or max_distance + 1 when the strings are further apart
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+    over = max_distance + 1
+    width = len(b) + 1
+    previous_previous = None
+    previous = [j if j <= max_distance else over for j in range(width)]
+    for i, char_a in enumerate(a, 1):
+        current = [over] * width
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            char_b = b[j - 1]
+            cost = 0 if char_a == char_b else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and j > 1
+                    and char_a == b[j - 2] and a[i - 2] == char_b):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value if value < over else over
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else over
+
+
+def _deletes(word, max_distance):
+    """All strings obtained by deleting up to max_distance characters."""
+    result = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for candidate in frontier:
+            for i in range(len(candidate)):
+                deleted = candidate[:i] + candidate[i + 1:]
+                if deleted not in result:
+                    result.add(deleted)
+                    next_frontier.append(deleted)
+        frontier = next_frontier
+    return result
+
+
+class FuzzyIndex:
+    """
+    SymSpell deletion index over folded term keys.
+
+    Usage:
+        fuzzy = FuzzyIndex()
+        fuzzy.add('beëindiging', frequency=3)
+        fuzzy.lookup('beeindigng')
+        # [{'term': 'beëindiging', 'key': 'beeindiging', 'distance': 1, 'frequency': 3}]
+    """
+
+    def __init__(self, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._words = {}     # key -> [frequency, display term]
+        self._deletes = {}   # delete of key prefix -> list of keys
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, term, frequency=1):
+        """Add a term (all of its variants) with a frequency weight."""
+        for key in fuzzy_keys(term):
+            word = self._words.get(key)
+            if word is not None:
+                word[0] += frequency
+                continue
+            self._words[key] = [frequency, term]
+            for deleted in _deletes(key[:self.prefix_length], self.max_distance):
+                self._deletes.setdefault(deleted, []).append(key)
+
+    def lookup(self, query, max_distance=None, limit=10):
+        """
+        Suggest terms within max_distance edits of the query.
+
+        Returns:
+            List of dicts (term, key, distance, frequency), best first
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        key = fuzzy_key(query)
+        if not key:
+            return []
+
+        found = {}
+        checked = set()
+        prefix = key[:self.prefix_length]
+        seen = {prefix}
+        queue = [prefix]
+        for candidate in queue:
+            for word in self._deletes.get(candidate, ()):
+                if word in checked:
+                    continue
+                checked.add(word)
+                distance = edit_distance(key, word, max_distance)
+                if distance <= max_distance:
+                    found[word] = distance
+            if len(prefix) - len(candidate) < max_distance:
+                for i in range(len(candidate)):
+                    deleted = candidate[:i] + candidate[i + 1:]
+                    if deleted not in seen:
+                        seen.add(deleted)
+                        queue.append(deleted)
+
+        suggestions = [{'term': self._words[word][1], 'key': word, 'distance': distance,
+                        'frequency': self._words[word][0]} for word, distance in found.items()]
+        suggestions.sort(key=lambda s: (s['distance'], -s['frequency'], s['key']))
+        return suggestions[:limit]
+
@@ -5,13 +5,27 @@ Generates SEO-optimized individual pages for each term and article.
 Output: docs/ folder for GitHub Pages hosting.
 """
 
+import argparse
 import csv
 import re
+import sys
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import quote
 import json
 
+from build_metrics import BuildMetrics, parse_budgets
+from example_index import ExampleIndex, highlight
+from instrumentation import add_arguments, timed
+from json_api import JsonApiWriter, example_api_id, example_record, search_index, term_record
+
+# Number of example sentences shown on each term page
+TERM_PAGE_EXAMPLES = 5
+
+# Names of the target languages offered in the reverse lookup box
+LANGUAGE_NAMES = {'en-gb': 'English', 'de-de': 'German', 'fr-fr': 'French', 'es-es': 'Spanish'}
+
 def slugify(text):
     """Convert text to URL-friendly slug."""
     text = text.lower()
@@ -70,8 +84,45 @@ def create_base_template(title, content, lang_pair="nl-en", breadcrumb=""):
 </body>
 </html>"""
 
-def create_term_page(term_data, lang_pair):
-    """Generate individual term page with parallel language display."""
+def create_term_examples_section(term_source, term_target, examples, lang_target='en-gb'):
+    """
+    Render the example sentences section of a term page with the term highlighted.
+
+    The example sentences are Dutch-English, so the target term is only
+    highlighted in the English sentence when it is itself English.
+    """
+    if not examples:
+        return ''
+
+    items = ''
+    for ex in examples:
+        sentence_target = ex['sentence_en']
+        if lang_target == 'en-gb':
+            sentence_target = highlight(sentence_target, term_target)
+        items += f"""
+                <li class="term-example">
+                    <div class="example-source">{highlight(ex['sentence_nl'], term_source)}</div>
+                    <div class="example-target">{sentence_target}</div>
+                    <a href="../../articles/{ex['book_id']}/{ex['slug']}.html" class="example-link">View example →</a>
+                </li>"""
+
+    return f"""
+        <section class="term-examples">
+            <h3>Example Sentences</h3>
+            <ul>{items}
+            </ul>
+        </section>"""
+
+@timed
+def create_term_page(term_data, lang_pair, examples=None):
+    """
+    Generate individual term page with parallel language display.
+
+    Args:
+        term_data: Dictionary row
+        lang_pair: 'nl-en' or 'nl-de'
+        examples: Optional list of example entries (see generate_site) containing the term
+    """
     term_id = term_data.get('dictionary_term_id', '')
 
     if lang_pair == 'nl-en':
@@ -140,7 +191,7 @@ def create_term_page(term_data, lang_pair):
                 <dd>{'✓ Yes' if expert_reviewed.lower() == 'yes' else '✗ No'}</dd>
             </dl>
         </section>
-
+{create_term_examples_section(term_source, term_target, examples, lang_target)}
         <nav class="term-navigation">
             <a href="../dictionaries/{lang_source}_{lang_target}/index.html" class="btn">← Back to Dictionary</a>
         </nav>
@@ -149,8 +200,37 @@ def create_term_page(term_data, lang_pair):
     title = f"{term_source} → {term_target}"
     return create_base_template(title, content, f"{lang_source}-{lang_target}", breadcrumb)
 
-def create_article_page(example_data, lang_pair='nl-en'):
-    """Generate individual article/example page with parallel text."""
+def create_example_terms_section(terms):
+    """Render the list of dictionary terms that occur in an example sentence."""
+    if not terms:
+        return ''
+
+    items = ''
+    seen = set()
+    for term in terms:
+        key = (term['lang_pair'], term['slug'])
+        if key in seen:
+            continue
+        seen.add(key)
+        items += f"""
+                <li><a href="../../dictionaries/{term['lang_pair']}/{term['slug']}.html">{term['source_term']}</a> → {term['target_term']}</li>"""
+
+    return f"""
+        <section class="example-terms">
+            <h3>Terms in This Example</h3>
+            <ul>{items}
+            </ul>
+        </section>"""
+
+def create_article_page(example_data, lang_pair='nl-en', terms=None):
+    """
+    Generate individual article/example page with parallel text.
+
+    Args:
+        example_data: Example sentence row
+        lang_pair: Language pair of the sentences
+        terms: Optional list of term entries (see generate_site) occurring in the sentence
+    """
     example_id = example_data.get('example_id', '')
     sentence_nl = example_data.get('sentence_nl_nl', '')
     sentence_en = example_data.get('sentence_en_gb', '')
@@ -215,7 +295,7 @@ def create_article_page(example_data, lang_pair='nl-en'):
                 <dd>{example_id}</dd>
             </dl>
         </section>
-
+{create_example_terms_section(terms)}
         <nav class="term-navigation">
             <a href="../articles/{book_id}/index.html" class="btn">← Back to {book_id.upper()}</a>
             <a href="../articles/index.html" class="btn">All Articles</a>
@@ -237,7 +317,9 @@ def create_dictionary_index(terms, lang_pair, lang_source_name, lang_target_name
         </header>
 
         <div class="search-box">
-            <input type="text" id="searchInput" placeholder="Search terms..." onkeyup="filterTerms()">
+            <input type="text" id="searchInput" placeholder="Search terms..." onkeyup="filterTerms()"
+                   data-search-index="../../api/search/{lang_pair}.json">
+            <p class="search-suggestions" id="searchSuggestions" hidden></p>
         </div>
 
         <div class="term-list" id="termList">
@@ -275,11 +357,112 @@ def create_dictionary_index(terms, lang_pair, lang_source_name, lang_target_name
         const input = document.getElementById('searchInput');
         const filter = input.value.toLowerCase();
         const rows = document.querySelectorAll('#termList tbody tr');
+        let visible = 0;
 
         rows.forEach(row => {
             const text = row.textContent.toLowerCase();
-            row.style.display = text.includes(filter) ? '' : 'none';
+            const match = text.includes(filter);
+            row.style.display = match ? '' : 'none';
+            if (match) visible++;
         });
+
+        showSuggestions(visible === 0 && filter.length >= 3 ? input.value : '');
+    }
+
+    // "Did you mean" suggestions: SymSpell lookup over api/search/{lang_pair}.json
+    let fuzzyIndex = null;
+
+    function foldTerm(text) {
+        const tokens = text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase()
+            .match(/[\p{L}\p{N}_]+(?:['’][\p{L}\p{N}_]+)*/gu) || [];
+        return tokens.join(' ').replace(/['’]/g, '');
+    }
+
+    function deletes(word, maxDistance) {
+        const result = new Set([word]);
+        let frontier = [word];
+        for (let d = 0; d < maxDistance; d++) {
+            const next = [];
+            frontier.forEach(candidate => {
+                for (let i = 0; i < candidate.length; i++) {
+                    const deleted = candidate.slice(0, i) + candidate.slice(i + 1);
+                    if (!result.has(deleted)) {
+                        result.add(deleted);
+                        next.push(deleted);
+                    }
+                }
+            });
+            frontier = next;
+        }
+        return result;
+    }
+
+    function editDistance(a, b, maxDistance) {
+        if (Math.abs(a.length - b.length) > maxDistance) return maxDistance + 1;
+        let before = null;
+        let previous = Array.from({length: b.length + 1}, (_, j) => j);
+        for (let i = 1; i <= a.length; i++) {
+            const current = [i];
+            let rowMin = i;
+            for (let j = 1; j <= b.length; j++) {
+                let value = Math.min(previous[j] + 1, current[j - 1] + 1,
+                                     previous[j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1));
+                if (before && i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+                    value = Math.min(value, before[j - 2] + 1);
+                }
+                current.push(value);
+                rowMin = Math.min(rowMin, value);
+            }
+            if (rowMin > maxDistance) return maxDistance + 1;
+            before = previous;
+            previous = current;
+        }
+        return previous[b.length];
+    }
+
+    function loadFuzzyIndex() {
+        if (!fuzzyIndex) {
+            const url = document.getElementById('searchInput').dataset.searchIndex;
+            fuzzyIndex = fetch(url).then(response => response.json()).then(data => {
+                const index = new Map();
+                data.terms.forEach((term, i) => {
+                    deletes(term[0].slice(0, data.prefix_length), data.max_distance).forEach(deleted => {
+                        if (!index.has(deleted)) index.set(deleted, []);
+                        index.get(deleted).push(i);
+                    });
+                });
+                return {data, index};
+            });
+        }
+        return fuzzyIndex;
+    }
+
+    function showSuggestions(query) {
+        const box = document.getElementById('searchSuggestions');
+        if (!query) {
+            box.hidden = true;
+            return;
+        }
+        loadFuzzyIndex().then(({data, index}) => {
+            if (document.getElementById('searchInput').value !== query) return;
+            const key = foldTerm(query);
+            const found = new Map();
+            deletes(key.slice(0, data.prefix_length), data.max_distance).forEach(deleted => {
+                (index.get(deleted) || []).forEach(i => {
+                    if (!found.has(i)) found.set(i, editDistance(key, data.terms[i][0], data.max_distance));
+                });
+            });
+            const slugs = new Set();
+            const links = [...found]
+                .filter(([, distance]) => distance <= data.max_distance)
+                .sort((a, b) => a[1] - b[1] || data.terms[b[0]][3] - data.terms[a[0]][3])
+                .map(([i]) => data.terms[i])
+                .filter(term => !slugs.has(term[2]) && slugs.add(term[2]))
+                .slice(0, 5)
+                .map(term => `<a href="${term[2]}.html">${term[1]}</a>`);
+            box.innerHTML = links.length ? 'Did you mean: ' + links.join(', ') : 'No matching terms';
+            box.hidden = false;
+        }).catch(() => { box.hidden = true; });
     }
     </script>"""
 
@@ -294,6 +477,8 @@ def create_dictionary_index(terms, lang_pair, lang_source_name, lang_target_name
 
 def create_main_index(stats):
     """Create main landing page."""
+    language_options = ''.join(f'<option value="{lang}">{LANGUAGE_NAMES.get(lang, lang)}</option>'
+                               for lang in stats.get('reverse_languages', []))
     content = f"""
     <div class="hero">
         <h2>Multilingual Legal Translation Dictionary</h2>
@@ -335,6 +520,16 @@ def create_main_index(stats):
         </div>
     </section>
 
+    <section class="reverse-lookup">
+        <h3>Look Up a Translation</h3>
+        <p>Find the Dutch term for an English or German legal term</p>
+        <div class="search-box">
+            <select id="reverseLang" onchange="reverseLookup()">{language_options}</select>
+            <input type="text" id="reverseInput" placeholder="e.g. Betriebsstätte" onkeyup="reverseLookup()">
+            <ul class="reverse-results" id="reverseResults"></ul>
+        </div>
+    </section>
+
     <section class="articles">
         <h3>Legal Text Examples</h3>
         <p>Parallel translations of complete articles from official legislation</p>
@@ -353,11 +548,57 @@ def create_main_index(stats):
         </ul>
     </section>"""
 
+    content += """
+    <script>
+    // Reverse lookup: target term -> Dutch terms, via api/reverse/{lang_target}.json
+    const reverseIndexes = {};
+
+    function foldTerm(text) {
+        const tokens = text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase()
+            .match(/[\p{L}\p{N}_]+(?:['’][\p{L}\p{N}_]+)*/gu) || [];
+        return tokens.join(' ').replace(/['’]/g, '');
+    }
+
+    function reverseLookup() {
+        const lang = document.getElementById('reverseLang').value;
+        const query = document.getElementById('reverseInput').value;
+        const list = document.getElementById('reverseResults');
+        if (!lang || !query.trim()) {
+            list.innerHTML = '';
+            return;
+        }
+        if (!reverseIndexes[lang]) {
+            reverseIndexes[lang] = fetch(`api/reverse/${lang}.json`).then(response => response.json());
+        }
+        reverseIndexes[lang].then(index => {
+            if (document.getElementById('reverseInput').value !== query) return;
+            const entries = index[foldTerm(query)] || [];
+            list.innerHTML = entries.length
+                ? entries.map(([source, langPair, , page]) =>
+                    `<li><a href="${page}">${source}</a> <span class="domain-tag">${langPair}</span></li>`).join('')
+                : '<li>No matching terms</li>';
+        }).catch(() => { list.innerHTML = ''; });
+    }
+    </script>"""
+
     title = "Home"
     return create_base_template(title, content, "", "")
 
-def generate_site():
-    """Main site generation function."""
+def read_csv_rows(path, delimiter=','):
+    """Read all rows of a CSV/TSV file as dicts."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f, delimiter=delimiter))
+
+@timed
+def generate_site(metrics=None):
+    """
+    Main site generation function.
+
+    Args:
+        metrics: Optional BuildMetrics collecting per-phase timings
+    """
+    if metrics is None:
+        metrics = BuildMetrics()
     print("="*80)
     print("LEXLINK STATIC SITE GENERATOR")
     print("="*80)
@@ -373,6 +614,7 @@ def generate_site():
     (output_dir / 'dictionaries' / 'nl-nl_en-gb').mkdir(parents=True, exist_ok=True)
     (output_dir / 'dictionaries' / 'nl-nl_de-de').mkdir(parents=True, exist_ok=True)
     (output_dir / 'articles').mkdir(parents=True, exist_ok=True)
+    api = JsonApiWriter(output_dir / 'api', write_text=metrics.write_text)
 
     stats = {
         'total_terms': 0,
@@ -383,18 +625,59 @@ def generate_site():
         'nl_de_terms': 0
     }
 
+    # Index example sentences once so term and example pages can link to each other
+    print("\n[1/5] Indexing example sentences...")
+    examples_dir = data_dir / 'examples'
+    example_books = []                  # (book_id, source name, first doc id, end doc id)
+    example_entries = []                # doc id -> example entry
+    example_links = defaultdict(list)   # doc id -> term entries found in the sentence
+    example_index = ExampleIndex()
+
+    with metrics.phase('example-index'):
+        if examples_dir.exists():
+            for example_file in sorted(examples_dir.glob('examples_*.csv')):
+                book_match = re.search(r'book-[\d-]+', example_file.stem)
+                book_id = book_match.group(0) if book_match else 'unknown'
+
+                with metrics.measure('parse'):
+                    rows = read_csv_rows(example_file)
+
+                first = len(example_entries)
+                with metrics.measure('link'):
+                    for idx, row in enumerate(rows):
+                        example_id = row.get('example_id', f'ex-{idx}')
+                        example_entries.append({
+                            'slug': slugify(f"{book_id}-{example_id[:8]}"),
+                            'book_id': book_id,
+                            'sentence_nl': row.get('sentence_nl_nl', ''),
+                            'sentence_en': row.get('sentence_en_gb', ''),
+                            'data': row
+                        })
+                        example_index.add(row.get('sentence_nl_nl', ''))
+                example_books.append((book_id, example_file.stem, first, len(example_entries)))
+
+    print(f"   Indexed {len(example_index)} example sentences")
+
     # Process NL-EN dictionary
-    print("\n[1/4] Processing NL-EN Civil Procedure dictionary...")
+    print("\n[2/5] Processing NL-EN Civil Procedure dictionary...")
     nl_en_dict_path = data_dir / 'dictionaries' / 'nl-nl_en-gb' / 'dictionary_nl-nl_en-gb_civil-procedure.csv'
 
     if nl_en_dict_path.exists():
         nl_en_terms = []
-        with open(nl_en_dict_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
+        with metrics.phase('terms:nl-nl_en-gb'):
+            with metrics.measure('parse'):
+                rows = read_csv_rows(nl_en_dict_path)
+
+            with metrics.measure('link'):
+                term_examples, linked = example_index.link_terms(
+                    [row.get('term_nl_nl', '') for row in rows], limit=TERM_PAGE_EXAMPLES)
+
+            shard = api.open_shard(nl_en_dict_path.stem)
+            for row, doc_ids in zip(rows, term_examples):
                 slug = slugify(row.get('term_nl_nl', ''))
                 nl_en_terms.append({
                     'slug': slug,
+                    'lang_pair': 'nl-nl_en-gb',
                     'source_term': row.get('term_nl_nl', ''),
                     'target_term': row.get('term_en_gb', ''),
                     'domain': row.get('legal_domain', 'civil_procedure'),
@@ -402,31 +685,56 @@ def generate_site():
                 })
 
                 # Generate individual term page
-                html = create_term_page(row, 'nl-en')
+                examples = [example_entries[doc_id] for doc_id in doc_ids]
                 output_path = output_dir / 'dictionaries' / 'nl-nl_en-gb' / f'{slug}.html'
-                output_path.write_text(html, encoding='utf-8')
+                metrics.render_page(output_path, create_term_page, row, 'nl-en', examples)
+
+                # JSON endpoint and bulk row
+                record = term_record(nl_en_terms[-1], [example_api_id(ex) for ex in examples])
+                api.write_term(record)
+                shard.write(record)
+            api.close_shard(shard)
+
+            for doc_id, term_idxs in linked.items():
+                example_links[doc_id].extend(nl_en_terms[i] for i in term_idxs)
 
-        # Generate dictionary index
-        dict_index = create_dictionary_index(nl_en_terms, 'nl-nl_en-gb', 'Dutch', 'English')
-        (output_dir / 'dictionaries' / 'nl-nl_en-gb' / 'index.html').write_text(dict_index, encoding='utf-8')
+            # Fuzzy search index, ranked by how many example sentences use the term
+            frequencies = defaultdict(int)
+            for term_idxs in linked.values():
+                for i in term_idxs:
+                    frequencies[i] += 1
+            api.write_search('nl-nl_en-gb', search_index(
+                (term['source_term'], term['slug'], 1 + frequencies[i]) for i, term in enumerate(nl_en_terms)))
+
+            # Generate dictionary index
+            metrics.render_page(output_dir / 'dictionaries' / 'nl-nl_en-gb' / 'index.html',
+                                create_dictionary_index, nl_en_terms, 'nl-nl_en-gb', 'Dutch', 'English')
 
         stats['nl_en_terms'] = len(nl_en_terms)
         stats['total_terms'] += len(nl_en_terms)
         print(f"   Generated {len(nl_en_terms)} NL-EN term pages")
 
     # Process NL-DE dictionary
-    print("\n[2/4] Processing NL-DE Tax Treaty dictionary...")
+    print("\n[3/5] Processing NL-DE Tax Treaty dictionary...")
     nl_de_dict_path = data_dir / 'dictionaries' / 'nl-nl_de-de' / 'nl-nl-to-de-de.tsv'
 
     if nl_de_dict_path.exists():
         nl_de_terms = []
-        with open(nl_de_dict_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='\t')
-            for row in reader:
+        with metrics.phase('terms:nl-nl_de-de'):
+            with metrics.measure('parse'):
+                rows = read_csv_rows(nl_de_dict_path, delimiter='\t')
+
+            with metrics.measure('link'):
+                term_examples, linked = example_index.link_terms(
+                    [row.get('source', '') for row in rows], limit=TERM_PAGE_EXAMPLES)
+
+            shard = api.open_shard(nl_de_dict_path.stem)
+            for row, doc_ids in zip(rows, term_examples):
                 source_term = row.get('source', '')
                 slug = slugify(source_term)
                 nl_de_terms.append({
                     'slug': slug,
+                    'lang_pair': 'nl-nl_de-de',
                     'source_term': source_term,
                     'target_term': row.get('target', ''),
                     'domain': 'tax_law',
@@ -434,49 +742,56 @@ def generate_site():
                 })
 
                 # Generate individual term page
-                html = create_term_page(row, 'nl-de')
+                examples = [example_entries[doc_id] for doc_id in doc_ids]
                 output_path = output_dir / 'dictionaries' / 'nl-nl_de-de' / f'{slug}.html'
-                output_path.write_text(html, encoding='utf-8')
+                metrics.render_page(output_path, create_term_page, row, 'nl-de', examples)
 
-        # Generate dictionary index
-        dict_index = create_dictionary_index(nl_de_terms, 'nl-nl_de-de', 'Dutch', 'German')
-        (output_dir / 'dictionaries' / 'nl-nl_de-de' / 'index.html').write_text(dict_index, encoding='utf-8')
+                # JSON endpoint and bulk row
+                record = term_record(nl_de_terms[-1], [example_api_id(ex) for ex in examples])
+                api.write_term(record)
+                shard.write(record)
+            api.close_shard(shard)
+
+            for doc_id, term_idxs in linked.items():
+                example_links[doc_id].extend(nl_de_terms[i] for i in term_idxs)
+
+            # Fuzzy search index, ranked by how many example sentences use the term
+            frequencies = defaultdict(int)
+            for term_idxs in linked.values():
+                for i in term_idxs:
+                    frequencies[i] += 1
+            api.write_search('nl-nl_de-de', search_index(
+                (term['source_term'], term['slug'], 1 + frequencies[i]) for i, term in enumerate(nl_de_terms)))
+
+            # Generate dictionary index
+            metrics.render_page(output_dir / 'dictionaries' / 'nl-nl_de-de' / 'index.html',
+                                create_dictionary_index, nl_de_terms, 'nl-nl_de-de', 'Dutch', 'German')
 
         stats['nl_de_terms'] = len(nl_de_terms)
         stats['total_terms'] += len(nl_de_terms)
         print(f"   Generated {len(nl_de_terms)} NL-DE term pages")
 
     # Process example files
-    print("\n[3/4] Processing article examples...")
-    examples_dir = data_dir / 'examples'
+    print("\n[4/5] Processing article examples...")
 
-    if examples_dir.exists():
-        example_files = list(examples_dir.glob('examples_*.csv'))
+    for book_id, source_name, first, end in example_books:
+        book_dir = output_dir / 'articles' / book_id
+        book_dir.mkdir(parents=True, exist_ok=True)
 
-        for example_file in example_files:
-            book_match = re.search(r'book-[\d-]+', example_file.stem)
-            book_id = book_match.group(0) if book_match else 'unknown'
+        with metrics.phase(f'examples:{book_id}'):
+            examples = example_entries[first:end]
 
-            book_dir = output_dir / 'articles' / book_id
-            book_dir.mkdir(parents=True, exist_ok=True)
+            shard = api.open_shard(source_name)
+            for doc_id, ex in enumerate(examples, first):
+                # Generate individual article page
+                metrics.render_page(book_dir / f"{ex['slug']}.html", create_article_page,
+                                    ex['data'], 'nl-en', example_links.get(doc_id))
 
-            examples = []
-            with open(example_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for idx, row in enumerate(reader):
-                    example_id = row.get('example_id', f'ex-{idx}')
-                    slug = slugify(f"{book_id}-{example_id[:8]}")
-
-                    examples.append({
-                        'slug': slug,
-                        'sentence_nl': row.get('sentence_nl_nl', ''),
-                        'sentence_en': row.get('sentence_en_gb', ''),
-                        'data': row
-                    })
-
-                    # Generate individual article page
-                    html = create_article_page(row, 'nl-en')
-                    (book_dir / f'{slug}.html').write_text(html, encoding='utf-8')
+                # JSON endpoint and bulk row
+                record = example_record(ex, example_links.get(doc_id, ()))
+                api.write_example(record)
+                shard.write(record)
+            api.close_shard(shard)
 
             # Create book index
             book_index_content = f"""
@@ -503,11 +818,11 @@ def generate_site():
         <span>{book_id.upper()}</span>
     </div>"""
 
-            book_index_html = create_base_template(f"{book_id.upper()} Examples", book_index_content, "nl-en", breadcrumb)
-            (book_dir / 'index.html').write_text(book_index_html, encoding='utf-8')
+            metrics.render_page(book_dir / 'index.html', create_base_template,
+                                f"{book_id.upper()} Examples", book_index_content, "nl-en", breadcrumb)
 
-            stats['total_examples'] += len(examples)
-            print(f"   Generated {len(examples)} pages for {book_id}")
+        stats['total_examples'] += len(examples)
+        print(f"   Generated {len(examples)} pages for {book_id}")
 
     # Create main articles index
     articles_index_content = """
@@ -539,13 +854,15 @@ def generate_site():
         <span>Articles</span>
     </div>"""
 
-    articles_index_html = create_base_template("Legal Text Examples", articles_index_content, "nl-en", breadcrumb_articles)
-    (output_dir / 'articles' / 'index.html').write_text(articles_index_html, encoding='utf-8')
+    with metrics.phase('indexes'):
+        metrics.render_page(output_dir / 'articles' / 'index.html', create_base_template,
+                            "Legal Text Examples", articles_index_content, "nl-en", breadcrumb_articles)
 
     # Generate main index
-    print("\n[4/4] Generating main index...")
-    main_index = create_main_index(stats)
-    (output_dir / 'index.html').write_text(main_index, encoding='utf-8')
+    print("\n[5/5] Generating main index...")
+    stats['reverse_languages'] = api.reverse_languages
+    with metrics.phase('indexes'):
+        metrics.render_page(output_dir / 'index.html', create_main_index, stats)
 
     # Generate about page
     about_content = """
@@ -570,8 +887,11 @@ def generate_site():
         <p>Open source on GitHub: <a href="https://github.com/yourusername/legislation-library-lexlink">legislation-library-lexlink</a></p>
     </div>"""
 
-    about_html = create_base_template("About", about_content, "", "")
-    (output_dir / 'about.html').write_text(about_html, encoding='utf-8')
+    with metrics.phase('indexes'):
+        metrics.render_page(output_dir / 'about.html', create_base_template, "About", about_content, "", "")
+
+    with metrics.phase('api'):
+        manifest = api.write_manifest()
 
     print("\n" + "="*80)
     print("SUMMARY")
@@ -579,6 +899,8 @@ def generate_site():
     print(f"Total term pages generated:     {stats['total_terms']}")
     print(f"Total example pages generated:  {stats['total_examples']}")
     print(f"Total pages:                    {stats['total_terms'] + stats['total_examples'] + 10}")
+    print(f"JSON endpoints:                 {manifest['counts']['terms'] + manifest['counts']['examples']}")
+    print(f"Bulk NDJSON shards:             {len(manifest['shards'])}")
     print(f"\nOutput directory:               {output_dir}")
     print("\nNext steps:")
     print("1. Generate CSS stylesheet (scripts will create style.css)")
@@ -587,5 +909,39 @@ def generate_site():
     print("4. Site will be available at: https://yourusername.github.io/legislation-library-lexlink/")
     print()
 
+def main():
+    """Command-line entry point: build the site and write build-report.json."""
+    base_dir = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description="Generate the LexLink static site into docs/.")
+    parser.add_argument('--report', type=Path, default=base_dir / 'build-report.json',
+                        help="Path for the machine-readable build report (default: build-report.json)")
+    parser.add_argument('--budget', action='append', default=[], metavar='PHASE=SECONDS',
+                        help="Fail if a phase (or 'total') exceeds this wall time; repeatable")
+    add_arguments(parser)
+    parser.add_argument('--slowest', type=int, default=10,
+                        help="Number of slowest pages to include in the report")
+    args = parser.parse_args()
+
+    try:
+        budgets = parse_budgets(args.budget)
+    except ValueError as e:
+        parser.error(str(e))
+
+    metrics = BuildMetrics(slowest=args.slowest, profile_path=args.profile, trace_memory=args.trace_memory)
+    metrics.start()
+    generate_site(metrics)
+    metrics.finish()
+
+    report = metrics.write_report(args.report, budgets)
+    print("="*80)
+    print("BUILD METRICS")
+    print("="*80)
+    metrics.print_summary(report)
+    print(f"\n[OK] Build report written to: {args.report}")
+
+    if report['budget_violations']:
+        sys.exit(1)
+
 if __name__ == '__main__':
-    generate_site()
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Shared profiling hooks: function timings, cProfile and tracemalloc.
+
+Hot functions carry the @timed decorator, which counts calls and wall time
+in a process-wide table (two perf_counter calls per call; a recursive
+function is counted and timed on its outermost call only). Instrumentation wraps a run
+with an optional cProfile (--profile FILE.pstats) and tracemalloc
+(--trace-memory) and puts the timings, the top profiled functions and the
+top allocations into one JSON report, with one section per script:
+
+    instrumentation-report.json   {"runs": {"parse_tmx_to_dictionary": {...}, ...}}
+
+Any script can be run under instrumentation without changing it; scripts
+with options (validate_extraction.py, process_imports.py) also take the
+flags directly, and generate_static_site.py adds the same data to its
+build-report.json. Work done in worker processes is not seen by the
+parent: run those scripts with --jobs 1 to profile it.
+
+Usage:
+    python scripts/instrumentation.py parse_tmx_to_dictionary.py
+    python scripts/instrumentation.py --profile tmx.pstats --trace-memory \\
+        extract_treaty_translations.py nl-de-tax-treaty-2012
+    python scripts/process_imports.py --jobs 1 --profile imports.pstats
+
+    from instrumentation import timed
+
+    @timed
+    def parse_tmx_glossary(tmx_file_path, output_csv_path):
+        ...
+"""
+
+import argparse
+import cProfile
+import functools
+import json
+import os
+import pstats
+import runpy
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from dictionary_loader import BASE_DIR
+
+DEFAULT_REPORT = BASE_DIR / 'instrumentation-report.json'
+PROFILE_TOP = 15
+MEMORY_TOP = 10
+
+
+class _FunctionStats:
+    """Calls and wall time of one timed function."""
+
+    __slots__ = ('calls', 'seconds', 'slowest', 'active')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.slowest = 0.0
+        self.active = 0     # calls in progress, so recursion is timed once
+
+
+_timings = {}
+
+
+def timed(func=None, *, name=None):
+    """
+    Record calls and wall time of a function in the process-wide table.
+
+    Usage:
+        @timed
+        def get_all_text(element): ...
+
+        @timed(name='site:generate')
+        def generate_site(metrics=None): ...
+    """
+    if func is None:
+        return functools.partial(timed, name=name)
+    stats = _timings.setdefault(name or f'{func.__module__}.{func.__qualname__}', _FunctionStats())
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if stats.active:
+            return func(*args, **kwargs)
+        stats.calls += 1
+        stats.active += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.active -= 1
+            stats.seconds += elapsed
+            if elapsed > stats.slowest:
+                stats.slowest = elapsed
+    return wrapper
+
+
+def function_timings():
+    """
+    Timings of every timed function that was called, slowest total first.
+
+    Returns:
+        List of dicts (function, calls, total_seconds, mean_ms, max_ms)
+    """
+    rows = [{
+        # '__main__' when the module was run as a script
+        'function': name.replace('__main__.', f'{Path(sys.argv[0]).stem}.', 1),
+        'calls': stats.calls,
+        'total_seconds': round(stats.seconds, 4),
+        'mean_ms': round(stats.seconds * 1000 / stats.calls, 3),
+        'max_ms': round(stats.slowest * 1000, 3),
+    } for name, stats in _timings.items() if stats.calls]
+    rows.sort(key=lambda row: row['total_seconds'], reverse=True)
+    return rows
+
+
+def reset_timings():
+    for stats in _timings.values():
+        stats.calls, stats.seconds, stats.slowest = 0, 0.0, 0.0
+
+
+def profile_summary(path, limit=PROFILE_TOP):
+    """Top functions of a .pstats file by cumulative time, or None when it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    stats = pstats.Stats(str(path))
+    entries = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        entries.append({
+            'function': f"{Path(filename).name}:{line}({func})",
+            'calls': nc,
+            'total_seconds': round(tt, 4),
+            'cumulative_seconds': round(ct, 4),
+        })
+    entries.sort(key=lambda e: e['cumulative_seconds'], reverse=True)
+    return {'pstats_file': str(path), 'top_functions': entries[:limit]}
+
+
+class Instrumentation:
+    """
+    cProfile and tracemalloc around a run, plus the timed-function table.
+
+    Usage:
+        instrumentation = Instrumentation(profile_path='run.pstats', trace_memory=True)
+        instrumentation.start()
+        main()
+        instrumentation.finish()
+        instrumentation.write_report('instrumentation-report.json', 'parse_tmx_to_dictionary')
+    """
+
+    def __init__(self, profile_path=None, trace_memory=False, memory_top=MEMORY_TOP, profile_top=PROFILE_TOP):
+        self.profile_path = Path(profile_path) if profile_path else None
+        self.trace_memory = trace_memory
+        self.memory_top = memory_top
+        self.profile_top = profile_top
+        self.profile = None
+        self.memory = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self._profiler = None
+        self._started_wall = None
+        self._started_cpu = None
+
+    def start(self):
+        """Start the clock and the optional profilers."""
+        reset_timings()
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    def finish(self):
+        """Stop the clock and collect profiler output."""
+        self.wall = time.perf_counter() - self._started_wall
+        self.cpu = time.process_time() - self._started_cpu
+
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.memory = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top_allocations': [
+                    {
+                        'location': str(stat.traceback),
+                        'size_bytes': stat.size,
+                        'count': stat.count,
+                    }
+                    for stat in snapshot.statistics('lineno')[:self.memory_top]
+                ],
+            }
+
+        # After the snapshot, so reading the profile does not show up in it
+        if self._profiler is not None:
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(self.profile_path))
+            self._profiler = None
+            self.profile = profile_summary(self.profile_path, self.profile_top)
+
+    def report(self):
+        """Timings, profile and memory of the run."""
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'wall_seconds': round(self.wall, 4),
+            'cpu_seconds': round(self.cpu, 4),
+            'functions': function_timings(),
+            'profile': self.profile,
+            'memory': self.memory,
+        }
+
+    def write_report(self, path, name):
+        """
+        Store this run's report as runs[name] of a shared JSON report.
+
+        Other runs already in the file are kept.
+
+        Returns:
+            The report dict of this run
+        """
+        path = Path(path)
+        report = self.report()
+        try:
+            combined = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            combined = {}
+        if not isinstance(combined.get('runs'), dict):
+            combined = {'runs': {}}
+        combined['runs'][name] = report
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(json.dumps(combined, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+        return report
+
+
+def print_summary(report, limit=10):
+    """Print the timed functions, profile and memory parts of a report."""
+    functions = report.get('functions') or []
+    if functions:
+        print(f"{'Function':<56} {'calls':>8} {'total (s)':>10} {'mean (ms)':>10} {'max (ms)':>10}")
+        for row in functions[:limit]:
+            print(f"{row['function']:<56} {row['calls']:>8} {row['total_seconds']:>10.3f} "
+                  f"{row['mean_ms']:>10.3f} {row['max_ms']:>10.3f}")
+    profile = report.get('profile')
+    if profile:
+        print(f"\nProfile: {profile['pstats_file']} (top by cumulative time)")
+        for entry in profile['top_functions'][:limit]:
+            print(f"   {entry['cumulative_seconds']:>9.3f}s  {entry['function']}")
+    memory = report.get('memory')
+    if memory:
+        print(f"\nMemory: peak {memory['peak_bytes'] / 1024 / 1024:.1f} MB")
+        for allocation in memory['top_allocations'][:limit]:
+            print(f"   {allocation['size_bytes'] / 1024:>9.0f} KB  {allocation['location']}")
+
+
+def add_arguments(parser):
+    """Add --profile and --trace-memory to a script's argument parser."""
+    parser.add_argument('--profile', type=Path, metavar='PSTATS',
+                        help="Capture a cProfile of the run to this .pstats file")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record peak memory and top allocations with tracemalloc")
+
+
+def from_args(args):
+    """Instrumentation for parsed --profile/--trace-memory options."""
+    return Instrumentation(profile_path=args.profile, trace_memory=args.trace_memory)
+
+
+@contextmanager
+def instrumented(args, name, report_path=DEFAULT_REPORT):
+    """
+    Instrument the enclosed block when --profile or --trace-memory was given.
+
+    The run is stored as runs[name] of report_path and summarised on exit,
+    also when the block ends with sys.exit().
+
+    Usage:
+        with instrumented(args, 'validate_extraction'):
+            report = validate_all(...)
+    """
+    if not (args.profile or args.trace_memory):
+        yield None
+        return
+    instrumentation = from_args(args)
+    instrumentation.start()
+    try:
+        yield instrumentation
+    finally:
+        instrumentation.finish()
+        _print_run(name, instrumentation.write_report(report_path, name), report_path)
+
+
+def _print_run(name, report, report_path):
+    print("\n" + "="*80)
+    print(f"INSTRUMENTATION: {name} ({report['wall_seconds']:.3f}s wall, {report['cpu_seconds']:.3f}s CPU)")
+    print("="*80)
+    print_summary(report)
+    print(f"\n[OK] Report written to: {report_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a script with function timings and optional cProfile/tracemalloc.",
+        usage="%(prog)s [--profile PSTATS] [--trace-memory] [--report PATH] script.py [args ...]")
+    add_arguments(parser)
+    parser.add_argument('--report', type=Path, default=DEFAULT_REPORT, help="Combined JSON report")
+    parser.add_argument('script', type=Path, help="Script to run (looked up in scripts/ when not found)")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help="Arguments for the script")
+    args = parser.parse_args()
+
+    script = args.script
+    if not script.exists() and (Path(__file__).parent / script).exists():
+        script = Path(__file__).parent / script
+    if not script.exists():
+        parser.error(f"script not found: {args.script}")
+
+    sys.argv = [str(script)] + args.args
+    sys.path.insert(0, str(script.resolve().parent))
+    instrumentation = from_args(args)
+    instrumentation.start()
+    exit_code = 0
+    try:
+        runpy.run_path(str(script), run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code
+    finally:
+        instrumentation.finish()
+        _print_run(script.name, instrumentation.write_report(args.report, script.stem), args.report)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    # Run through the importable module, so the scripts' @timed functions and
+    # this runner share one timing table
+    import instrumentation
+    instrumentation.main()
@@ -0,0 +1,275 @@
+"""
+Static JSON API and bulk NDJSON exports for the LexLink site.
+
+Written next to the HTML pages by generate_static_site.py:
+
+    docs/api/terms/{lang_pair}/{term_id}.json   one endpoint per term
+    docs/api/terms/{lang_pair}/index.json       slug -> term ids
+    docs/api/examples/{example_id}.json         one endpoint per example sentence
+    docs/api/search/{lang_pair}.json            fuzzy search index for the dictionary page
+    docs/api/reverse/{lang_target}.json         target term -> source terms, per target language
+    docs/api/bulk/{source}.ndjson.gz            one gzip NDJSON shard per source CSV
+    docs/api/manifest.json                      row counts and SHA-256 of every shard
+
+Shards are streamed row by row while the pages are rendered and compressed
+deterministically (fixed gzip mtime), so an unchanged source produces a
+byte-identical shard and an unchanged hash in the manifest. Clients compare
+manifest hashes and download only the shards that changed.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from fuzzy_index import MAX_DISTANCE, PREFIX_LENGTH, fuzzy_keys
+
+API_VERSION = 1
+
+
+def _dumps(obj, indent=None):
+    return json.dumps(obj, ensure_ascii=False, indent=indent, sort_keys=indent is None)
+
+
+def term_api_id(term):
+    """Stable id of a term entry: the dictionary id column, falling back to the slug."""
+    row = term['data']
+    return row.get('dictionary_term_id') or row.get('id') or term['slug']
+
+
+def example_api_id(example):
+    """Stable id of an example entry: the example_id column, falling back to the slug."""
+    return example['data'].get('example_id') or example['slug']
+
+
+def term_record(term, example_ids=()):
+    """
+    Build the API record for a dictionary term.
+
+    Args:
+        term: Term entry from generate_site (slug, lang_pair, source_term, target_term, domain, data)
+        example_ids: Ids of example sentences containing the term
+    """
+    row = term['data']
+    lang_source, lang_target = term['lang_pair'].split('_')
+    return {
+        'id': term_api_id(term),
+        'lang_pair': term['lang_pair'],
+        'source_term': term['source_term'],
+        'lang_source': lang_source,
+        'target_term': term['target_term'],
+        'lang_target': lang_target,
+        'domain': term['domain'],
+        'page': f"dictionaries/{term['lang_pair']}/{term['slug']}.html",
+        'examples': list(example_ids),
+        'data': row,
+    }
+
+
+def reverse_entry(record):
+    """[source term, lang_pair, term id, page] of a term record, as stored in a reverse index."""
+    return [record['source_term'], record['lang_pair'], record['id'], record['page']]
+
+
+def example_record(example, terms=()):
+    """
+    Build the API record for an example sentence.
+
+    Args:
+        example: Example entry from generate_site (slug, book_id, sentence_nl, sentence_en, data)
+        terms: Term entries occurring in the sentence
+    """
+    row = example['data']
+    linked, seen = [], set()
+    for term in terms:
+        key = (term['lang_pair'], term_api_id(term))
+        if key not in seen:
+            seen.add(key)
+            linked.append({'lang_pair': key[0], 'id': key[1]})
+    return {
+        'id': example_api_id(example),
+        'book_id': example['book_id'],
+        'sentence_nl_nl': example['sentence_nl'],
+        'sentence_en_gb': example['sentence_en'],
+        'page': f"articles/{example['book_id']}/{example['slug']}.html",
+        'terms': linked,
+        'data': row,
+    }
+
+
+def search_index(entries):
+    """
+    Build the fuzzy ("did you mean") search index for a dictionary page.
+
+    Keys are folded with fuzzy_index.fuzzy_keys, so the page script only has
+    to fold the query and run the same SymSpell deletion lookup.
+
+    Args:
+        entries: Iterable of (term, slug, frequency)
+
+    Returns:
+        Dict with max_distance, prefix_length and [key, term, slug, frequency] rows
+    """
+    words = {}
+    for term, slug, frequency in entries:
+        for key in fuzzy_keys(term):
+            word = words.setdefault(key, [key, term, slug, 0])
+            word[3] += frequency
+    return {
+        'max_distance': MAX_DISTANCE,
+        'prefix_length': PREFIX_LENGTH,
+        'terms': sorted(words.values()),
+    }
+
+
+class NdjsonShard:
+    """Gzip-compressed NDJSON file written one record at a time."""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = Path(path)
+        self.rows = 0
+        self._sha256 = hashlib.sha256()
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._raw = open(self._tmp_path, 'wb')
+        self._gzip = gzip.GzipFile(filename='', mode='wb', fileobj=self._raw, mtime=0)
+
+    def write(self, record):
+        line = (_dumps(record) + '\n').encode('utf-8')
+        self._gzip.write(line)
+        self._sha256.update(line)
+        self.rows += 1
+
+    def close(self, previous_sha256=None):
+        """
+        Finish the shard and move it into place.
+
+        An existing shard whose previous manifest hash matches is left
+        untouched so its modification time (and HTTP caching) is preserved.
+
+        Returns:
+            Manifest entry dict
+        """
+        self._gzip.close()
+        self._raw.close()
+        digest = self._sha256.hexdigest()
+
+        if self.path.exists() and previous_sha256 == digest:
+            self._tmp_path.unlink()
+        else:
+            os.replace(self._tmp_path, self.path)
+
+        return {
+            'name': self.name,
+            'path': self.path.name,
+            'rows': self.rows,
+            'sha256': digest,
+            'bytes': self.path.stat().st_size,
+        }
+
+
+class JsonApiWriter:
+    """
+    Write per-term and per-example endpoints plus bulk shards under docs/api/.
+
+    Usage:
+        api = JsonApiWriter(output_dir / 'api', write_text=metrics.write_text)
+        shard = api.open_shard('dictionary_nl-nl_de-de')
+        for term in terms:
+            record = term_record(term, example_ids)
+            api.write_term(record)
+            shard.write(record)
+        api.close_shard(shard)
+        api.write_manifest()
+    """
+
+    def __init__(self, api_dir, write_text=None):
+        self.api_dir = Path(api_dir)
+        self._write_text = write_text or (lambda path, text: Path(path).write_text(text, encoding='utf-8'))
+        self.shards = []
+        self.counts = {'terms': 0, 'examples': 0}
+        self._term_index = {}   # lang_pair -> slug -> [ids]
+        self._reverse = {}      # lang_target -> fuzzy key of the target term -> [reverse entries]
+        self._previous = self._load_previous_hashes()
+        (self.api_dir / 'bulk').mkdir(parents=True, exist_ok=True)
+        (self.api_dir / 'examples').mkdir(parents=True, exist_ok=True)
+
+    def _load_previous_hashes(self):
+        manifest_path = self.api_dir / 'manifest.json'
+        if not manifest_path.exists():
+            return {}
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except ValueError:
+            return {}
+        return {shard['name']: shard['sha256'] for shard in manifest.get('shards', [])}
+
+    def write_term(self, record):
+        pair_dir = self.api_dir / 'terms' / record['lang_pair']
+        if record['lang_pair'] not in self._term_index:
+            pair_dir.mkdir(parents=True, exist_ok=True)
+            self._term_index[record['lang_pair']] = {}
+        slug = Path(record['page']).stem
+        self._term_index[record['lang_pair']].setdefault(slug, []).append(record['id'])
+        self._write_text(pair_dir / f"{record['id']}.json", _dumps(record, indent=2))
+        self.counts['terms'] += 1
+
+        # Reverse index, filled in the same pass; several source terms may share a target
+        if record['target_term']:
+            keys = self._reverse.setdefault(record['lang_target'], {})
+            entry = reverse_entry(record)
+            for key in fuzzy_keys(record['target_term']):
+                entries = keys.setdefault(key, [])
+                if entry not in entries:
+                    entries.append(entry)
+
+    @property
+    def reverse_languages(self):
+        """Target languages that have a reverse index so far, sorted."""
+        return sorted(self._reverse)
+
+    def write_example(self, record):
+        self._write_text(self.api_dir / 'examples' / f"{record['id']}.json", _dumps(record, indent=2))
+        self.counts['examples'] += 1
+
+    def write_search(self, lang_pair, index):
+        """Write a search index (see search_index) compactly; it is fetched by the browser."""
+        (self.api_dir / 'search').mkdir(parents=True, exist_ok=True)
+        self._write_text(self.api_dir / 'search' / f'{lang_pair}.json',
+                         json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+
+    def open_shard(self, name):
+        return NdjsonShard(name, self.api_dir / 'bulk' / f'{name}.ndjson.gz')
+
+    def close_shard(self, shard):
+        self.shards.append(shard.close(self._previous.get(shard.name)))
+
+    def write_manifest(self):
+        """Write term slug indexes, reverse indexes and manifest.json; return the manifest dict."""
+        for lang_pair, slugs in self._term_index.items():
+            self._write_text(self.api_dir / 'terms' / lang_pair / 'index.json', _dumps(slugs, indent=2))
+        if self._reverse:
+            (self.api_dir / 'reverse').mkdir(parents=True, exist_ok=True)
+        for lang_target, keys in self._reverse.items():
+            self._write_text(self.api_dir / 'reverse' / f'{lang_target}.json',
+                             json.dumps(keys, ensure_ascii=False, sort_keys=True, separators=(',', ':')))
+
+        manifest = {
+            'api_version': API_VERSION,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'endpoints': {
+                'term': 'api/terms/{lang_pair}/{id}.json',
+                'term_index': 'api/terms/{lang_pair}/index.json',
+                'example': 'api/examples/{id}.json',
+                'search': 'api/search/{lang_pair}.json',
+                'reverse': 'api/reverse/{lang_target}.json',
+                'bulk': 'api/bulk/{path}',
+            },
+            'counts': dict(self.counts),
+            'reverse_languages': self.reverse_languages,
+            'shards': sorted(self.shards, key=lambda s: s['name']),
+        }
+        self._write_text(self.api_dir / 'manifest.json', _dumps(manifest, indent=2))
+        return manifest
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Knowledge graph of terms, example sentences, articles and legal sources.
+
+Every object gets an integer node id:
+
+    term        one per language and normalised term (dictionary_loader.normalise_key)
+    example     example sentence pairs (data/examples, examples_term_usage_in_sources.csv)
+    article     treaty articles under treaty/ (read through document_cache)
+    source      legal sources of the registry, and treaties it does not list yet
+
+and the links between them are typed edges:
+
+    translates-to   term -> term                a dictionary entry's source and target terms
+    occurs-in       term -> example | article   the term occurs in the sentence or article text
+    cites           example | article -> source the text is quoted from / part of the source
+    defined-in      term -> source              the term comes from the source's glossary or
+                                                dictionary, or is defined in it
+
+Edges are stored in compressed sparse row (CSR) form: for node u, its
+edges are targets[offsets[u]:offsets[u + 1]] with their types in a parallel
+byte array, and a transposed copy gives the incoming edges. Both are
+`array` buffers (4 bytes per node id, 1 per type), so a graph of a million
+edges takes about 10 MB and a neighbourhood query is a few array slices.
+
+Usage:
+    python scripts/knowledge_graph.py                            # write lexlink-graph.json
+    python scripts/knowledge_graph.py --format graphml           # lexlink-graph.graphml (Gephi, yEd)
+    python scripts/knowledge_graph.py rechtspersoon --depth 2    # print a term's neighbourhood
+    python scripts/knowledge_graph.py "vaste inrichting" --types translates-to,occurs-in --output vi.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from corpus_stats import TREATY_GLOB, USAGE_PATH
+from dictionary_loader import BASE_DIR, DATA_DIR, iter_example_files, load_dictionaries, load_examples, normalise_key
+from document_cache import load_treaty
+from example_index import ExampleIndex
+from legal_registry import PATH_COLUMNS, get_registry
+
+DEFAULT_OUTPUT = BASE_DIR / 'lexlink-graph'
+KINDS = ('term', 'example', 'article', 'source')
+EDGE_TYPES = ('translates-to', 'occurs-in', 'cites', 'defined-in')
+TYPE_BITS = 2               # edge type in the low bits of a packed edge
+INDEX_TYPE = 'I' if array('I').itemsize >= 4 else 'L'
+BWB_ID_RE = re.compile(r'BWB[RV]\d+')
+
+
+def _counting_sort(node_count, owners, codes, dedupe=False):
+    """
+    Group packed edges by owner node.
+
+    Returns:
+        (offsets, codes): CSR offsets and the codes ordered by owner, sorted
+        and without repeats per owner when dedupe is set
+    """
+    offsets = array(INDEX_TYPE, [0]) * (node_count + 1)
+    for owner in owners:
+        offsets[owner + 1] += 1
+    for node in range(node_count):
+        offsets[node + 1] += offsets[node]
+    position = offsets[:-1]
+    ordered = array('Q', [0]) * len(codes)
+    for owner, code in zip(owners, codes):
+        ordered[position[owner]] = code
+        position[owner] += 1
+    if not dedupe:
+        return offsets, ordered
+
+    compact = array('Q')
+    start = 0
+    for node in range(node_count):
+        end = offsets[node + 1]
+        compact.extend(sorted(set(ordered[start:end])))
+        start, offsets[node + 1] = end, len(compact)
+    return offsets, compact
+
+
+class KnowledgeGraph:
+    """
+    Typed directed graph in CSR form (see GraphBuilder and build_graph).
+
+    Usage:
+        graph = build_graph()
+        node = graph.find_term('rechtspersoon')[0]
+        graph.neighbours(node)                          # [(node id, 'translates-to'), ...]
+        graph.neighbourhood(node, depth=2)              # {node id: distance}
+        graph.key(node), graph.label(node), graph.kind(node)
+    """
+
+    def __init__(self, keys, labels, kinds, offsets, codes):
+        self.keys = keys                    # node id -> 'kind:key'
+        self.labels = labels                # node id -> display text
+        self.kinds = kinds                  # node id -> index in KINDS
+        self.ids = {key: node for node, key in enumerate(keys)}
+        self.term_langs = sorted({key.split(':')[1] for key in keys if key.startswith('term:')})
+        mask = (1 << TYPE_BITS) - 1
+        self.offsets = offsets
+        self.targets = array(INDEX_TYPE, (code >> TYPE_BITS for code in codes))
+        self.types = array('B', (code & mask for code in codes))
+
+        owners = array(INDEX_TYPE)
+        for node in range(len(keys)):
+            owners.extend(array(INDEX_TYPE, [node]) * (offsets[node + 1] - offsets[node]))
+        incoming = array('Q', (owner << TYPE_BITS | edge_type for owner, edge_type in zip(owners, self.types)))
+        self.in_offsets, incoming = _counting_sort(len(keys), self.targets, incoming)
+        self.in_sources = array(INDEX_TYPE, (code >> TYPE_BITS for code in incoming))
+        self.in_types = array('B', (code & mask for code in incoming))
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def nbytes(self):
+        """Bytes held by the adjacency arrays."""
+        return sum(len(buffer) * buffer.itemsize for buffer in (
+            self.offsets, self.targets, self.types, self.in_offsets, self.in_sources, self.in_types, self.kinds))
+
+    def key(self, node):
+        return self.keys[node]
+
+    def label(self, node):
+        return self.labels[node]
+
+    def kind(self, node):
+        return KINDS[self.kinds[node]]
+
+    def node(self, kind, key):
+        """Node id of an object ('source', 'nl-de-tax-treaty-2012'), or None."""
+        return self.ids.get(f'{kind}:{key}')
+
+    def find_term(self, term, lang=None):
+        """Term node ids for a term text, in every language unless lang is given."""
+        key = normalise_key(term)
+        if lang:
+            node = self.node('term', f'{lang}:{key}')
+            return [node] if node is not None else []
+        return [self.ids[f'term:{lang}:{key}'] for lang in self.term_langs if f'term:{lang}:{key}' in self.ids]
+
+    def neighbours(self, node, types=None, direction='out'):
+        """
+        Adjacent nodes of one node.
+
+        Args:
+            types: Edge type names to follow (default: all)
+            direction: 'out', 'in' or 'both'
+
+        Returns:
+            List of (node id, edge type name)
+        """
+        wanted = None if types is None else {EDGE_TYPES.index(name) for name in types}
+        result = []
+        if direction in ('out', 'both'):
+            start, end = self.offsets[node], self.offsets[node + 1]
+            result += zip(self.targets[start:end], self.types[start:end])
+        if direction in ('in', 'both'):
+            start, end = self.in_offsets[node], self.in_offsets[node + 1]
+            result += zip(self.in_sources[start:end], self.in_types[start:end])
+        return [(other, EDGE_TYPES[edge_type]) for other, edge_type in result
+                if wanted is None or edge_type in wanted]
+
+    def neighbourhood(self, node, depth=1, types=None, direction='both', limit=None):
+        """
+        Nodes within `depth` edges of a node, breadth-first.
+
+        Returns:
+            Dict of node id -> distance (the start node has distance 0); at
+            most `limit` nodes when a limit is given
+        """
+        wanted = None if types is None else {EDGE_TYPES.index(name) for name in types}
+        arrays = []
+        if direction in ('out', 'both'):
+            arrays.append((self.offsets, self.targets, self.types))
+        if direction in ('in', 'both'):
+            arrays.append((self.in_offsets, self.in_sources, self.in_types))
+        distances = {node: 0}
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            distance = distances[current] + 1
+            if distance > depth:
+                continue
+            for offsets, others, edge_types in arrays:
+                start, end = offsets[current], offsets[current + 1]
+                for other, edge_type in zip(others[start:end], edge_types[start:end]):
+                    if other in distances or (wanted is not None and edge_type not in wanted):
+                        continue
+                    distances[other] = distance
+                    if limit and len(distances) >= limit:
+                        return distances
+                    queue.append(other)
+        return distances
+
+    def edges(self, nodes=None):
+        """Yield (source, target, edge type name) of every edge, or of the edges between `nodes`."""
+        for source in (range(len(self)) if nodes is None else sorted(nodes)):
+            start, end = self.offsets[source], self.offsets[source + 1]
+            for target, edge_type in zip(self.targets[start:end], self.types[start:end]):
+                if nodes is None or target in nodes:
+                    yield source, target, EDGE_TYPES[edge_type]
+
+    def stats(self):
+        """Node counts per kind and edge counts per type."""
+        return {'nodes': dict(Counter(KINDS[kind] for kind in self.kinds)),
+                'edges': dict(Counter(EDGE_TYPES[edge_type] for edge_type in self.types))}
+
+
+class GraphBuilder:
+    """
+    Collects nodes and edges, then packs them into a KnowledgeGraph.
+
+    Repeated edges (same ends and type) are kept once.
+
+    Usage:
+        builder = GraphBuilder()
+        term = builder.node('term', 'nl-nl:verdrag', 'Verdrag')
+        builder.edge(term, builder.node('source', 'nl-de-tax-treaty-2012'), 'defined-in')
+        graph = builder.build()
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+        self.labels = []
+        self.kinds = array('B')
+        self._owners = array(INDEX_TYPE)
+        self._codes = array('Q')        # target << TYPE_BITS | edge type
+
+    def node(self, kind, key, label=''):
+        """Node id of an object, created on first use."""
+        key = f'{kind}:{key}'
+        node = self.ids.get(key)
+        if node is None:
+            node = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.labels.append(label or key.split(':', 1)[1])
+            self.kinds.append(KINDS.index(kind))
+        return node
+
+    def edge(self, source, target, edge_type):
+        self._owners.append(source)
+        self._codes.append(target << TYPE_BITS | EDGE_TYPES.index(edge_type))
+
+    def build(self):
+        offsets, codes = _counting_sort(len(self.keys), self._owners, self._codes, dedupe=True)
+        return KnowledgeGraph(self.keys, self.labels, self.kinds, offsets, codes)
+
+
+def _language(lang):
+    """'nl-nl' and the treaty version key 'nl' both match as 'nl'."""
+    return lang.split('-')[0].lower()
+
+
+def build_graph(data_dir=DATA_DIR, base_dir=BASE_DIR, usage_path=USAGE_PATH):
+    """
+    Build the graph from dictionaries, examples, treaties and the registry.
+
+    Terms are linked to the sentences and articles of their language with
+    one ExampleIndex per language (example_index.term_variants matching).
+    """
+    builder = GraphBuilder()
+    registry = get_registry()
+    tmx_sources, bwb_sources = {}, {}
+    for source_id in registry:
+        row = registry[source_id]
+        builder.node('source', source_id, row.get('short_title_nl') or row.get('full_title_nl'))
+        for column in PATH_COLUMNS:
+            if row.get(column, '').endswith('.tmx'):
+                tmx_sources[Path(row[column]).name] = source_id
+        match = BWB_ID_RE.search(row.get('xml_file_path', ''))
+        if match:
+            bwb_sources[match.group()] = source_id
+
+    documents = defaultdict(list)       # language -> [(node id, text)]
+    for path in sorted(Path(base_dir).glob(TREATY_GLOB)):
+        bwb_id = Path(path).stem.split('_')[0]
+        source_id = registry.source_for_path(path) or bwb_id
+        bwb_sources.setdefault(bwb_id, source_id)
+        versions = load_treaty(path)['versions']
+        pivot = versions.get('nl') or next(iter(versions.values()), None)
+        source = builder.node('source', source_id, pivot['intitule'] if pivot else '')
+        for lang, version in versions.items():
+            for number, article in enumerate(version['articles'], 1):
+                # Language versions share the part of the path after /Verdrag_N
+                location = article['bwb_ng'].split('/', 2)[2] if article['bwb_ng'].count('/') >= 2 else number
+                node = builder.node('article', f'{source_id}/{location}',
+                                    f"{article['label']} {article['title']}".strip() if version is pivot else '')
+                builder.edge(node, source, 'cites')
+                documents[_language(lang)].append((node, ' '.join([article['title']] + article['paragraphs'])))
+
+    terms = defaultdict(dict)           # language -> {term node: text}
+    term_ids = {}                       # dictionary entry id -> source term node
+    for entry in load_dictionaries(data_dir):
+        if not entry['source'] or not entry['lang_source']:
+            continue
+        term = builder.node('term', f"{entry['lang_source']}:{normalise_key(entry['source'])}", entry['source'])
+        terms[_language(entry['lang_source'])][term] = entry['source']
+        if entry['id']:
+            term_ids[entry['id']] = term
+        for text, lang in entry['targets']:
+            target = builder.node('term', f'{lang}:{normalise_key(text)}', text)
+            terms[_language(lang)][target] = text
+            builder.edge(term, target, 'translates-to')
+        bwb_match = BWB_ID_RE.search(entry['dictionary'])
+        source_id = tmx_sources.get(entry['tmx_source_file']) or (bwb_match and bwb_sources.get(bwb_match.group()))
+        if source_id:
+            builder.edge(term, builder.node('source', source_id), 'defined-in')
+
+    for path in iter_example_files(data_dir):
+        for example in load_examples(path):
+            node = builder.node('example', example['id'], example['sentence_source'])
+            source_id = tmx_sources.get(example['tmx_source_file']) or example['legal_source_id']
+            if source_id:
+                builder.edge(node, builder.node('source', source_id), 'cites')
+            documents[_language(example['lang_source'])].append((node, example['sentence_source']))
+            documents[_language(example['lang_target'])].append((node, example['sentence_target']))
+
+    if Path(usage_path).exists():
+        with open(usage_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                node = builder.node('example', row['example_id'], row.get('example_sentence_nl', ''))
+                source = builder.node('source', row['legal_source_id']) if row.get('legal_source_id') else None
+                if source is not None:
+                    builder.edge(node, source, 'cites')
+                term = term_ids.get(row.get('dictionary_term_id', ''))
+                if term is not None:
+                    builder.edge(term, node, 'occurs-in')
+                    if source is not None and row.get('is_legal_definition', '').lower() in ('yes', 'true', '1'):
+                        builder.edge(term, source, 'defined-in')
+
+    for language, language_terms in terms.items():
+        texts = documents.get(language)
+        if not texts:
+            continue
+        index = ExampleIndex(text for _, text in texts)
+        nodes = list(language_terms)
+        term_documents, _ = index.link_terms(language_terms[node] for node in nodes)
+        for term, doc_ids in zip(nodes, term_documents):
+            for doc_id in doc_ids:
+                builder.edge(term, texts[doc_id][0], 'occurs-in')
+
+    return builder.build()
+
+
+def _atomic_open(path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return open(path.with_name(path.name + '.tmp'), 'w', encoding='utf-8', newline='\n')
+
+
+def write_json(graph, path, nodes=None):
+    """
+    Node-link JSON (D3 forceSimulation, networkx.node_link_graph), written as a stream.
+
+    Nodes and links refer to each other by key ('term:nl-nl:verdrag').
+    """
+    path = Path(path)
+    selected = range(len(graph)) if nodes is None else sorted(nodes)
+    with _atomic_open(path) as f:
+        f.write('{"directed": true, "multigraph": false, "graph": {}, "nodes": [')
+        for number, node in enumerate(selected):
+            item = {'id': graph.key(node), 'kind': graph.kind(node), 'label': graph.label(node)}
+            f.write((',\n' if number else '\n') + json.dumps(item, ensure_ascii=False))
+        f.write('\n], "links": [')
+        for number, (source, target, edge_type) in enumerate(graph.edges(nodes)):
+            item = {'source': graph.key(source), 'target': graph.key(target), 'type': edge_type}
+            f.write((',\n' if number else '\n') + json.dumps(item, ensure_ascii=False))
+        f.write('\n]}\n')
+    os.replace(path.with_name(path.name + '.tmp'), path)
+
+
+def write_graphml(graph, path, nodes=None):
+    """GraphML with kind/label node attributes and a type edge attribute, written as a stream."""
+    path = Path(path)
+    selected = range(len(graph)) if nodes is None else sorted(nodes)
+    with _atomic_open(path) as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                '  <key id="kind" for="node" attr.name="kind" attr.type="string"/>\n'
+                '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+                '  <key id="type" for="edge" attr.name="type" attr.type="string"/>\n'
+                '  <graph id="lexlink" edgedefault="directed">\n')
+        for node in selected:
+            f.write(f'    <node id="n{node}"><data key="kind">{graph.kind(node)}</data>'
+                    f'<data key="label">{escape(graph.label(node))}</data></node>\n')
+        for source, target, edge_type in graph.edges(nodes):
+            f.write(f'    <edge source="n{source}" target="n{target}"><data key="type">{edge_type}</data></edge>\n')
+        f.write('  </graph>\n</graphml>\n')
+    os.replace(path.with_name(path.name + '.tmp'), path)
+
+
+WRITERS = {'json': write_json, 'graphml': write_graphml}
+
+
+def print_neighbourhood(graph, node, distances):
+    print(f"\n{graph.label(node)} ({graph.key(node)})")
+    direct = dict(graph.neighbours(node, direction='out'))
+    direct.update({other: f'<- {edge_type}' for other, edge_type in graph.neighbours(node, direction='in')})
+    for other, distance in sorted(distances.items(), key=lambda item: (item[1], graph.kinds[item[0]], graph.label(item[0]))):
+        if other == node:
+            continue
+        relation = direct.get(other, f'distance {distance}')
+        label = graph.label(other)
+        print(f"   {relation:<18} {graph.kind(other):<8} {label[:70] + '...' if len(label) > 70 else label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the term/example/article/source knowledge graph.")
+    parser.add_argument('term', nargs='?', help="Show and export the neighbourhood of this term")
+    parser.add_argument('--lang', help="Language of the term (default: any)")
+    parser.add_argument('--depth', type=int, default=1)
+    parser.add_argument('--types', help=f"Comma-separated edge types to follow ({', '.join(EDGE_TYPES)})")
+    parser.add_argument('--limit', type=int, default=500, help="Most nodes in a neighbourhood")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='json')
+    parser.add_argument('--output', type=Path, help=f"Export file (default: {DEFAULT_OUTPUT.name}.FORMAT)")
+    args = parser.parse_args()
+    types = args.types.split(',') if args.types else None
+    if types and set(types) - set(EDGE_TYPES):
+        parser.error(f"unknown edge type: {', '.join(sorted(set(types) - set(EDGE_TYPES)))}")
+
+    print("="*80)
+    print("KNOWLEDGE GRAPH")
+    print("="*80)
+
+    started = time.perf_counter()
+    graph = build_graph()
+    elapsed = time.perf_counter() - started
+    stats = graph.stats()
+    print(f"\nNodes: {len(graph)} ({', '.join(f'{count} {kind}' for kind, count in stats['nodes'].items())})")
+    print(f"Edges: {graph.edge_count} ({', '.join(f'{count} {name}' for name, count in stats['edges'].items())})")
+    print(f"Adjacency arrays: {graph.nbytes() / 1024:.0f} KB | Built in {elapsed:.2f}s")
+
+    nodes = None
+    if args.term:
+        found = graph.find_term(args.term, args.lang)
+        if not found:
+            print(f"\n[X] Term not found: {args.term}")
+            sys.exit(1)
+        nodes = set()
+        for node in found:
+            distances = graph.neighbourhood(node, args.depth, types, limit=args.limit)
+            print_neighbourhood(graph, node, distances)
+            nodes.update(distances)
+        if not args.output:
+            return
+
+    output = args.output or DEFAULT_OUTPUT.with_suffix(f'.{args.format}')
+    WRITERS[args.format](graph, output, nodes)
+    print(f"\n[OK] {output} ({output.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
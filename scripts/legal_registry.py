@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Legal source registry: source ids -> verified files -> parsed documents.
+
+registry_legal_sources_UPDATED.csv describes every legal source (treaty,
+code) with the path of its XML text and, for translated codes, its TMX
+files. Those paths were written for an older layout: the registry says
+`legislation/netherlands/...` while the files live under `treaty/...`, and
+TMX files may only exist in the import archive. This module indexes the
+registry by source_id and resolves each path against the known roots, so
+callers ask for a source instead of hard-coding a path.
+
+Parsed XML documents are loaded lazily and kept in an LRU cache bounded by
+the size of the source files (DEFAULT_CACHE_BYTES), so linking, article
+matching and page generation in one process share one parsed tree of the
+4k-line treaty instead of each parsing it again. A cached tree is dropped
+when its file changes on disk.
+
+Usage:
+    python scripts/legal_registry.py                  # list sources and verify their files
+    python scripts/legal_registry.py nl-de-tax-treaty-2012
+
+    from legal_registry import get_registry
+    registry = get_registry()
+    tree = registry.document('nl-de-tax-treaty-2012')   # ElementTree, parsed once
+    tree = registry.parse(path)                         # any XML file, same cache
+"""
+
+import argparse
+import csv
+import sys
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from pathlib import Path
+
+from dictionary_loader import BASE_DIR
+
+REGISTRY_PATH = BASE_DIR / 'registry_legal_sources_UPDATED.csv'
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024      # source XML bytes kept parsed (trees use several times more)
+
+# Interchangeable top-level folders for legal texts, and where TMX files may have gone
+XML_ROOTS = ('legislation', 'treaty')
+TMX_ROOTS = ('translation-dictionaries', 'import/glossaries', 'data/raw/tmx')
+PATH_COLUMNS = ('xml_file_path', 'tmx_glossary_path', 'tmx_book1_path', 'tmx_book2_3_path', 'tmx_book4_path')
+
+
+def candidate_paths(value, base_dir=BASE_DIR):
+    """
+    Locations where a registry path may point to, in order of preference.
+
+    The path as written comes first. Then the same path under the other
+    legal-text roots (legislation/ <-> treaty/). For TMX files, the same file
+    name under the TMX roots.
+    """
+    base_dir = Path(base_dir)
+    relative = Path(value)
+    candidates = [relative if relative.is_absolute() else base_dir / relative]
+    parts = relative.parts
+    if parts and parts[0] in XML_ROOTS:
+        candidates += [base_dir / root / Path(*parts[1:]) for root in XML_ROOTS if root != parts[0]]
+    if relative.suffix.lower() == '.tmx':
+        candidates += [base_dir / root / relative.name for root in TMX_ROOTS]
+        if len(parts) > 1:
+            candidates += [base_dir / root / Path(*parts[1:]) for root in TMX_ROOTS]
+    unique = []
+    for path in candidates:
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+
+class DocumentCache:
+    """
+    LRU cache of parsed XML trees, bounded by the total size of their files.
+
+    Entries are keyed by resolved path and remember the file's mtime and
+    size; a changed file is parsed again. A document larger than the whole
+    budget is parsed but not cached.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()   # path -> (mtime_ns, size, tree)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path):
+        """Parsed tree of an XML file, from the cache when the file is unchanged."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        cached = self._entries.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return cached[2]
+        if cached is not None:
+            self._discard(path)
+
+        self.misses += 1
+        tree = ET.parse(path)
+        if stat.st_size <= self.max_bytes:
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, tree)
+            self.bytes += stat.st_size
+            while self.bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return tree
+
+    def _discard(self, path):
+        _, size, _ = self._entries.pop(path)
+        self.bytes -= size
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def info(self):
+        """Cache statistics (documents, bytes, hits, misses, evictions)."""
+        return {'documents': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class LegalRegistry:
+    """
+    Legal sources indexed by source_id, with resolved paths and lazily parsed documents.
+
+    Usage:
+        registry = LegalRegistry()
+        registry['nl-de-tax-treaty-2012']['short_title_nl']
+        registry.resolve('nl-de-tax-treaty-2012')          # Path or None
+        registry.document('nl-de-tax-treaty-2012')         # ElementTree (cached)
+        registry.verify()                                  # unresolvable paths
+    """
+
+    def __init__(self, registry_path=REGISTRY_PATH, base_dir=BASE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.registry_path = Path(registry_path)
+        self.base_dir = Path(base_dir)
+        self.cache = DocumentCache(max_bytes)
+        self.sources = {}
+        self._resolved = {}
+        if self.registry_path.exists():
+            with open(self.registry_path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    source_id = (row.get('source_id') or '').strip()
+                    if source_id:
+                        self.sources[source_id] = {key: (value or '').strip() for key, value in row.items()}
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __iter__(self):
+        return iter(self.sources)
+
+    def __contains__(self, source_id):
+        return source_id in self.sources
+
+    def __getitem__(self, source_id):
+        return self.sources[source_id]
+
+    def get(self, source_id, default=None):
+        return self.sources.get(source_id, default)
+
+    def resolve(self, source_id, column='xml_file_path'):
+        """
+        Existing file for a path column of a source.
+
+        Returns:
+            Path, or None when the column is empty or no candidate exists
+        """
+        key = (source_id, column)
+        if key not in self._resolved:
+            value = self.sources[source_id].get(column, '')
+            self._resolved[key] = next(
+                (path for path in candidate_paths(value, self.base_dir) if path.is_file()), None) if value else None
+        return self._resolved[key]
+
+    def relative(self, path):
+        """Path relative to the repository root (as written in the registry)."""
+        try:
+            return Path(path).resolve().relative_to(self.base_dir.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def verify(self):
+        """
+        Check every path column of every source.
+
+        Returns:
+            List of dicts (source_id, column, path, resolved, status) where
+            status is 'ok', 'moved' (found under another root) or 'missing'
+        """
+        results = []
+        for source_id, row in self.sources.items():
+            for column in PATH_COLUMNS:
+                value = row.get(column, '')
+                if not value:
+                    continue
+                resolved = self.resolve(source_id, column)
+                if resolved is None:
+                    status = 'missing'
+                elif self.relative(resolved) == Path(value).as_posix():
+                    status = 'ok'
+                else:
+                    status = 'moved'
+                results.append({'source_id': source_id, 'column': column, 'path': value,
+                                'resolved': self.relative(resolved) if resolved else '', 'status': status})
+        return results
+
+    def document(self, source_id):
+        """
+        Parsed XML text of a source (ElementTree), loaded on first use.
+
+        Raises:
+            KeyError: Unknown source_id
+            FileNotFoundError: The source's XML file cannot be found
+        """
+        path = self.resolve(source_id)
+        if path is None:
+            raise FileNotFoundError(
+                f"XML for {source_id} not found: {self.sources[source_id].get('xml_file_path') or '(no path)'}")
+        return self.cache.get(path)
+
+    def parse(self, path):
+        """Parsed tree of any XML file through the shared cache."""
+        return self.cache.get(path)
+
+    def source_for_path(self, path):
+        """source_id whose XML resolves to `path`, or None."""
+        path = Path(path).resolve()
+        for source_id in self.sources:
+            resolved = self.resolve(source_id)
+            if resolved is not None and resolved.resolve() == path:
+                return source_id
+        return None
+
+
+_registry = None
+
+
+def get_registry():
+    """The process-wide registry (created on first use), so callers share one document cache."""
+    global _registry
+    if _registry is None:
+        _registry = LegalRegistry()
+    return _registry
+
+
+def parse_document(path):
+    """Parse an XML file through the process-wide document cache."""
+    return get_registry().parse(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List and verify the legal source registry.")
+    parser.add_argument('source_id', nargs='?', help="Show one source and parse its XML")
+    parser.add_argument('--registry', type=Path, default=REGISTRY_PATH)
+    args = parser.parse_args()
+
+    registry = LegalRegistry(args.registry)
+
+    if args.source_id:
+        if args.source_id not in registry:
+            print(f"[X] Unknown source: {args.source_id}")
+            sys.exit(1)
+        for key, value in registry[args.source_id].items():
+            if value:
+                print(f"{key + ':':<22} {value}")
+        try:
+            root = registry.document(args.source_id).getroot()
+        except FileNotFoundError as error:
+            print(f"\n[X] {error}")
+            sys.exit(1)
+        print(f"\n[OK] {registry.relative(registry.resolve(args.source_id))}: <{root.tag}>, "
+              f"{sum(1 for _ in root.iter('artikel'))} articles")
+        return
+
+    print("="*80)
+    print("LEGAL SOURCE REGISTRY")
+    print("="*80)
+    print(f"\nRegistry: {registry.relative(registry.registry_path)} ({len(registry)} sources)\n")
+
+    results = registry.verify()
+    for source_id in registry:
+        print(f"{source_id}")
+        for result in (r for r in results if r['source_id'] == source_id):
+            if result['status'] == 'ok':
+                print(f"   [OK] {result['column']}: {result['path']}")
+            elif result['status'] == 'moved':
+                print(f"   [OK] {result['column']}: {result['path']} -> {result['resolved']}")
+            else:
+                print(f"   [X]  {result['column']}: {result['path']} (not found)")
+
+    missing = [r for r in results if r['status'] == 'missing']
+    moved = [r for r in results if r['status'] == 'moved']
+    print(f"\nPaths: {len(results)} | Moved: {len(moved)} | Missing: {len(missing)}")
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
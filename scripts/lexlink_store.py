@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+LexLink term store: every dictionary, example and legal source in one SQLite file.
+
+Compiles data/dictionaries, data/examples and the legal source registry into
+normalised tables with FTS5 full-text indexes, and refreshes incrementally:
+a file is only re-read when its size/mtime changed *and* its SHA-256 differs.
+
+Tables:
+    files         one row per input file (path, mtime, size, sha256) for incremental refresh
+    sources       legal sources from the registry (plus ids referenced by examples)
+    terms         one row per dictionary entry (source term, language, definition, metadata)
+    translations  target terms of each entry (one per target language)
+    examples      parallel example sentences
+    occurrences   which terms occur in which example sentences
+    constituents  Dutch words and compound parts -> terms containing them
+    terms_fts     FTS5 index over term, translations and definition
+    examples_fts  FTS5 index over both sentences
+
+Usage:
+    python scripts/lexlink_store.py build
+    python scripts/lexlink_store.py exact "vaste inrichting"
+    python scripts/lexlink_store.py prefix belasting
+    python scripts/lexlink_store.py search "dubbele belasting"
+    python scripts/lexlink_store.py examples dagvaarding
+    python scripts/lexlink_store.py compound verrekening
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from dictionary_loader import (BASE_DIR, DATA_DIR, dictionary_name, file_sha256, iter_dictionary_files,
+                               iter_example_files, load_dictionary, load_examples, normalise_key)
+from compound_index import CompoundIndex
+from example_index import ExampleIndex, tokenize
+from legal_registry import REGISTRY_PATH, LegalRegistry
+
+DEFAULT_DB_PATH = BASE_DIR / 'lexlink.sqlite'
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source_id TEXT PRIMARY KEY,
+    file_id INTEGER REFERENCES files(file_id) ON DELETE CASCADE,
+    source_type TEXT,
+    source_subtype TEXT,
+    available_languages TEXT,
+    effective_date TEXT,
+    xml_file_path TEXT,
+    official_url TEXT,
+    full_title TEXT
+);
+CREATE TABLE IF NOT EXISTS terms (
+    term_rowid INTEGER PRIMARY KEY,
+    term_id TEXT NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+    dictionary TEXT NOT NULL,
+    term TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    norm TEXT NOT NULL,
+    definition TEXT,
+    author TEXT,
+    license TEXT,
+    domain TEXT,
+    reviewed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_terms_norm ON terms(norm, lang);
+CREATE INDEX IF NOT EXISTS idx_terms_term_id ON terms(term_id);
+CREATE INDEX IF NOT EXISTS idx_terms_file ON terms(file_id);
+CREATE TABLE IF NOT EXISTS translations (
+    translation_rowid INTEGER PRIMARY KEY,
+    term_rowid INTEGER NOT NULL REFERENCES terms(term_rowid) ON DELETE CASCADE,
+    target TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    norm TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_translations_term ON translations(term_rowid);
+CREATE INDEX IF NOT EXISTS idx_translations_norm ON translations(norm, lang);
+CREATE TABLE IF NOT EXISTS examples (
+    example_rowid INTEGER PRIMARY KEY,
+    example_id TEXT NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+    sentence_source TEXT NOT NULL,
+    lang_source TEXT NOT NULL,
+    sentence_target TEXT NOT NULL,
+    lang_target TEXT NOT NULL,
+    legal_source_id TEXT,
+    book TEXT,
+    article_number TEXT,
+    translation_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_examples_example_id ON examples(example_id);
+CREATE INDEX IF NOT EXISTS idx_examples_file ON examples(file_id);
+CREATE TABLE IF NOT EXISTS occurrences (
+    term_rowid INTEGER NOT NULL REFERENCES terms(term_rowid) ON DELETE CASCADE,
+    example_rowid INTEGER NOT NULL REFERENCES examples(example_rowid) ON DELETE CASCADE,
+    PRIMARY KEY (term_rowid, example_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_occurrences_example ON occurrences(example_rowid);
+CREATE TABLE IF NOT EXISTS constituents (
+    part TEXT NOT NULL,
+    term_rowid INTEGER NOT NULL REFERENCES terms(term_rowid) ON DELETE CASCADE,
+    PRIMARY KEY (part, term_rowid)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+    term, translations, definition, tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS examples_fts USING fts5(
+    sentence_source, sentence_target, tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def fts_query(text):
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every word is quoted (so punctuation cannot break the query syntax); a
+    trailing * on a word is kept as a prefix query.
+    """
+    parts = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            parts.append(f'"{word}"' + ('*' if prefix else ''))
+    return ' '.join(parts)
+
+
+class TermStore:
+    """
+    Query API over the compiled SQLite store.
+
+    Usage:
+        with TermStore() as store:
+            store.refresh()
+            store.exact('vaste inrichting')
+            store.prefix('belasting', lang='nl-nl')
+            store.search('dubbele belasting')
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, data_dir=DATA_DIR, registry_path=REGISTRY_PATH):
+        self.db_path = Path(db_path)
+        self.data_dir = Path(data_dir)
+        self.registry_path = Path(registry_path) if registry_path else None
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self._ensure_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _ensure_schema(self):
+        row = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        if row is not None and int(row['value']) != SCHEMA_VERSION:
+            # Schema changed: drop everything and rebuild from scratch on refresh.
+            # FTS tables go first and take their shadow tables with them; the
+            # sqlite_* internal tables cannot be dropped.
+            tables = [r['name'] for r in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+                "ORDER BY sql LIKE 'CREATE VIRTUAL TABLE%' DESC")]
+            self.conn.execute('PRAGMA foreign_keys = OFF')
+            for table in tables:
+                self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self.conn.commit()
+            self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    # ------------------------------------------------------------------ refresh
+
+    def _input_files(self):
+        files = [(path, 'dictionary') for path in iter_dictionary_files(self.data_dir)]
+        files += [(path, 'examples') for path in iter_example_files(self.data_dir)]
+        if self.registry_path and self.registry_path.exists():
+            files.append((self.registry_path, 'registry'))
+        return files
+
+    def _relative(self, path):
+        try:
+            return str(Path(path).resolve().relative_to(BASE_DIR.resolve()))
+        except ValueError:
+            return str(Path(path).resolve())
+
+    def refresh(self, force=False):
+        """
+        Bring the store up to date with the files on disk.
+
+        Args:
+            force: Reload every file even if unchanged
+
+        Returns:
+            Dict with lists of 'loaded', 'unchanged' and 'removed' file paths
+        """
+        summary = {'loaded': [], 'unchanged': [], 'removed': []}
+        known = {row['path']: row for row in self.conn.execute('SELECT * FROM files')}
+        seen = set()
+
+        with self.conn:
+            for path, kind in self._input_files():
+                rel = self._relative(path)
+                seen.add(rel)
+                stat = path.stat()
+                row = known.get(rel)
+
+                if not force and row and row['mtime_ns'] == stat.st_mtime_ns and row['size'] == stat.st_size:
+                    summary['unchanged'].append(rel)
+                    continue
+
+                digest = file_sha256(path)
+                if not force and row and row['sha256'] == digest:
+                    self.conn.execute('UPDATE files SET mtime_ns = ?, size = ? WHERE file_id = ?',
+                                      (stat.st_mtime_ns, stat.st_size, row['file_id']))
+                    summary['unchanged'].append(rel)
+                    continue
+
+                if row:
+                    self._delete_file(row['file_id'])
+                cursor = self.conn.execute(
+                    'INSERT INTO files (path, kind, mtime_ns, size, sha256, rows, loaded_at) '
+                    'VALUES (?, ?, ?, ?, ?, 0, ?)',
+                    (rel, kind, stat.st_mtime_ns, stat.st_size, digest, datetime.now().isoformat(timespec='seconds')))
+                file_id = cursor.lastrowid
+                loader = {'dictionary': self._load_dictionary,
+                          'examples': self._load_examples,
+                          'registry': self._load_registry}[kind]
+                count = loader(path, file_id)
+                self.conn.execute('UPDATE files SET rows = ? WHERE file_id = ?', (count, file_id))
+                summary['loaded'].append(rel)
+
+            for rel, row in known.items():
+                if rel not in seen:
+                    self._delete_file(row['file_id'])
+                    summary['removed'].append(rel)
+
+            if summary['loaded'] or summary['removed'] or force:
+                self._rebuild_occurrences()
+                self._rebuild_constituents()
+
+        return summary
+
+    def _delete_file(self, file_id):
+        self.conn.execute('DELETE FROM terms_fts WHERE rowid IN (SELECT term_rowid FROM terms WHERE file_id = ?)',
+                          (file_id,))
+        self.conn.execute('DELETE FROM examples_fts WHERE rowid IN '
+                          '(SELECT example_rowid FROM examples WHERE file_id = ?)', (file_id,))
+        self.conn.execute('DELETE FROM files WHERE file_id = ?', (file_id,))
+
+    def _load_dictionary(self, path, file_id):
+        name = dictionary_name(path, self.data_dir)
+        count = 0
+        for entry in load_dictionary(path, self.data_dir):
+            cursor = self.conn.execute(
+                'INSERT INTO terms (term_id, file_id, dictionary, term, lang, norm, definition, '
+                'author, license, domain, reviewed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (entry['id'], file_id, name, entry['source'], entry['lang_source'],
+                 normalise_key(entry['source']), entry['definition'], entry['author'],
+                 entry['license'], entry['domain'], int(entry['reviewed'])))
+            term_rowid = cursor.lastrowid
+            self.conn.executemany(
+                'INSERT INTO translations (term_rowid, target, lang, norm) VALUES (?, ?, ?, ?)',
+                [(term_rowid, target, lang, normalise_key(target)) for target, lang in entry['targets']])
+            self.conn.execute(
+                'INSERT INTO terms_fts (rowid, term, translations, definition) VALUES (?, ?, ?, ?)',
+                (term_rowid, entry['source'], ' | '.join(t for t, _ in entry['targets']), entry['definition']))
+            count += 1
+        return count
+
+    def _load_examples(self, path, file_id):
+        count = 0
+        for example in load_examples(path):
+            cursor = self.conn.execute(
+                'INSERT INTO examples (example_id, file_id, sentence_source, lang_source, sentence_target, '
+                'lang_target, legal_source_id, book, article_number, translation_date) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (example['id'], file_id, example['sentence_source'], example['lang_source'],
+                 example['sentence_target'], example['lang_target'], example['legal_source_id'],
+                 example['book'], example['article_number'], example['translation_date']))
+            self.conn.execute(
+                'INSERT INTO examples_fts (rowid, sentence_source, sentence_target) VALUES (?, ?, ?)',
+                (cursor.lastrowid, example['sentence_source'], example['sentence_target']))
+            count += 1
+        return count
+
+    def _load_registry(self, path, file_id):
+        registry = LegalRegistry(path)
+        count = 0
+        for source_id, row in registry.sources.items():
+            # Store the path where the XML actually is (legislation/ vs treaty/)
+            resolved = registry.resolve(source_id)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO sources (source_id, file_id, source_type, source_subtype, '
+                'available_languages, effective_date, xml_file_path, official_url, full_title) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (source_id, file_id, row.get('source_type', ''), row.get('source_subtype', ''),
+                 row.get('available_languages', ''), row.get('effective_date', ''),
+                 registry.relative(resolved) if resolved else row.get('xml_file_path', ''),
+                 row.get('official_url', ''), row.get('full_title_en') or row.get('full_title_nl', '')))
+            count += 1
+        return count
+
+    def _rebuild_occurrences(self):
+        """Recompute the term/example occurrence table with the example inverted index."""
+        self.conn.execute('DELETE FROM occurrences')
+        example_rowids = []
+        index = ExampleIndex()
+        for row in self.conn.execute('SELECT example_rowid, sentence_source FROM examples '
+                                     "WHERE lang_source = 'nl-nl' ORDER BY example_rowid"):
+            example_rowids.append(row['example_rowid'])
+            index.add(row['sentence_source'])
+
+        terms = self.conn.execute("SELECT term_rowid, term FROM terms WHERE lang = 'nl-nl'").fetchall()
+        term_examples, _ = index.link_terms([row['term'] for row in terms])
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO occurrences (term_rowid, example_rowid) VALUES (?, ?)',
+            ((term['term_rowid'], example_rowids[doc_id])
+             for term, doc_ids in zip(terms, term_examples) for doc_id in doc_ids))
+
+    def _rebuild_constituents(self):
+        """Recompute the Dutch compound constituent table (see compound_index)."""
+        self.conn.execute('DELETE FROM constituents')
+        terms = self.conn.execute("SELECT term_rowid, term FROM terms WHERE lang = 'nl-nl'").fetchall()
+        index = CompoundIndex(row['term'] for row in terms)
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO constituents (part, term_rowid) VALUES (?, ?)',
+            ((part, terms[term_id]['term_rowid'])
+             for part, term_ids in index.postings.items() for term_id in term_ids))
+
+    # ------------------------------------------------------------------ queries
+
+    def _with_translations(self, rows):
+        results = []
+        for row in rows:
+            result = dict(row)
+            result['translations'] = [
+                (t['target'], t['lang']) for t in self.conn.execute(
+                    'SELECT target, lang FROM translations WHERE term_rowid = ? ORDER BY translation_rowid',
+                    (row['term_rowid'],))]
+            results.append(result)
+        return results
+
+    def exact(self, term, lang=None):
+        """Entries whose source term equals `term` (case-insensitive)."""
+        sql = 'SELECT * FROM terms WHERE norm = ?'
+        params = [normalise_key(term)]
+        if lang:
+            sql += ' AND lang = ?'
+            params.append(lang)
+        return self._with_translations(self.conn.execute(sql, params))
+
+    def exact_target(self, term, lang=None):
+        """Entries with a translation equal to `term` (reverse lookup)."""
+        sql = ('SELECT terms.* FROM translations JOIN terms USING (term_rowid) '
+               'WHERE translations.norm = ?')
+        params = [normalise_key(term)]
+        if lang:
+            sql += ' AND translations.lang = ?'
+            params.append(lang)
+        return self._with_translations(self.conn.execute(sql, params))
+
+    def prefix(self, prefix, lang=None, limit=20):
+        """Entries whose source term starts with `prefix`, in alphabetical order."""
+        key = normalise_key(prefix)
+        sql = 'SELECT * FROM terms WHERE norm >= ? AND norm < ?'
+        params = [key, key + '\U0010ffff']
+        if lang:
+            sql += ' AND lang = ?'
+            params.append(lang)
+        sql += ' ORDER BY norm LIMIT ?'
+        params.append(limit)
+        return self._with_translations(self.conn.execute(sql, params))
+
+    def search(self, query, limit=20):
+        """Full-text search over terms, translations and definitions (BM25 ranked)."""
+        match = fts_query(query)
+        if not match:
+            return []
+        rows = self.conn.execute(
+            'SELECT terms.* FROM terms_fts JOIN terms ON terms.term_rowid = terms_fts.rowid '
+            'WHERE terms_fts MATCH ? ORDER BY bm25(terms_fts) LIMIT ?', (match, limit))
+        return self._with_translations(rows)
+
+    def search_examples(self, query, limit=20):
+        """Full-text search over example sentences in both languages (BM25 ranked)."""
+        match = fts_query(query)
+        if not match:
+            return []
+        return [dict(row) for row in self.conn.execute(
+            'SELECT examples.* FROM examples_fts '
+            'JOIN examples ON examples.example_rowid = examples_fts.rowid '
+            'WHERE examples_fts MATCH ? ORDER BY bm25(examples_fts) LIMIT ?', (match, limit))]
+
+    def constituent(self, word, limit=20):
+        """Dutch entries containing `word` as a word or compound part ("verrekening")."""
+        return self._with_translations(self.conn.execute(
+            'SELECT terms.* FROM constituents JOIN terms USING (term_rowid) '
+            'WHERE constituents.part = ? ORDER BY length(terms.term), terms.norm LIMIT ?',
+            (' '.join(tokenize(word)), limit)))
+
+    def examples_for_term(self, term_id, limit=20):
+        """Example sentences in which a term (by term_id) occurs."""
+        return [dict(row) for row in self.conn.execute(
+            'SELECT examples.* FROM terms JOIN occurrences USING (term_rowid) '
+            'JOIN examples USING (example_rowid) WHERE terms.term_id = ? '
+            'ORDER BY length(examples.sentence_source) LIMIT ?', (term_id, limit))]
+
+    def stats(self):
+        """Row counts per table."""
+        return {table: self.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('files', 'sources', 'terms', 'translations', 'examples', 'occurrences',
+                              'constituents')}
+
+
+def print_terms(results):
+    for result in results:
+        targets = '; '.join(f"{target} ({lang})" for target, lang in result['translations'])
+        print(f"  {result['term']} ({result['lang']}) -> {targets or '-'}  [{result['dictionary']}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the LexLink SQLite term store.")
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH, help="SQLite database path")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="Create or incrementally refresh the store")
+    build.add_argument('--force', action='store_true', help="Reload every file")
+    for name in ('exact', 'reverse', 'prefix', 'search', 'examples', 'compound'):
+        query = sub.add_parser(name)
+        query.add_argument('text')
+        query.add_argument('--lang', help="Restrict to a language code (exact/reverse/prefix)")
+        query.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    with TermStore(args.db) as store:
+        if args.command == 'build':
+            print("="*80)
+            print("LEXLINK TERM STORE")
+            print("="*80)
+            started = time.perf_counter()
+            summary = store.refresh(force=args.force)
+            elapsed = time.perf_counter() - started
+            for path in summary['loaded']:
+                print(f"   [loaded]    {path}")
+            for path in summary['removed']:
+                print(f"   [removed]   {path}")
+            print(f"   {len(summary['unchanged'])} file(s) unchanged")
+            print()
+            for table, count in store.stats().items():
+                print(f"{table + ':':<15} {count}")
+            print(f"\n[OK] Store refreshed in {elapsed:.2f}s: {args.db}")
+            return
+
+        started = time.perf_counter()
+        if args.command == 'exact':
+            results = store.exact(args.text, args.lang)
+        elif args.command == 'reverse':
+            results = store.exact_target(args.text, args.lang)
+        elif args.command == 'prefix':
+            results = store.prefix(args.text, args.lang, args.limit)
+        elif args.command == 'search':
+            results = store.search(args.text, args.limit)
+        elif args.command == 'compound':
+            results = store.constituent(args.text, args.limit)
+        else:
+            results = store.search_examples(args.text, args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if args.command == 'examples':
+            for result in results:
+                print(f"  [{result['book']}] {result['sentence_source']}\n      {result['sentence_target']}")
+        else:
+            print_terms(results)
+        print(f"\n{len(results)} result(s) in {elapsed_ms:.2f} ms")
+        if not results:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
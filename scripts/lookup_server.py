@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Local HTTP lookup service for CAT tools and editor plugins.
+
+Serves the in-memory TermIndex over HTTP/1.1 with keep-alive, using only
+asyncio streams from the standard library. Every endpoint answers JSON:
+
+    GET  /lookup?q=vaste inrichting[&lang=nl-nl]     exact source term
+    GET  /prefix?q=belasting[&limit=20]              autocomplete
+    GET  /fuzzy?q=beeindigng[&limit=10]              "did you mean" suggestions
+    GET  /reverse?q=Betriebsstätte[&lang=de-de]      target term -> source terms
+    GET  /tm?q=De rechter kan ...[&limit=5]          translation memory fuzzy matches
+    POST /batch  {"mode": "lookup", "terms": [...], "lang": ..., "limit": ...}
+    GET  /stats                                      records, cache and reload counters
+
+Lookups run on the event loop: each one is a hash probe or a bisect on
+the index, or a filtered TM match (see translation_memory), so one core
+answers thousands per second. Results are kept in an LRU cache keyed by
+(mode, normalised query, lang, limit). A batch resolves up to BATCH_LIMIT
+terms through the same cache in one request.
+
+The dictionary and example files under data/ are polled every
+RELOAD_INTERVAL seconds (mtime and size, as lexlink_store does). When one changes, a new index is
+built in a worker thread while the old one keeps serving. Then the two are
+swapped and the cache is cleared. If the rebuild fails, for example on a
+half-written file, the old index is kept and the rebuild is retried on the
+next poll.
+
+The server binds to 127.0.0.1 by default and is meant to run locally.
+
+Usage:
+    python scripts/lookup_server.py                  # http://127.0.0.1:8765
+    python scripts/lookup_server.py --port 9000 --cache-size 50000
+    curl 'http://127.0.0.1:8765/lookup?q=vaste%20inrichting'
+    curl -d '{"terms": ["rechter", "vonnis"]}' http://127.0.0.1:8765/batch
+    curl 'http://127.0.0.1:8765/tm?q=Het%20vonnis%20wordt%20uitgesproken.'
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from dictionary_loader import DATA_DIR, iter_dictionary_files, iter_example_files, normalise_key
+from term_index import TermIndex
+from translation_memory import TranslationMemory
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 10000      # cached results (one per distinct query)
+RELOAD_INTERVAL = 2.0           # seconds between checks of data/
+BATCH_LIMIT = 1000              # terms per batch request
+MAX_BODY_BYTES = 1024 * 1024
+DEFAULT_LIMITS = {'lookup': None, 'prefix': 20, 'fuzzy': 10, 'reverse': None, 'tm': 5}
+MODES = tuple(DEFAULT_LIMITS)
+
+REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """A request the service cannot answer; carries the HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def data_signature(data_dir=DATA_DIR):
+    """(path, mtime_ns, size) of every dictionary and example file: changes whenever one is edited, added or removed."""
+    signature = []
+    for path in [*iter_dictionary_files(data_dir), *iter_example_files(data_dir)]:
+        stat = path.stat()
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def build_index(data_dir=DATA_DIR):
+    """
+    Load the TermIndex and the translation memory.
+
+    The prefix and fuzzy indexes are built up front, so no request pays for them.
+
+    Returns:
+        (TermIndex, TranslationMemory)
+    """
+    index = TermIndex.load(data_dir)
+    index.prefix('', limit=1)
+    index.fuzzy('')
+    return index, TranslationMemory.load(data_dir)
+
+
+class ResponseCache:
+    """
+    LRU cache of lookup results.
+
+    Usage:
+        cache = ResponseCache(10000)
+        result = cache.get(key)          # None on a miss
+        cache.put(key, result)
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self):
+        return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                'hits': self.hits, 'misses': self.misses}
+
+
+class LookupService:
+    """
+    Term lookups with result caching and hot reload, independent of HTTP.
+
+    Usage:
+        service = LookupService()
+        service.query('prefix', 'belasting', limit=5)
+        service.batch({'mode': 'lookup', 'terms': ['rechter', 'vonnis']})
+        await service.watch()            # reload when data/ changes
+    """
+
+    def __init__(self, data_dir=DATA_DIR, cache_size=DEFAULT_CACHE_SIZE):
+        self.data_dir = data_dir
+        self.cache = ResponseCache(cache_size)
+        self.signature = data_signature(data_dir)
+        self.index, self.memory = build_index(data_dir)
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.requests = 0
+
+    def _run(self, mode, query, lang, limit):
+        index = self.index
+        if mode == 'lookup':
+            return [record.to_dict() for record in index.lookup(query, lang)]
+        if mode == 'prefix':
+            # limit counts distinct terms in the index; a term can have several records
+            return [record.to_dict() for record in index.prefix(query, limit=limit, lang=lang)[:limit]]
+        if mode == 'fuzzy':
+            return index.fuzzy(query, limit=limit)
+        if mode == 'tm':
+            return [match for match in self.memory.match(query, limit)
+                    if not lang or match['lang_target'] == lang]
+        return [{'source': source, 'lang_source': records[0].lang_source,
+                 'records': [record.to_dict() for record in records]}
+                for source, records in index.reverse(query, lang)[:limit]]
+
+    def query(self, mode, query, lang=None, limit=None):
+        """
+        Results of one lookup, from the cache when the same query was seen.
+
+        Raises:
+            RequestError: Unknown mode or empty query
+        """
+        if mode not in MODES:
+            raise RequestError(400, f"unknown mode '{mode}' (expected one of {', '.join(MODES)})")
+        if not query or not query.strip():
+            raise RequestError(400, "missing query")
+        limit = limit or DEFAULT_LIMITS[mode]
+        # TM scores tell case and punctuation apart (100% vs 99%), so its key keeps them
+        text = ' '.join(query.split()) if mode == 'tm' else normalise_key(query)
+        key = (mode, text, lang or '', limit)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._run(mode, query, lang or None, limit)
+            self.cache.put(key, result)
+        return result
+
+    def batch(self, payload):
+        """
+        Resolve many terms in one call.
+
+        Args:
+            payload: {'terms': [...], 'mode': 'lookup', 'lang': None, 'limit': None}
+
+        Returns:
+            {'mode', 'lang', 'results': {term: results}, 'found': count}
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get('terms'), list):
+            raise RequestError(400, 'expected a JSON object with a "terms" list')
+        terms = payload['terms']
+        if len(terms) > BATCH_LIMIT:
+            raise RequestError(413, f"at most {BATCH_LIMIT} terms per batch, got {len(terms)}")
+        mode = payload.get('mode', 'lookup')
+        lang = payload.get('lang')
+        if not isinstance(mode, str):
+            raise RequestError(400, '"mode" must be a string')
+        if lang is not None and not isinstance(lang, str):
+            raise RequestError(400, '"lang" must be a string or null')
+        limit = _limit(payload.get('limit'))
+        results = {}
+        for term in terms:
+            if isinstance(term, str) and term.strip() and term not in results:
+                results[term] = self.query(mode, term, lang, limit)
+        return {'mode': mode, 'lang': lang, 'results': results,
+                'found': sum(1 for result in results.values() if result)}
+
+    def stats(self):
+        return {'records': len(self.index), 'tm_units': len(self.memory), 'files': len(self.signature),
+                'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.loaded_at)),
+                'reloads': self.reloads, 'requests': self.requests, 'cache': self.cache.info()}
+
+    async def reload_if_changed(self):
+        """Rebuild the index in a thread when data/ changed; returns True when it was swapped."""
+        started = time.perf_counter()
+        try:
+            # A file can disappear between listing and stat(), or while the index is built
+            signature = data_signature(self.data_dir)
+            if signature == self.signature:
+                return False
+            index, memory = await asyncio.get_running_loop().run_in_executor(None, build_index, self.data_dir)
+        except Exception as error:     # half-written or removed file: keep the old index, retry next poll
+            print(f"[X] Reload failed, keeping the previous index: {error}")
+            return False
+        self.index, self.memory, self.signature = index, memory, signature
+        self.cache.clear()
+        self.loaded_at = time.time()
+        self.reloads += 1
+        print(f"[OK] Reloaded {len(index)} records and {len(memory)} TM units in {time.perf_counter() - started:.2f}s")
+        return True
+
+    async def watch(self, interval=RELOAD_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            await self.reload_if_changed()
+
+
+def _limit(value):
+    if value in (None, ''):
+        return None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise RequestError(400, f"limit must be a number, got '{value}'") from None
+    if limit < 1:
+        raise RequestError(400, "limit must be at least 1")
+    return limit
+
+
+def _response(status, payload, keep_alive, extra_headers=()):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else b''
+    headers = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+               "Content-Type: application/json; charset=utf-8",
+               f"Content-Length: {len(body)}",
+               "Access-Control-Allow-Origin: *",
+               f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    headers.extend(extra_headers)
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body
+
+
+class LookupServer:
+    """
+    Minimal HTTP/1.1 front end for a LookupService (keep-alive, JSON only).
+
+    Usage:
+        server = LookupServer(LookupService())
+        asyncio.run(server.serve('127.0.0.1', 8765))
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    def route(self, method, target, body):
+        """
+        Answer one request.
+
+        Returns:
+            (status, payload)
+        """
+        url = urlsplit(target)
+        endpoint = url.path.rstrip('/') or '/'
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if method == 'OPTIONS':
+            return 204, None
+        if endpoint == '/batch':
+            if method != 'POST':
+                raise RequestError(405, "use POST for /batch")
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError as error:
+                raise RequestError(400, f"invalid JSON: {error}") from None
+            return 200, self.service.batch(payload)
+        if method != 'GET':
+            raise RequestError(405, f"use GET for {endpoint}")
+        if endpoint == '/stats':
+            return 200, self.service.stats()
+        if endpoint == '/':
+            return 200, {'endpoints': [f'/{mode}' for mode in MODES] + ['/batch', '/stats']}
+        mode = endpoint[1:]
+        if mode not in MODES:
+            raise RequestError(404, f"no endpoint {endpoint}")
+        query = params.get('q', '')
+        lang = params.get('lang') or None
+        results = self.service.query(mode, query, lang, _limit(params.get('limit')))
+        return 200, {'mode': mode, 'query': query, 'lang': lang, 'count': len(results), 'results': results}
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    writer.write(_response(413, {'error': f"body larger than {MAX_BODY_BYTES} bytes"}, False))
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                self.service.requests += 1
+                extra = ()
+                try:
+                    status, payload = self.route(method, target, body)
+                    if method == 'OPTIONS':
+                        extra = ('Access-Control-Allow-Methods: GET, POST, OPTIONS',
+                                 'Access-Control-Allow-Headers: Content-Type')
+                except RequestError as error:
+                    status, payload = error.status, {'error': str(error)}
+                except Exception as error:
+                    status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+                writer.write(_response(status, payload, keep_alive, extra))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass        # client went away or sent something that is not HTTP
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, reload_interval=RELOAD_INTERVAL):
+        server = await asyncio.start_server(self.handle, host, port)
+        watcher = asyncio.create_task(self.service.watch(reload_interval)) if reload_interval > 0 else None
+        print(f"[OK] Serving {len(self.service.index)} records on http://{host}:{port}/ (Ctrl+C to stop)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve dictionary lookups over HTTP for CAT tools.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help="Cached results (0 disables)")
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL,
+                        help="Seconds between checks of data/ (0 disables hot reload)")
+    args = parser.parse_args()
+
+    print("="*80)
+    print("LEXLINK LOOKUP SERVER")
+    print("="*80)
+
+    started = time.perf_counter()
+    service = LookupService(cache_size=args.cache_size)
+    print(f"\n[OK] Indexed {len(service.index)} records and {len(service.memory)} TM units from "
+          f"{len(service.signature)} files "
+          f"in {time.perf_counter() - started:.2f}s")
+    try:
+        asyncio.run(LookupServer(service).serve(args.host, args.port, args.reload_interval))
+    except KeyboardInterrupt:
+        print("\n[OK] Stopped")
+
+
+if __name__ == '__main__':
+    main()
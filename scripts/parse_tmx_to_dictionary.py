@@ -6,20 +6,15 @@ Converts professional translation memory files from the Dutch Code of Civil Proc
 into clean CSV dictionaries matching the human-readable architecture with ISO language codes.
 """
 
-import xml.etree.ElementTree as ET
 import csv
 import uuid
 from pathlib import Path
 from datetime import datetime
-import chardet
 
-def detect_encoding(file_path):
-    """Detect file encoding (TMX files may use UTF-16)."""
-    with open(file_path, 'rb') as f:
-        raw_data = f.read(10000)  # Read first 10KB
-        result = chardet.detect(raw_data)
-        return result['encoding']
+from document_cache import load_tmx
+from instrumentation import timed
 
+@timed
 def parse_tmx_glossary(tmx_file_path, output_csv_path):
     """
     Parse TMX glossary file and extract term pairs.
@@ -30,96 +25,48 @@ def parse_tmx_glossary(tmx_file_path, output_csv_path):
     """
     print(f"Parsing: {tmx_file_path}")
 
-    # Detect encoding
-    encoding = detect_encoding(tmx_file_path)
-    print(f"Detected encoding: {encoding}")
-
-    # Parse TMX XML
-    try:
-        tree = ET.parse(tmx_file_path)
-    except ET.ParseError as e:
-        print(f"Error parsing XML: {e}")
-        # Try with detected encoding explicitly
-        with open(tmx_file_path, 'r', encoding=encoding) as f:
-            content = f.read()
-        tree = ET.ElementTree(ET.fromstring(content))
-
-    root = tree.getroot()
+    # Parsed translation units (from the document cache when the file is unchanged)
+    document = load_tmx(tmx_file_path)
 
     # Extract header info
-    header = root.find('header')
-    creation_tool = header.get('creationtool', 'Unknown') if header is not None else 'Unknown'
-    creation_tool_version = header.get('creationtoolversion', '') if header is not None else ''
+    header = document['header']
+    creation_tool = header.get('creationtool', 'Unknown') if header else 'Unknown'
+    creation_tool_version = header.get('creationtoolversion', '')
 
     print(f"Tool: {creation_tool} {creation_tool_version}")
 
     # Extract translation units
     terms = []
-    body = root.find('body')
 
-    if body is None:
+    if not document['has_body']:
         print("Error: No <body> element found in TMX")
         return 0
 
-    translation_units = body.findall('tu')
+    translation_units = document['units']
     print(f"Found {len(translation_units)} translation units")
 
     for tu in translation_units:
-        tuid = tu.get('tuid', '')
-
-        # Get translation unit variants (tuv)
-        tuvs = tu.findall('tuv')
-
-        if len(tuvs) < 2:
-            continue  # Need at least source and target
+        tuid = tu['tuid']
+        variants = tu['variants']
 
         # Extract Dutch and English segments
-        nl_seg = None
-        en_seg = None
-        nl_creator = None
-        en_creator = None
-        nl_date = None
-        en_date = None
-
-        for tuv in tuvs:
-            lang = tuv.get('{http://www.w3.org/XML/1998/namespace}lang', '')
-            seg = tuv.find('seg')
-
-            if seg is None or seg.text is None:
-                continue
-
-            creation_date = tuv.get('creationdate', '')
-            creation_id = tuv.get('creationid', '')
-
-            if lang == 'nl':
-                nl_seg = seg.text.strip()
-                nl_creator = creation_id
-                nl_date = creation_date
-            elif lang == 'en-gb' or lang == 'en':
-                en_seg = seg.text.strip()
-                en_creator = creation_id
-                en_date = creation_date
+        nl = variants.get('nl')
+        en = variants.get('en-gb') or variants.get('en')
+        nl_seg = nl['text'].strip() if nl else None
+        en_seg = en['text'].strip() if en else None
 
         # Only add if we have both Dutch and English
         if nl_seg and en_seg:
             # Get metadata from props
-            project = None
-            filename = None
-
-            props = tu.findall('prop')
-            for prop in props:
-                prop_type = prop.get('type', '')
-                if prop_type == 'x-project':
-                    project = prop.text
-                elif prop_type == 'x-filename':
-                    filename = prop.text
+            project = tu['props'].get('x-project')
+            filename = tu['props'].get('x-filename')
 
             terms.append({
                 'tuid': tuid,
                 'term_nl': nl_seg,
                 'term_en': en_seg,
-                'translator': en_creator or nl_creator or 'Unknown',
-                'creation_date': en_date or nl_date,
+                'translator': en['creationid'] or nl['creationid'] or 'Unknown',
+                'creation_date': en['creationdate'] or nl['creationdate'],
                 'project': project,
                 'source_file': filename
             })
@@ -185,6 +132,7 @@ def parse_tmx_glossary(tmx_file_path, output_csv_path):
     print(f"[OK] Wrote {len(terms)} terms to: {output_csv_path}")
     return len(terms)
 
+@timed
 def parse_tmx_sentences(tmx_file_path, output_csv_path, book_name):
     """
     Parse TMX file with full sentence translations (Book 1-4).
@@ -194,58 +142,32 @@ def parse_tmx_sentences(tmx_file_path, output_csv_path, book_name):
     print(f"\nParsing sentences from: {tmx_file_path}")
     print(f"Book: {book_name}")
 
-    encoding = detect_encoding(tmx_file_path)
-    print(f"Detected encoding: {encoding}")
-
-    # Parse TMX
-    try:
-        tree = ET.parse(tmx_file_path)
-    except ET.ParseError:
-        with open(tmx_file_path, 'r', encoding=encoding) as f:
-            content = f.read()
-        tree = ET.ElementTree(ET.fromstring(content))
+    # Parsed translation units (from the document cache when the file is unchanged)
+    document = load_tmx(tmx_file_path)
 
-    root = tree.getroot()
-    body = root.find('body')
-
-    if body is None:
+    if not document['has_body']:
         print("Error: No <body> element found")
         return 0
 
-    translation_units = body.findall('tu')
+    translation_units = document['units']
     print(f"Found {len(translation_units)} translation units")
 
     # Extract sentence pairs
     sentences = []
 
     for tu in translation_units:
-        tuid = tu.get('tuid', '')
-        tuvs = tu.findall('tuv')
-
-        nl_text = None
-        en_text = None
-        nl_date = None
-        en_date = None
-
-        for tuv in tuvs:
-            lang = tuv.get('{http://www.w3.org/XML/1998/namespace}lang', '')
-            seg = tuv.find('seg')
-            creation_date = tuv.get('creationdate', '')
-
-            if seg is not None and seg.text:
-                if lang == 'nl':
-                    nl_text = seg.text.strip()
-                    nl_date = creation_date
-                elif lang == 'en-gb' or lang == 'en':
-                    en_text = seg.text.strip()
-                    en_date = creation_date
+        variants = tu['variants']
+        nl = variants.get('nl')
+        en = variants.get('en-gb') or variants.get('en')
+        nl_text = nl['text'].strip() if nl else None
+        en_text = en['text'].strip() if en else None
 
         if nl_text and en_text:
             sentences.append({
-                'tuid': tuid,
+                'tuid': tu['tuid'],
                 'sentence_nl': nl_text,
                 'sentence_en': en_text,
-                'translation_date': en_date or nl_date
+                'translation_date': en['creationdate'] or nl['creationdate']
             })
 
     print(f"Extracted {len(sentences)} sentence pairs")
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Run the processing scripts as one pipeline, doing only the work that is needed.
+
+Each step declares the files it reads and writes (glob patterns relative to
+the repository root):
+
+    parse_tmx        data/raw/tmx/*.tmx                 -> civil procedure dictionary + examples
+    extract_treaty   treaty/.../BWBV0004110_*.xml       -> nl-nl_fr-fr treaty dictionary
+    clean            (data embedded in the script)      -> legislation_terms_cleaned.csv/.tsv
+    css              (none)                             -> docs/css/style.css
+    validate         data/**/*.csv, *.tsv               -> validation-report.json
+    link             data/dictionaries/**               -> lexlink-concepts.csv, lexlink-pivot-pairs.csv
+    generate         dictionaries and examples          -> docs/ (site), build-report.json
+
+A step depends on every step whose outputs match its inputs, plus the
+steps listed in its `after` (link and generate wait for validation to
+pass). Independent steps run in parallel, each script in its own process,
+with output written to .cache/pipeline/<step>.log.
+
+A step is skipped when its signature is the one recorded at its last
+successful run and its outputs exist. The signature is a SHA-256 over the
+content of its input files, its script and the sibling modules the script
+imports, and its arguments. File hashes are cached by size and mtime, so an
+unchanged tree is checked without reading it. The state is saved after
+every step, so after a failure the next run resumes where it stopped:
+finished steps are skipped and the failed one runs again.
+
+Usage:
+    python scripts/pipeline.py                    # run what changed
+    python scripts/pipeline.py --dry-run          # show what would run and why
+    python scripts/pipeline.py generate           # only generate and the steps it depends on
+    python scripts/pipeline.py --force validate   # run validate even if unchanged
+    python scripts/pipeline.py --touch            # record the current tree as up to date
+
+parse_tmx and extract_treaty give new random ids on every run, so on an
+existing checkout run --touch once instead of rebuilding everything.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+
+from dictionary_loader import BASE_DIR, file_sha256
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+STATE_PATH = BASE_DIR / 'pipeline.state.json'
+LOG_DIR = BASE_DIR / '.cache' / 'pipeline'
+LOG_TAIL = 15
+
+STEPS = [
+    {
+        'name': 'parse_tmx',
+        'script': 'parse_tmx_to_dictionary.py',
+        'inputs': ['data/raw/tmx/*.tmx'],
+        'outputs': ['data/dictionaries/nl-nl_en-gb/dictionary_nl-nl_en-gb_civil-procedure.csv',
+                    'data/examples/examples_nl-nl_en-gb_civil-procedure_book-*.csv'],
+    },
+    {
+        'name': 'extract_treaty',
+        'script': 'extract_treaty_translations.py',
+        'args': ['treaty/netherlands/BWBV0004110_2005-07-24_0/BWBV0004110_2005-07-24_0.xml'],
+        'inputs': ['treaty/netherlands/BWBV0004110_2005-07-24_0/BWBV0004110_2005-07-24_0.xml'],
+        'outputs': ['data/dictionaries/nl-nl_fr-fr/dictionary_BWBV0004110_2005-07-24_0_nl-fr.csv'],
+    },
+    {
+        'name': 'clean',
+        'script': 'clean_and_generate_ids.py',
+        'inputs': [],
+        'outputs': ['legislation_terms_cleaned.csv', 'legislation_terms_cleaned.tsv'],
+    },
+    {
+        'name': 'css',
+        'script': 'create_css.py',
+        'inputs': [],
+        'outputs': ['docs/css/style.css'],
+    },
+    {
+        'name': 'validate',
+        'script': 'validate_extraction.py',
+        'inputs': ['data/dictionaries/**/*.csv', 'data/dictionaries/**/*.tsv', 'data/examples/*.csv'],
+        'outputs': ['validation-report.json'],
+    },
+    {
+        'name': 'link',
+        'script': 'pivot_join.py',
+        'inputs': ['data/dictionaries/**/*.csv', 'data/dictionaries/**/*.tsv'],
+        'outputs': ['lexlink-concepts.csv', 'lexlink-pivot-pairs.csv'],
+        'after': ['validate'],
+    },
+    {
+        'name': 'generate',
+        'script': 'generate_static_site.py',
+        'inputs': ['data/dictionaries/nl-nl_en-gb/dictionary_nl-nl_en-gb_civil-procedure.csv',
+                   'data/dictionaries/nl-nl_de-de/nl-nl-to-de-de.tsv',
+                   'data/examples/examples_*.csv'],
+        'outputs': ['docs/index.html', 'docs/api/*', 'build-report.json'],
+        'after': ['validate'],
+    },
+]
+
+
+def _overlaps(pattern_a, pattern_b):
+    """Whether two path patterns can name the same file (either one matches the other)."""
+    return fnmatch(pattern_a, pattern_b) or fnmatch(pattern_b, pattern_a)
+
+
+def dependencies(steps):
+    """
+    Upstream steps of every step.
+
+    Returns:
+        Dict of step name -> set of step names it waits for
+    """
+    upstream = {}
+    for step in steps:
+        needs = set(step.get('after', ()))
+        for other in steps:
+            if other is not step and any(_overlaps(output, pattern)
+                                         for output in other['outputs'] for pattern in step['inputs']):
+                needs.add(other['name'])
+        upstream[step['name']] = needs
+    return upstream
+
+
+def select(targets, upstream):
+    """The target steps and everything they depend on."""
+    selected, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(upstream[name])
+    return selected
+
+
+def script_modules(script, scripts_dir=SCRIPTS_DIR):
+    """A script and the sibling modules it imports, directly or indirectly."""
+    found, pending = set(), [Path(scripts_dir) / script]
+    while pending:
+        path = pending.pop()
+        if path in found or not path.exists():
+            continue
+        found.add(path)
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            pending += [Path(scripts_dir) / f"{name.split('.')[0]}.py" for name in names]
+    return sorted(found)
+
+
+def expand(patterns, base_dir=BASE_DIR):
+    """Existing files matching glob patterns, as sorted paths."""
+    files = set()
+    for pattern in patterns:
+        files.update(path for path in Path(base_dir).glob(pattern) if path.is_file())
+    return sorted(files)
+
+
+class FileHashes:
+    """SHA-256 of files, reused while a file's size and mtime are unchanged."""
+
+    def __init__(self, cached=None):
+        self.cached = dict(cached or {})     # relative path -> [size, mtime_ns, sha256]
+
+    def sha256(self, path, base_dir=BASE_DIR):
+        stat = path.stat()
+        key = Path(path).relative_to(base_dir).as_posix()
+        entry = self.cached.get(key)
+        if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            entry = self.cached[key] = [stat.st_size, stat.st_mtime_ns, file_sha256(path)]
+        return entry[2]
+
+
+def step_signature(step, hashes, base_dir=BASE_DIR):
+    """
+    Content signature of a step: its inputs, its code and its arguments.
+
+    Returns:
+        (hex digest, number of input files)
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([step['script'], step.get('args', [])]).encode('utf-8'))
+    inputs = expand(step['inputs'], base_dir)
+    for path in script_modules(step['script']) + inputs:
+        name = path.relative_to(base_dir).as_posix() if path.is_relative_to(base_dir) else path.name
+        digest.update(f'{name}\0{hashes.sha256(path, base_dir)}\n'.encode('utf-8'))
+    return digest.hexdigest(), len(inputs)
+
+
+def outputs_exist(step, base_dir=BASE_DIR):
+    return all(next(Path(base_dir).glob(pattern), None) is not None for pattern in step['outputs'])
+
+
+def load_state(path=STATE_PATH):
+    try:
+        state = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault('files', {})
+    state.setdefault('steps', {})
+    return state
+
+
+def save_state(state, path=STATE_PATH):
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def run_step(step, log_dir=LOG_DIR, base_dir=BASE_DIR):
+    """
+    Run a step's script in its own process, output to log_dir/<name>.log.
+
+    Returns:
+        (exit code, seconds)
+    """
+    log_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    with open(log_dir / f"{step['name']}.log", 'w', encoding='utf-8') as log:
+        completed = subprocess.run([sys.executable, str(SCRIPTS_DIR / step['script'])] + step.get('args', []),
+                                   cwd=base_dir, stdout=log, stderr=subprocess.STDOUT,
+                                   env=dict(os.environ, PYTHONIOENCODING='utf-8'))
+    return completed.returncode, time.perf_counter() - started
+
+
+def log_tail(name, lines=LOG_TAIL, log_dir=LOG_DIR):
+    try:
+        return (log_dir / f'{name}.log').read_text(encoding='utf-8', errors='replace').splitlines()[-lines:]
+    except OSError:
+        return []
+
+
+class Pipeline:
+    """
+    Schedules steps by dependency, skipping unchanged ones.
+
+    Usage:
+        pipeline = Pipeline(STEPS)
+        results = pipeline.run(targets=['generate'], jobs=4)
+        # {'parse_tmx': 'skipped', 'validate': 'ok', 'generate': 'failed', ...}
+    """
+
+    def __init__(self, steps=STEPS, state_path=STATE_PATH, base_dir=BASE_DIR, log_dir=LOG_DIR):
+        self.steps = {step['name']: step for step in steps}
+        self.upstream = dependencies(steps)
+        self.state_path = Path(state_path)
+        self.base_dir = Path(base_dir)
+        self.log_dir = Path(log_dir)
+        self.state = load_state(self.state_path)
+        self.hashes = FileHashes(self.state['files'])
+
+    def _save(self):
+        self.state['files'] = self.hashes.cached
+        save_state(self.state, self.state_path)
+
+    def reason(self, name, force=()):
+        """
+        Why a step has to run, or None when it is up to date.
+
+        Returns:
+            (reason or None, signature)
+        """
+        step = self.steps[name]
+        signature, _ = step_signature(step, self.hashes, self.base_dir)
+        recorded = self.state['steps'].get(name, {})
+        if name in force:
+            return 'forced', signature
+        if not recorded.get('signature'):
+            return 'never run', signature
+        if recorded['signature'] != signature:
+            return 'inputs or code changed', signature
+        if not outputs_exist(step, self.base_dir):
+            return 'outputs missing', signature
+        return None, signature
+
+    def order(self, names):
+        """Steps in a dependency-respecting order (for listing)."""
+        ordered, done = [], set()
+        while len(ordered) < len(names):
+            ready = sorted(name for name in names if name not in done and self.upstream[name] & names <= done)
+            if not ready:
+                raise ValueError(f"Dependency cycle between: {', '.join(sorted(names - done))}")
+            ordered += ready
+            done.update(ready)
+        return ordered
+
+    def touch(self, targets=None):
+        """Record the selected steps as up to date without running them."""
+        names = select(targets or self.steps, self.upstream)
+        for name in self.order(names):
+            _, signature = self.reason(name)
+            self.state['steps'][name] = {'signature': signature, 'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                                         'seconds': 0.0, 'touched': True}
+        self._save()
+        return names
+
+    def run(self, targets=None, jobs=None, force=(), dry_run=False, report=print):
+        """
+        Run the selected steps, in parallel where dependencies allow.
+
+        A step runs once all of its upstream steps are ok or skipped; when
+        one fails, the steps that depend on it are blocked, the rest go on.
+        A step's signature is computed when it becomes ready, so it sees
+        what its upstream steps wrote.
+
+        Returns:
+            Dict of step name -> 'ok', 'skipped', 'failed', 'blocked' (or
+            'would run' with dry_run)
+        """
+        names = select(targets or self.steps, self.upstream)
+        self.order(names)   # raises on cycles
+        results = {}
+        if dry_run:
+            for name in self.order(names):
+                why, _ = self.reason(name, force)
+                # Without running upstream steps, their changes are not visible yet
+                if why is None and any(results[up] == 'would run' for up in self.upstream[name] & names):
+                    why = 'upstream step runs'
+                results[name] = 'would run' if why else 'skipped'
+                report(f"  {'[RUN]' if why else '[--] '} {name:<16} {why or 'up to date'}")
+            return results
+
+        running, signatures = {}, {}
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            while True:
+                for name in self.order(names):
+                    if name in results or name in running.values():
+                        continue
+                    needs = self.upstream[name] & names
+                    if any(results.get(up) in ('failed', 'blocked') for up in needs):
+                        results[name] = 'blocked'
+                        report(f"  [X]  {name:<16} blocked by a failed step")
+                        continue
+                    if not all(results.get(up) in ('ok', 'skipped') for up in needs):
+                        continue
+                    why, signature = self.reason(name, force)
+                    if why is None:
+                        results[name] = 'skipped'
+                        report(f"  [--] {name:<16} up to date")
+                        continue
+                    report(f"  ...  {name:<16} running ({why})")
+                    running[executor.submit(run_step, self.steps[name], self.log_dir, self.base_dir)] = name
+                    signatures[name] = signature
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    code, seconds = future.result()
+                    if code == 0:
+                        results[name] = 'ok'
+                        self.state['steps'][name] = {'signature': signatures[name],
+                                                     'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                                                     'seconds': round(seconds, 3)}
+                        report(f"  [OK] {name:<16} {seconds:.2f}s")
+                    else:
+                        results[name] = 'failed'
+                        self.state['steps'].pop(name, None)
+                        report(f"  [X]  {name:<16} exit code {code} after {seconds:.2f}s "
+                               f"(log: {self.log_dir / (name + '.log')})")
+                        for line in log_tail(name, log_dir=self.log_dir):
+                            report(f"         | {line}")
+                    self._save()
+        self._save()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the LexLink processing pipeline, skipping unchanged steps.")
+    parser.add_argument('targets', nargs='*', help=f"Steps to bring up to date (default: all): "
+                                                   f"{', '.join(step['name'] for step in STEPS)}")
+    parser.add_argument('--force', nargs='*', metavar='STEP', help="Run these steps (all selected when empty)")
+    parser.add_argument('--dry-run', action='store_true', help="Show what would run and why")
+    parser.add_argument('--touch', action='store_true', help="Mark the selected steps up to date without running")
+    parser.add_argument('--jobs', type=int, default=None, help="Steps run at the same time (default: CPU count)")
+    args = parser.parse_args()
+
+    pipeline = Pipeline()
+    unknown = [name for name in args.targets + (args.force or []) if name not in pipeline.steps]
+    if unknown:
+        parser.error(f"unknown step: {', '.join(unknown)}")
+    force = pipeline.steps if args.force == [] else set(args.force or ())
+
+    print("="*80)
+    print("LEXLINK PIPELINE")
+    print("="*80)
+    for name in pipeline.order(select(args.targets or pipeline.steps, pipeline.upstream)):
+        needs = sorted(pipeline.upstream[name])
+        print(f"  {name:<16} {pipeline.steps[name]['script']:<34} {'after ' + ', '.join(needs) if needs else ''}")
+    print()
+
+    if args.touch:
+        names = pipeline.touch(args.targets)
+        print(f"[OK] Recorded {len(names)} step(s) as up to date in {STATE_PATH.name}")
+        return
+
+    started = time.perf_counter()
+    results = pipeline.run(args.targets, args.jobs, force, args.dry_run)
+    elapsed = time.perf_counter() - started
+
+    counts = {status: sum(1 for result in results.values() if result == status)
+              for status in ('ok', 'skipped', 'failed', 'blocked', 'would run')}
+    print(f"\n{', '.join(f'{status}: {count}' for status, count in counts.items() if count)} | {elapsed:.2f}s")
+    if counts['failed'] or counts['blocked']:
+        print("[X] Fix the failed step and run again; finished steps will be skipped")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Join every Dutch-pivot dictionary into one multilingual concept table.
+
+Each nl-nl_* dictionary translates Dutch terms into one or more languages.
+Hash-joining them on the normalised Dutch term gives one concept per Dutch
+term with every translation known for it:
+
+    beëindiging -> de-de: Kündigung     (nl-nl_de-de/dictionary_nl-nl_de-de)
+                   en-gb: termination   (nl-nl_en-gb/dictionary_nl-nl_en-gb_civil-procedure)
+                   fr-fr: Dénonciation  (nl-nl_fr-fr/dictionary_BWBV...)
+
+and, through the Dutch pivot, language pairs no dictionary covers directly
+(Kündigung <-> termination, DE <-> EN). Every derived pair keeps its provenance:
+the dictionary and entry id of both sides, and whether both came from the
+same entry ('direct') or were joined through Dutch ('pivot').
+
+The join is one pass over all rows: each row is added to the concept of its
+key in a dict, so the cost is linear in the number of rows (plus the pairs
+written), with no nested loops over dictionaries.
+
+Refresh is incremental on the input side only: the rows read from each
+dictionary are kept in a state file together with the file's size, mtime
+and SHA-256, and only files that changed are read again (same rule as
+lexlink_store.py). The concept table and both output files are then
+rebuilt in full from the cached rows; that join is one linear pass in
+memory, while re-reading and re-parsing the dictionaries is what the state
+file saves. The state file itself is only rewritten when a dictionary was
+loaded, removed or touched.
+
+Usage:
+    python scripts/pivot_join.py                      # refresh and write both tables
+    python scripts/pivot_join.py --force              # re-read every dictionary
+    python scripts/pivot_join.py --show rechtsmacht   # print one concept
+
+Output:
+    lexlink-concepts.csv      one row per Dutch concept, one column per language
+    lexlink-pivot-pairs.csv   one row per derived translation pair, with provenance
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+import uuid
+from collections import Counter
+from itertools import combinations, product
+from pathlib import Path
+
+from clean_and_generate_ids import TERM_ID_NAMESPACE
+from dictionary_loader import (BASE_DIR, DATA_DIR, dictionary_name, file_sha256, iter_dictionary_files,
+                               load_dictionary, normalise_key)
+
+PIVOT_LANG = 'nl-nl'
+DEFAULT_OUTPUT = BASE_DIR / 'lexlink-concepts.csv'
+DEFAULT_PAIRS_OUTPUT = BASE_DIR / 'lexlink-pivot-pairs.csv'
+DEFAULT_STATE_PATH = BASE_DIR / 'lexlink-concepts.state.json'
+STATE_VERSION = 1
+TERM_SEPARATOR = ' | '
+
+PAIR_FIELDS = ['concept_id', 'pivot', 'lang_a', 'term_a', 'lang_b', 'term_b', 'relation',
+               'dictionary_a', 'id_a', 'dictionary_b', 'id_b']
+
+
+def concept_id(key):
+    """Stable concept id for a normalised Dutch term."""
+    return str(uuid.uuid5(TERM_ID_NAMESPACE, f'concept\t{PIVOT_LANG}\t{key}'))
+
+
+def pivot_files(data_dir=DATA_DIR):
+    """Dictionaries with Dutch on one side (data/dictionaries/nl-nl_*)."""
+    return [path for path in iter_dictionary_files(data_dir)
+            if dictionary_name(path, data_dir).startswith(f'{PIVOT_LANG}_')]
+
+
+def read_pivot_rows(path, data_dir=DATA_DIR):
+    """
+    Read the Dutch-pivot translations of one dictionary.
+
+    Returns:
+        List of [key, dutch term, target language, target term, entry id];
+        entries written the other way round (target in Dutch) are flipped
+    """
+    rows = []
+    for entry in load_dictionary(path, data_dir):
+        if entry['lang_source'] == PIVOT_LANG:
+            for target, lang_target in entry['targets']:
+                if lang_target and lang_target != PIVOT_LANG:
+                    rows.append([normalise_key(entry['source']), entry['source'], lang_target, target, entry['id']])
+        else:
+            for target, lang_target in entry['targets']:
+                if lang_target == PIVOT_LANG and entry['lang_source']:
+                    rows.append([normalise_key(target), target, entry['lang_source'], entry['source'], entry['id']])
+    return rows
+
+
+class PivotJoin:
+    """
+    Materialised concept table over all Dutch-pivot dictionaries.
+
+    Usage:
+        join = PivotJoin()
+        summary = join.refresh()
+        concepts = join.concepts()
+        for pair in join.pivot_pairs(concepts, 'en-gb', 'de-de'):
+            ...
+    """
+
+    def __init__(self, state_path=DEFAULT_STATE_PATH, data_dir=DATA_DIR):
+        self.state_path = Path(state_path)
+        self.data_dir = Path(data_dir)
+        self.files = {}
+        if self.state_path.exists():
+            try:
+                state = json.loads(self.state_path.read_text(encoding='utf-8'))
+            except ValueError:
+                state = {}
+            if state.get('version') == STATE_VERSION:
+                self.files = state.get('files', {})
+
+    def save(self):
+        """Write the cached rows and file fingerprints to the state file."""
+        state = {'version': STATE_VERSION, 'files': self.files}
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        tmp_path.write_text(json.dumps(state, ensure_ascii=False), encoding='utf-8')
+        tmp_path.replace(self.state_path)
+
+    def refresh(self, force=False):
+        """
+        Re-read the dictionaries that changed since the last refresh.
+
+        Only the cached rows are updated; call concepts() to rebuild the
+        table from them.
+
+        Args:
+            force: Re-read every dictionary
+
+        Returns:
+            Dict with lists of 'loaded', 'unchanged' and 'removed' dictionary
+            names, and 'state_changed': whether save() has anything to write
+        """
+        summary = {'loaded': [], 'unchanged': [], 'removed': [], 'state_changed': False}
+        seen = set()
+        for path in pivot_files(self.data_dir):
+            name = dictionary_name(path, self.data_dir)
+            seen.add(name)
+            stat = path.stat()
+            cached = self.files.get(name)
+            if not force and cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                summary['unchanged'].append(name)
+                continue
+            digest = file_sha256(path)
+            if not force and cached and cached['sha256'] == digest:
+                cached.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                summary['unchanged'].append(name)
+                summary['state_changed'] = True
+                continue
+
+            self.files[name] = {'sha256': digest, 'mtime_ns': stat.st_mtime_ns,
+                                'size': stat.st_size, 'rows': read_pivot_rows(path, self.data_dir)}
+            summary['loaded'].append(name)
+
+        for name in sorted(set(self.files) - seen):
+            del self.files[name]
+            summary['removed'].append(name)
+        if summary['loaded'] or summary['removed']:
+            summary['state_changed'] = True
+        return summary
+
+    def concepts(self):
+        """
+        Hash-join the cached rows on the normalised Dutch term.
+
+        Returns:
+            Dict of key -> {'id', 'pivot', 'translations': {lang: {term: [(dictionary, entry id), ...]}}},
+            in key order; 'pivot' is the Dutch spelling seen first
+        """
+        concepts = {}
+        for name in sorted(self.files):
+            for key, dutch, lang, target, entry_id in self.files[name]['rows']:
+                concept = concepts.get(key)
+                if concept is None:
+                    concept = concepts[key] = {'id': concept_id(key), 'pivot': dutch, 'translations': {}}
+                terms = concept['translations'].setdefault(lang, {})
+                provenance = terms.setdefault(target, [])
+                if (name, entry_id) not in provenance:
+                    provenance.append((name, entry_id))
+        return dict(sorted(concepts.items()))
+
+    @staticmethod
+    def pivot_pairs(concepts, lang_a=None, lang_b=None):
+        """
+        Yield the translation pairs between non-Dutch languages of each concept.
+
+        Args:
+            concepts: Result of concepts()
+            lang_a, lang_b: Only this language pair (default: every pair)
+
+        Yields:
+            Dicts with the PAIR_FIELDS; relation is 'direct' when both terms
+            come from the same dictionary entry, 'pivot' when joined through Dutch
+        """
+        for concept in concepts.values():
+            translations = concept['translations']
+            for first, second in combinations(sorted(translations), 2):
+                if lang_a and {first, second} != {lang_a, lang_b}:
+                    continue
+                if lang_a and first != lang_a:
+                    first, second = second, first
+                for term_a, term_b in product(translations[first], translations[second]):
+                    sources_a = translations[first][term_a]
+                    sources_b = translations[second][term_b]
+                    shared = [source for source in sources_a if source in sources_b]
+                    (dictionary_a, id_a), (dictionary_b, id_b) = \
+                        (shared[0], shared[0]) if shared else (sources_a[0], sources_b[0])
+                    yield {
+                        'concept_id': concept['id'],
+                        'pivot': concept['pivot'],
+                        'lang_a': first,
+                        'term_a': term_a,
+                        'lang_b': second,
+                        'term_b': term_b,
+                        'relation': 'direct' if shared else 'pivot',
+                        'dictionary_a': dictionary_a,
+                        'id_a': id_a,
+                        'dictionary_b': dictionary_b,
+                        'id_b': id_b,
+                    }
+
+
+def languages_of(concepts):
+    """Target languages present in the concept table, sorted."""
+    return sorted({lang for concept in concepts.values() for lang in concept['translations']})
+
+
+def write_concepts(path, concepts):
+    """Write one row per concept with a column per language (multiple terms joined by ' | ')."""
+    languages = languages_of(concepts)
+    fieldnames = ['concept_id', PIVOT_LANG] + languages + ['languages', 'dictionaries']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for concept in concepts.values():
+            translations = concept['translations']
+            dictionaries = sorted({name for terms in translations.values()
+                                   for sources in terms.values() for name, _ in sources})
+            row = {'concept_id': concept['id'], PIVOT_LANG: concept['pivot'],
+                   'languages': len(translations) + 1, 'dictionaries': ';'.join(dictionaries)}
+            for lang, terms in translations.items():
+                row[lang] = TERM_SEPARATOR.join(terms)
+            writer.writerow(row)
+
+
+def write_pairs(path, pairs):
+    """Write the derived translation pairs; returns the number of rows written."""
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PAIR_FIELDS)
+        writer.writeheader()
+        for pair in pairs:
+            writer.writerow(pair)
+            count += 1
+    return count
+
+
+def print_concept(concept):
+    print(f"\n{concept['pivot']}  [{concept['id']}]")
+    for lang, terms in sorted(concept['translations'].items()):
+        for term, sources in terms.items():
+            print(f"   {lang}: {term}  ({', '.join(name for name, _ in sources)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join the Dutch-pivot dictionaries into a multilingual concept table.")
+    parser.add_argument('--force', action='store_true', help="Re-read every dictionary")
+    parser.add_argument('--pair', nargs=2, metavar=('LANG_A', 'LANG_B'),
+                        help="Only write pivot pairs for this language pair (e.g. en-gb de-de)")
+    parser.add_argument('--show', metavar='TERM', help="Print the concept of a Dutch term and exit")
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--pairs-output', type=Path, default=DEFAULT_PAIRS_OUTPUT)
+    parser.add_argument('--state', type=Path, default=DEFAULT_STATE_PATH)
+    args = parser.parse_args()
+
+    join = PivotJoin(args.state)
+    if args.show:
+        if join.refresh()['state_changed']:
+            join.save()
+        concept = join.concepts().get(normalise_key(args.show))
+        if concept is None:
+            print(f"[X] No concept for '{args.show}'")
+            sys.exit(1)
+        print_concept(concept)
+        return
+
+    print("="*80)
+    print("PIVOT JOIN (Dutch concept table)")
+    print("="*80)
+
+    started = time.perf_counter()
+    summary = join.refresh(force=args.force)
+    for name in summary['loaded']:
+        print(f"   [loaded]    {name}")
+    for name in summary['removed']:
+        print(f"   [removed]   {name}")
+    print(f"   {len(summary['loaded'])} dictionary(ies) read, {len(summary['unchanged'])} from the state file")
+
+    concepts = join.concepts()
+    write_concepts(args.output, concepts)
+    lang_a, lang_b = args.pair or (None, None)
+    pairs = write_pairs(args.pairs_output, join.pivot_pairs(concepts, lang_a, lang_b))
+    if summary['state_changed']:
+        join.save()
+    elapsed = time.perf_counter() - started
+
+    coverage = Counter(len(concept['translations']) + 1 for concept in concepts.values())
+    print(f"\nConcepts: {len(concepts)}")
+    for count in sorted(coverage):
+        print(f"   {count} languages: {coverage[count]}")
+    print("Translations per language:")
+    for lang in languages_of(concepts):
+        print(f"   {lang}: {sum(1 for concept in concepts.values() if lang in concept['translations'])}")
+    print(f"Pivot pairs: {pairs}")
+
+    print(f"\n[OK] {args.output} and {args.pairs_output} written in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,769 @@
+#!/usr/bin/env python3
+"""
+Process files dropped into import/ into the data/ library.
+
+Every file under import/ is handled in four steps:
+
+    1. detect its format from the content (TMX, TBX, CSV, TSV, XLSX, BWB XML),
+       falling back to the file extension
+    2. dispatch it to the handler registered for that format; handlers stream
+       the file and yield rows in the standard dictionary layout
+    3. clean the rows (strip, drop exact duplicates, stable ids) and write one
+       dictionary per language pair using the data/ naming conventions:
+           data/dictionaries/nl-nl_fr-fr/dictionary_nl-nl_fr-fr_tax-terms.csv
+           data/dictionaries/fr-fr/dictionary_fr-fr_civil-law.csv
+    4. move the outputs into place and the original to data/raw/{format}/,
+       each as one atomic rename or link, so data/ never holds a partial file
+
+Files are processed in parallel worker processes. A file that fails (unknown
+format, no handler yet, no language pair, or a dictionary of that name
+already exists) is reported and left in import/; existing dictionaries are
+never overwritten.
+
+The import subfolder decides the kind of dictionary:
+
+    dictionaries/               monolingual (term + definition)
+    translation-dictionaries/   bilingual
+    glossaries/, excel/         bilingual
+    treaties/                   BWB treaty XML (Dutch/French authentic texts)
+
+Usage:
+    python scripts/process_imports.py
+    python scripts/process_imports.py --dry-run
+    python scripts/process_imports.py --jobs 8 --author "Rijksoverheid" --license CC0
+    python scripts/process_imports.py --jobs 1 --profile imports.pstats    # hot spots of an import run
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+from pathlib import Path
+
+from clean_and_generate_ids import FIELDNAMES, iter_clean_rows
+from dictionary_loader import BASE_DIR, DATA_DIR, normalise_row
+from extract_treaty_translations import extract_treaty_translations
+from instrumentation import add_arguments, instrumented
+from tbx_reader import iter_concepts
+from xlsx_reader import iter_sheet_rows, sheet_names
+
+IMPORT_DIR = BASE_DIR / 'import'
+
+MONOLINGUAL_FIELDNAMES = ['id', 'source', 'lang-source', 'author', 'license',
+                          'sme-reviewed', 'premium', 'lang-source-dict']
+# Written after the standard columns when any row of a dictionary has a value
+OPTIONAL_FIELDNAMES = ['lang-source-dict', 'legal_domain', 'usage_notes']
+MONOLINGUAL_FOLDERS = ('dictionaries',)
+# Every language pair in data/ has Dutch as its source language
+PREFERRED_SOURCE = 'nl-nl'
+DEFAULT_AUTHOR = 'Unknown'
+DEFAULT_LICENSE = 'All rights reserved'
+SKIPPED_NAMES = ('README.md', '.gitkeep')
+
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+LANG_CODE_RE = re.compile(r'^[a-z]{2}-[a-z]{2}$')
+ROOT_TAG_RE = re.compile(rb'<([A-Za-z_][\w.:-]*)')
+
+# Bare language codes -> the regional codes used throughout data/
+DEFAULT_REGIONS = {'nl': 'nl-nl', 'de': 'de-de', 'en': 'en-gb', 'fr': 'fr-fr', 'es': 'es-es'}
+LANGUAGE_NAMES = {
+    'dutch': 'nl-nl', 'nederlands': 'nl-nl', 'néerlandais': 'nl-nl', 'niederländisch': 'nl-nl',
+    'german': 'de-de', 'duits': 'de-de', 'deutsch': 'de-de', 'allemand': 'de-de',
+    'english': 'en-gb', 'engels': 'en-gb', 'englisch': 'en-gb', 'anglais': 'en-gb',
+    'french': 'fr-fr', 'frans': 'fr-fr', 'französisch': 'fr-fr', 'français': 'fr-fr',
+    'spanish': 'es-es', 'spaans': 'es-es', 'spanisch': 'es-es', 'espagnol': 'es-es',
+}
+# Column names of imported tables -> standard dictionary columns
+HEADER_ALIASES = {
+    'source': 'source', 'term': 'source', 'source term': 'source', 'term source': 'source',
+    'bronterm': 'source', 'begrip': 'source',
+    'target': 'target', 'translation': 'target', 'target term': 'target', 'vertaling': 'target',
+    'definition': 'lang-source-dict', 'definitie': 'lang-source-dict', 'description': 'lang-source-dict',
+    'omschrijving': 'lang-source-dict', 'betekenis': 'lang-source-dict',
+    'author': 'author', 'translator': 'author', 'auteur': 'author', 'vertaler': 'author',
+    'license': 'license', 'licence': 'license', 'licentie': 'license',
+    'reviewed': 'sme-reviewed', 'domain': 'legal_domain', 'category': 'term_category',
+    'notes': 'usage_notes', 'note': 'usage_notes', 'opmerking': 'usage_notes', 'opmerkingen': 'usage_notes',
+    'lang source': 'lang-source', 'source language': 'lang-source', 'language source': 'lang-source',
+    'brontaal': 'lang-source',
+    'lang target': 'lang-target', 'target language': 'lang-target', 'language target': 'lang-target',
+    'doeltaal': 'lang-target',
+}
+# Title rows above the header (common in spreadsheets) are skipped up to this depth
+HEADER_SCAN_ROWS = 10
+
+# Format detection by extension, used when the content does not decide
+EXTENSION_FORMATS = {
+    '.tmx': 'tmx', '.tbx': 'tbx', '.csv': 'csv', '.tsv': 'tsv', '.tab': 'tsv',
+    '.xlsx': 'xlsx', '.xls': 'xls', '.xml': 'xml', '.pdf': 'pdf', '.docx': 'docx',
+    '.xlf': 'xliff', '.xliff': 'xliff',
+}
+BWB_ROOTS = ('toestand', 'wetgeving', 'verdragen', 'verdrag', 'regeling')
+
+# format -> handler(path, job); see register()
+HANDLERS = {}
+
+
+def register(fmt):
+    """
+    Register a handler for a format.
+
+    A handler takes (path, job) and either yields rows in the standard
+    dictionary layout (FIELDNAMES or MONOLINGUAL_FIELDNAMES keys), or returns
+    a list of staged (tmp_path, destination) files it wrote itself.
+    """
+    def decorator(func):
+        HANDLERS[fmt] = func
+        return func
+    return decorator
+
+
+def normalise_lang(code):
+    """Map 'nl', 'en-GB', 'en_gb' or 'English' to the regional codes used in data/."""
+    code = (code or '').strip().lower().replace('_', '-')
+    if LANG_CODE_RE.match(code):
+        return code
+    if code in DEFAULT_REGIONS:
+        return DEFAULT_REGIONS[code]
+    if code[:2] in DEFAULT_REGIONS and code[2:3] == '-':
+        return f'{code[:2]}-{code[3:5]}'
+    return LANGUAGE_NAMES.get(code, '')
+
+
+def filename_languages(path):
+    """
+    Language codes in a file name (glossary_nl-nl_fr-fr_tax-terms.xlsx -> ['nl-nl', 'fr-fr']).
+
+    A pair of bare languages ('NL-FR') counts as two languages.
+    """
+    languages = []
+    for token in Path(path).stem.lower().split('_'):
+        if not LANG_CODE_RE.match(token):
+            continue
+        first, second = token.split('-')
+        if first != second and first in DEFAULT_REGIONS and second in DEFAULT_REGIONS:
+            languages += [DEFAULT_REGIONS[first], DEFAULT_REGIONS[second]]
+        else:
+            languages.append(token)
+    return languages
+
+
+def filename_slug(path):
+    """Descriptive part of a file name, without language codes or 'glossary'/'dictionary'."""
+    return slugify(Path(path).stem) or 'import'
+
+
+def slugify(name):
+    """Lower-case ASCII slug of a name, without language codes or 'glossary'/'dictionary'."""
+    tokens = [token for token in name.lower().split('_')
+              if not LANG_CODE_RE.match(token) and token not in ('dictionary', 'glossary')]
+    return re.sub(r'[^a-z0-9]+', '-', '-'.join(tokens)).strip('-')
+
+
+def detect_format(path):
+    """
+    Detect the format of an import file from its first bytes.
+
+    Returns:
+        One of 'tmx', 'tbx', 'xliff', 'bwb', 'csv', 'tsv', 'xlsx', 'xls', 'docx',
+        'pdf', 'xml', or '' when unknown
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+
+    if head.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return ''
+        if 'xl/workbook.xml' in names:
+            return 'xlsx'
+        if 'word/document.xml' in names:
+            return 'docx'
+        return ''
+    if head.startswith(b'\xd0\xcf\x11\xe0'):
+        return 'xls'
+    if head.startswith(b'%PDF'):
+        return 'pdf'
+
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        head = head.decode('utf-16', errors='ignore').encode('utf-8')
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n')
+    if text.startswith(b'<'):
+        # Skip the XML declaration, comments and doctype to find the root element
+        body = re.sub(rb'<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^>]*>', b'', text, flags=re.S)
+        match = ROOT_TAG_RE.search(body)
+        root = match.group(1).split(b':')[-1].lower().decode('ascii') if match else ''
+        if root == 'tmx':
+            return 'tmx'
+        if root in ('martif', 'tbx'):
+            return 'tbx'
+        if root == 'xliff':
+            return 'xliff'
+        if root in BWB_ROOTS or b'bwb-id' in head or b'BWB' in head:
+            return 'bwb'
+        return 'xml'
+
+    extension = EXTENSION_FORMATS.get(path.suffix.lower(), '')
+    if extension in ('csv', 'tsv') or not extension:
+        first_line = text.split(b'\n', 1)[0]
+        if b'\t' in first_line:
+            return 'tsv'
+        if b',' in first_line or b';' in first_line or extension:
+            return 'csv'
+    return extension
+
+
+def canonical_header(name):
+    """
+    Standard column for an imported column name.
+
+    Language columns ('Dutch', 'nl', 'NL-NL', 'term_nl_nl') become term_xx_yy
+    columns, which dictionary_loader.normalise_row understands.
+    """
+    key = ' '.join((name or '').strip().lower().replace('_', ' ').replace('-', ' ').split())
+    if key in HEADER_ALIASES:
+        return HEADER_ALIASES[key]
+    if key.startswith('term '):
+        key = key[5:]
+    lang = normalise_lang(key.replace(' ', '-'))
+    if lang:
+        return f"term_{lang.replace('-', '_')}"
+    return (name or '').strip()
+
+
+def table_rows(rows, job):
+    """
+    Map rows of an imported table onto the standard layout.
+
+    The header is the first of the first HEADER_SCAN_ROWS rows with a
+    recognisable term column (title rows above it are skipped). A table
+    without one is read positionally: source and target (or definition, for
+    monolingual imports) in the first two columns.
+    """
+    rows = iter(rows)
+    leading = []
+    columns = None
+    for cells in rows:
+        candidate = [canonical_header(cell) for cell in cells]
+        if any(column in ('source', 'target') or column.startswith('term_') for column in candidate):
+            columns = candidate
+            break
+        leading.append(cells)
+        if len(leading) == HEADER_SCAN_ROWS:
+            break
+    if columns is None:
+        rows = chain(leading, rows)
+        columns = ['source', 'lang-source-dict' if job['monolingual'] else 'target']
+
+    languages = job['languages']
+    for cells in rows:
+        row = {column: (cell or '').strip() for column, cell in zip(columns, cells) if column}
+        if not any(row.values()):
+            continue
+        if languages and not row.get('lang-source'):
+            row['lang-source'] = languages[0]
+        if len(languages) > 1 and 'target' in row and not row.get('lang-target'):
+            row['lang-target'] = languages[1]
+        entry = normalise_row(row)
+        if entry is None:
+            continue
+        yield from entry_rows(entry, row, job)
+
+
+def entry_rows(entry, row, job):
+    """Standard dictionary rows for a normalised entry: one per target (one without target if it has none)."""
+    common = {
+        'source': entry['source'],
+        'lang-source': normalise_lang(entry['lang_source']),
+        'author': entry['author'] or job['author'],
+        'license': entry['license'] or job['license'],
+        'sme-reviewed': 'True' if entry['reviewed'] else 'False',
+        'premium': 'False',
+        'lang-source-dict': entry['definition'],
+        'legal_domain': entry['domain'],
+        'usage_notes': row.get('usage_notes', ''),
+    }
+    if job['monolingual'] or not entry['targets']:
+        yield common
+        return
+    for target, lang_target in entry['targets']:
+        yield dict(common, target=target, **{'lang-target': normalise_lang(lang_target), 'lang-target-dict': ''})
+
+
+@register('csv')
+@register('tsv')
+def handle_delimited(path, job):
+    """CSV and TSV tables, streamed row by row."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if job['format'] == 'tsv':
+            delimiter = '\t'
+        else:
+            try:
+                delimiter = csv.Sniffer().sniff(f.read(4096), delimiters=',;\t').delimiter
+            except csv.Error:
+                delimiter = ','
+            f.seek(0)
+        yield from table_rows(csv.reader(f, delimiter=delimiter), job)
+
+
+@register('tmx')
+def handle_tmx(path, job):
+    """
+    TMX translation memories, streamed one <tu> at a time.
+
+    The source language is the first language in the file name, else Dutch,
+    else the header srclang; every other language of a translation unit
+    becomes a target (one dictionary per language pair).
+    """
+    source_lang = ''
+    header_author = ''
+    body = None
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if element.tag == 'header':
+                source_lang = normalise_lang(element.get('srclang'))
+                header_author = element.get('creationid', '')
+            elif element.tag == 'body':
+                body = element
+            continue
+        if element.tag != 'tu':
+            continue
+
+        segments = {}
+        author = ''
+        for tuv in element.findall('tuv'):
+            lang = normalise_lang(tuv.get(XML_LANG) or tuv.get('lang'))
+            seg = tuv.find('seg')
+            text = ' '.join(''.join(seg.itertext()).split()) if seg is not None else ''
+            if lang and text and lang not in segments:
+                segments[lang] = text
+                author = author or tuv.get('creationid', '')
+        if body is not None:
+            body.clear()
+
+        source = source_language(segments, job, source_lang)
+        for lang, text in segments.items():
+            if lang != source:
+                yield {
+                    'source': segments[source],
+                    'lang-source': source,
+                    'target': text,
+                    'lang-target': lang,
+                    'author': author or header_author or job['author'],
+                    'license': job['license'],
+                    'sme-reviewed': 'False',
+                    'premium': 'False',
+                    'lang-target-dict': '',
+                }
+
+
+@register('xlsx')
+def handle_xlsx(path, job):
+    """Excel workbooks, one worksheet per job, streamed row by row (see xlsx_reader)."""
+    yield from table_rows(iter_sheet_rows(path, job['sheet']), job)
+
+
+@register('tbx')
+def handle_tbx(path, job):
+    """
+    TBX termbases, streamed one concept entry at a time (see tbx_reader).
+
+    Every term of the source language is paired with every term of each
+    other language; definitions, subject field and notes are kept.
+    """
+    for concept in iter_concepts(path):
+        sections = {}
+        for lang, section in concept['languages'].items():
+            lang = normalise_lang(lang)
+            if lang and section['terms'] and lang not in sections:
+                sections[lang] = section
+        source = source_language(sections, job)
+        if not source:
+            continue
+        source_section = sections[source]
+        common = {
+            'lang-source': source,
+            'author': concept['author'] or job['author'],
+            'license': job['license'],
+            'sme-reviewed': 'False',
+            'premium': 'False',
+            'lang-source-dict': source_section['definition'] or concept['definition'],
+            'legal_domain': concept['domain'],
+        }
+        notes = concept['notes'] + source_section['notes']
+        if job['monolingual']:
+            for term in source_section['terms']:
+                yield dict(common, source=term,
+                           usage_notes='; '.join(notes + source_section['term_notes'][term]))
+            continue
+        for lang, section in sections.items():
+            if lang == source:
+                continue
+            for source_term in source_section['terms']:
+                for target_term in section['terms']:
+                    pair_notes = (notes + source_section['term_notes'][source_term]
+                                  + section['notes'] + section['term_notes'][target_term])
+                    yield dict(common, source=source_term, target=target_term, usage_notes='; '.join(pair_notes), **{
+                        'lang-target': lang,
+                        'lang-target-dict': section['definition'],
+                    })
+
+
+@register('bwb')
+def handle_bwb(path, job):
+    """BWB treaty XML with Dutch and French authentic texts (extract_treaty_translations)."""
+    destination = DATA_DIR / 'dictionaries' / 'nl-nl_fr-fr' / f'dictionary_{Path(path).stem}_nl-fr.csv'
+    tmp_path = _tmp_path(destination)
+    if not extract_treaty_translations(path, tmp_path):
+        tmp_path.unlink(missing_ok=True)
+        raise ValueError("no Dutch/French treaty text found")
+    return [(tmp_path, destination)]
+
+
+def source_language(available, job, declared=''):
+    """
+    Source language among the languages of an entry: the first language in
+    the file name, else Dutch, else the language the file declares, else the
+    first one.
+    """
+    for lang in job['languages'][:1] + [PREFERRED_SOURCE, declared]:
+        if lang in available:
+            return lang
+    return next(iter(available), '')
+
+
+def _tmp_path(destination):
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    return destination.with_name(f'.{destination.name}.{os.getpid()}.tmp')
+
+
+def dictionary_destination(lang_source, lang_target, slug):
+    """data/ path for an imported dictionary, following the naming conventions."""
+    if lang_target:
+        folder = f'{lang_source}_{lang_target}'
+    else:
+        folder = lang_source
+    return DATA_DIR / 'dictionaries' / folder / f'dictionary_{folder}_{slug}.csv'
+
+
+def stage_dictionaries(rows, job, untranslated=None):
+    """
+    Group rows by language pair, clean them and write each group to a tmp file.
+
+    Rows are first spooled to one file per language pair as they stream in,
+    then each spool is cleaned (iter_clean_rows) into its tmp file, so only
+    the duplicate check grows with the input. Rows of a bilingual import
+    without a target are skipped and passed to `untranslated` (a list).
+
+    Returns:
+        List of (tmp_path, destination, row count, duplicates removed)
+    """
+    base_fieldnames = MONOLINGUAL_FIELDNAMES if job['monolingual'] else FIELDNAMES
+    spool_fieldnames = base_fieldnames + [field for field in OPTIONAL_FIELDNAMES if field not in base_fieldnames]
+    spools = {}     # (lang_source, lang_target) -> spool dict
+    staged = []
+    try:
+        for row in rows:
+            if not job['monolingual'] and not row.get('target'):
+                if untranslated is not None:
+                    untranslated.append(row['source'])
+                continue
+            if not row.get('lang-source'):
+                raise ValueError("source language unknown; put language codes in the file name "
+                                 "(e.g. glossary_nl-nl_fr-fr_tax-terms.csv)")
+            key = (row['lang-source'], '' if job['monolingual'] else row.get('lang-target', ''))
+            spool = spools.get(key)
+            if spool is None:
+                if not key[1] and not job['monolingual']:
+                    raise ValueError(f"target language unknown for {key[0]} rows")
+                destination = dictionary_destination(*key, job['slug'])
+                path = _tmp_path(destination).with_suffix('.spool')
+                f = open(path, 'w', newline='', encoding='utf-8')
+                writer = csv.DictWriter(f, fieldnames=spool_fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                spool = spools[key] = {'destination': destination, 'path': path, 'file': f,
+                                       'writer': writer, 'used': set()}
+            spool['writer'].writerow(row)
+            spool['used'].update(field for field in OPTIONAL_FIELDNAMES if row.get(field))
+
+        for key in sorted(spools):
+            spool = spools[key]
+            spool['file'].close()
+            fieldnames = base_fieldnames + [field for field in OPTIONAL_FIELDNAMES
+                                            if field in spool['used'] and field not in base_fieldnames]
+            destination = spool['destination']
+            tmp_path = _tmp_path(destination)
+            duplicates = []
+            count = 0
+            with open(spool['path'], 'r', newline='', encoding='utf-8') as source, \
+                    open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                staged.append((tmp_path, destination, None, None))
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                for row in iter_clean_rows(csv.DictReader(source), fieldnames, destination.name, duplicates):
+                    writer.writerow(row)
+                    count += 1
+            staged[-1] = (tmp_path, destination, count, len(duplicates))
+    except BaseException:
+        for tmp_path, *_ in staged:
+            tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        for spool in spools.values():
+            spool['file'].close()
+            spool['path'].unlink(missing_ok=True)
+    return staged
+
+
+def process_file(job):
+    """
+    Import one file, or one worksheet of a workbook (runs in a worker process).
+
+    Returns:
+        Result dict: path, sheet, format, outputs [(destination, rows, duplicates)],
+        archived path, error and rolled_back (filled in by run_imports)
+    """
+    path = Path(job['path'])
+    result = {'path': job['path'], 'sheet': job['sheet'], 'format': job['format'], 'outputs': [],
+              'untranslated': 0, 'archived': '', 'error': job.get('error', ''), 'rolled_back': []}
+    if result['error']:
+        return result
+    handler = HANDLERS.get(job['format'])
+    if handler is None:
+        result['error'] = (f"no import handler for {job['format']} files" if job['format']
+                           else "unrecognised file format")
+        return result
+
+    staged = []
+    untranslated = []
+    try:
+        produced = handler(path, job)
+        if isinstance(produced, list):
+            staged = [(tmp_path, destination, None, None) for tmp_path, destination in produced]
+        else:
+            staged = stage_dictionaries(produced, job, untranslated)
+        result['untranslated'] = len(untranslated)
+        if not staged:
+            raise ValueError("no rows found" + (f" ({len(untranslated)} rows without a translation)"
+                                                if untranslated else ""))
+    except Exception as e:
+        for tmp_path, *_ in staged:
+            Path(tmp_path).unlink(missing_ok=True)
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    # Never replace an existing dictionary: os.link fails when the destination
+    # exists, also when another job of this run has just created it
+    placed = []
+    try:
+        for tmp_path, destination, count, duplicates in staged:
+            try:
+                os.link(tmp_path, destination)
+            except FileExistsError:
+                for path in placed:
+                    path.unlink()
+                result['error'] = (f"{destination.relative_to(BASE_DIR)} already exists; give the file a "
+                                   f"distinct name (e.g. glossary_nl-nl_de-de_tax-terms.csv) or remove "
+                                   f"the existing dictionary first")
+                return result
+            placed.append(destination)
+    finally:
+        for tmp_path, *_ in staged:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    for tmp_path, destination, count, duplicates in staged:
+        result['outputs'].append((str(destination.relative_to(BASE_DIR)), count, duplicates))
+    return result
+
+
+def archive_import(path, fmt):
+    """Move an imported file to data/raw/{format}/ and return its new path."""
+    path = Path(path)
+    archive = DATA_DIR / 'raw' / fmt / path.name
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(path, archive)
+    return str(archive.relative_to(BASE_DIR))
+
+
+def find_imports(import_dir=IMPORT_DIR, author=DEFAULT_AUTHOR, license=DEFAULT_LICENSE):
+    """
+    Build the import jobs for every file under import/.
+
+    A workbook with several worksheets gets one job per sheet, so its sheets
+    are processed in parallel; each sheet becomes its own dictionary
+    (the sheet name is added to the file slug).
+    """
+    import_dir = Path(import_dir)
+    jobs = []
+    for path in sorted(import_dir.rglob('*')):
+        if not path.is_file() or path.name in SKIPPED_NAMES or path.name.startswith('.'):
+            continue
+        folder = path.relative_to(import_dir).parts[0] if len(path.relative_to(import_dir).parts) > 1 else ''
+        job = {
+            'path': str(path),
+            'sheet': None,
+            'folder': folder,
+            'format': detect_format(path),
+            'monolingual': folder in MONOLINGUAL_FOLDERS,
+            'languages': [normalise_lang(code) for code in filename_languages(path)],
+            'slug': filename_slug(path),
+            'author': author,
+            'license': license,
+            'error': '',
+        }
+        sheets = []
+        if job['format'] == 'xlsx':
+            try:
+                sheets = sheet_names(path)
+            except (KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+                # Reported by process_file like any other failed import
+                jobs.append(dict(job, error=f"unreadable workbook: {type(e).__name__}: {e}"))
+                continue
+        if len(sheets) <= 1:
+            jobs.append(dict(job, sheet=sheets[0] if sheets else None))
+            continue
+        for sheet in sheets:
+            jobs.append(dict(
+                job,
+                sheet=sheet,
+                languages=job['languages'] or [normalise_lang(code) for code in filename_languages(sheet)],
+                slug='-'.join(part for part in (job['slug'], slugify(sheet)) if part),
+            ))
+    return jobs
+
+
+def run_imports(jobs, workers=None, archive=True):
+    """
+    Process import jobs in parallel, yielding results as they finish.
+
+    A file is moved to data/raw once all of its jobs (one per worksheet for
+    workbooks) have succeeded; the last result of the file records where.
+    A file is imported whole or not at all: when one of its jobs fails, the
+    dictionaries its other jobs placed are removed again, so the file can be
+    fixed and imported again without clashing with its own outputs. Results
+    already yielded for those jobs are updated in place (error set, outputs
+    cleared); the failed result lists the removed files in 'rolled_back'.
+    """
+    pending = Counter(job['path'] for job in jobs)
+    failed = set()
+    finished = {}       # path -> successful results of a file still being imported
+    for result in _run_jobs(jobs, workers):
+        path = result['path']
+        pending[path] -= 1
+        if result['error']:
+            failed.add(path)
+            result['rolled_back'] = _roll_back(finished.pop(path, []),
+                                               f"rolled back because {_label(result)} failed")
+        elif path in failed:
+            result['rolled_back'] = _roll_back([result], "rolled back because another worksheet failed")
+        else:
+            finished.setdefault(path, []).append(result)
+            if not pending[path]:
+                del finished[path]
+                if archive:
+                    result['archived'] = archive_import(path, result['format'])
+        yield result
+
+
+def _roll_back(results, reason):
+    """Remove the dictionaries placed by finished jobs; returns their paths."""
+    removed = []
+    for result in results:
+        for destination, *_ in result['outputs']:
+            (BASE_DIR / destination).unlink(missing_ok=True)
+            removed.append(destination)
+        result.update(outputs=[], error=reason)
+    return removed
+
+
+def _run_jobs(jobs, workers):
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield process_file(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_file, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process files dropped into import/ into data/.")
+    parser.add_argument('--import-dir', type=Path, default=IMPORT_DIR)
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--author', default=DEFAULT_AUTHOR, help="Author for rows without one")
+    parser.add_argument('--license', default=DEFAULT_LICENSE, help="License for rows without one")
+    parser.add_argument('--keep', action='store_true', help="Leave the original files in import/")
+    parser.add_argument('--dry-run', action='store_true', help="Only show detected formats")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    print("="*80)
+    print("PROCESS IMPORTS")
+    print("="*80)
+
+    jobs = find_imports(args.import_dir, args.author, args.license)
+    if not jobs:
+        print(f"\nNo files to import in {args.import_dir}")
+        return
+
+    files = len({job['path'] for job in jobs})
+    print(f"\nFiles: {files}" + (f" ({len(jobs)} jobs)" if len(jobs) != files else ""))
+    if args.dry_run:
+        for job in jobs:
+            status = "[OK]" if job['format'] in HANDLERS and not job['error'] else "[X] "
+            languages = ', '.join(job['languages']) or 'languages from content'
+            print(f"  {status} {job['format'] or 'unknown':5} {_label(job)}  ({languages})")
+        return
+
+    started = time.perf_counter()
+    results = []
+    with instrumented(args, 'process_imports'):
+        for result in run_imports(jobs, args.jobs, archive=not args.keep):
+            results.append(result)
+            if result['error']:
+                print(f"  [X] {_label(result)}: {result['error']}")
+                for destination in result['rolled_back']:
+                    print(f"       removed {destination}")
+                continue
+            print(f"  [OK] {_label(result)} ({result['format']})")
+            for destination, count, duplicates in result['outputs']:
+                detail = f" - {count} rows, {duplicates} duplicates removed" if count is not None else ""
+                print(f"       -> {destination}{detail}")
+            if result['untranslated']:
+                print(f"       {result['untranslated']} rows without a translation skipped")
+    elapsed = time.perf_counter() - started
+
+    destinations = [output[0] for result in results for output in result['outputs']]
+    failed = [result for result in results if result['error']]
+
+    print("\n" + "="*80)
+    print("SUMMARY")
+    print("="*80)
+    print(f"Imported: {len(results) - len(failed)}/{len(results)} jobs in {elapsed:.2f}s")
+    print(f"Dictionaries written: {len(set(destinations))}")
+    untranslated = sum(result['untranslated'] for result in results)
+    if untranslated:
+        print(f"Rows without a translation skipped: {untranslated}")
+    if failed:
+        print(f"[X] {len({result['path'] for result in failed})} file(s) left in {args.import_dir}")
+        sys.exit(1)
+    print("\nNext: python scripts/validate_extraction.py")
+
+
+def _label(job):
+    return f"{job['path']} [{job['sheet']}]" if job['sheet'] else job['path']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Streaming reader for TBX termbases.
+
+TBX is concept-oriented: each entry holds one concept with a language
+section per language, and one or more terms per language:
+
+    <termEntry id="c42">                              (TBX 3: conceptEntry)
+        <descrip type="subjectField">belastingrecht</descrip>
+        <langSet xml:lang="nl">                       (TBX 3: langSec)
+            <descrip type="definition">...</descrip>
+            <tig><term>vaste inrichting</term></tig>  (also ntig, TBX 3: termSec)
+        </langSet>
+        <langSet xml:lang="de">
+            <tig><term>Betriebsstätte</term></tig>
+        </langSet>
+    </termEntry>
+
+The file is read with iterparse and each entry is cleared once it has been
+yielded, so memory use depends on the largest entry, not the file size.
+Namespaces are ignored, which covers TBX 2 (martif), TBX-Basic and TBX 3.
+"""
+
+import xml.etree.ElementTree as ET
+
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+CONCEPT_TAGS = ('termEntry', 'conceptEntry')
+LANGUAGE_TAGS = ('langSet', 'langSec')
+TERM_TAGS = ('tig', 'ntig', 'termSec')
+NOTE_TYPES = ('usageNote', 'note', 'context')
+DEPRECATED_STATUSES = ('deprecatedTerm-admn-sts', 'supersededTerm-admn-sts',
+                       'deprecatedTerm', 'supersededTerm', 'deprecated', 'obsolete')
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _text(element):
+    return ' '.join(''.join(element.itertext()).split())
+
+
+def _describe(element, target):
+    """Collect definition, subject field, notes and responsibility from a descriptive element."""
+    tag = _local(element.tag)
+    kind = element.get('type', '')
+    if tag in ('descripGrp', 'transacGrp', 'adminGrp', 'termGrp'):
+        for child in element:
+            _describe(child, target)
+    elif tag == 'descrip' and kind == 'definition':
+        target['definition'] = target['definition'] or _text(element)
+    elif tag == 'descrip' and kind == 'subjectField' and 'domain' in target:
+        target['domain'] = target['domain'] or _text(element)
+    elif tag == 'note' or (tag in ('descrip', 'termNote') and kind in NOTE_TYPES):
+        note = _text(element)
+        if note and note not in target['notes']:
+            target['notes'].append(note)
+    elif tag == 'transacNote' and kind == 'responsibility' and 'author' in target:
+        target['author'] = target['author'] or _text(element)
+
+
+def _terms(element, section):
+    """Add the term of a term group (tig/ntig/termSec) unless it is deprecated."""
+    term = ''
+    deprecated = False
+    term_info = {'definition': '', 'notes': []}
+    for child in element.iter():
+        tag = _local(child.tag)
+        if tag == 'term' and not term:
+            term = _text(child)
+        elif tag == 'termNote' and child.get('type') == 'administrativeStatus':
+            deprecated = _text(child) in DEPRECATED_STATUSES
+        elif tag in ('note', 'termNote', 'descrip'):
+            _describe(child, term_info)
+    if term and not deprecated and term not in section['terms']:
+        section['terms'].append(term)
+        section['term_notes'][term] = term_info['notes']
+        section['definition'] = section['definition'] or term_info['definition']
+
+
+def parse_concept(element):
+    """
+    Concept dict for one termEntry / conceptEntry element.
+
+    Returns:
+        {'id', 'domain', 'definition', 'notes', 'author',
+         'languages': {lang: {'terms', 'definition', 'notes', 'term_notes'}}}
+        with language codes as written in the file; term_notes maps a term
+        to the notes on that term only
+    """
+    concept = {'id': element.get('id', ''), 'domain': '', 'definition': '', 'notes': [],
+               'author': '', 'languages': {}}
+    for child in element:
+        if _local(child.tag) not in LANGUAGE_TAGS:
+            _describe(child, concept)
+            continue
+        lang = child.get(XML_LANG) or child.get('lang', '')
+        section = concept['languages'].setdefault(
+            lang, {'terms': [], 'definition': '', 'notes': [], 'term_notes': {}})
+        for part in child:
+            if _local(part.tag) in TERM_TAGS:
+                _terms(part, section)
+            else:
+                _describe(part, section)
+    return concept
+
+
+def iter_concepts(path):
+    """Yield the concepts of a TBX file one at a time (see parse_concept)."""
+    parent = None
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        tag = _local(element.tag)
+        if event == 'start':
+            if tag == 'body':
+                parent = element
+            continue
+        if tag in CONCEPT_TAGS:
+            yield parse_concept(element)
+            element.clear()
+            if parent is not None:
+                parent.clear()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory term index with constant-time exact lookup and prefix search.
+
+All dictionaries are loaded once into parallel arrays (one slot per
+translation pair) instead of one csv.DictReader dict per row. Repeated values
+such as language codes, authors, licences and dictionary names are interned
+in symbol tables. Lookups go through hash indexes on the normalised source
+keys and, per target language, on the target keys, all built in the same
+load pass, so a reverse lookup ("Betriebsstätte" -> "vaste inrichting")
+costs the same as a forward one. Prefix (autocomplete) queries use a sorted key array
+searched with bisect, which gives the same prefix ranges as a trie at a
+fraction of the memory of one dict per trie node.
+
+Usage:
+    python scripts/term_index.py "vaste inrichting"
+    python scripts/term_index.py belasting --prefix
+    python scripts/term_index.py Betriebsstätte --target
+    python scripts/term_index.py "permanent establishment" --reverse --lang en-gb
+    python scripts/term_index.py beeindigng --fuzzy
+    python scripts/term_index.py verrekening --compound
+    python scripts/term_index.py "vaste inrichting" --binary   # mmap lexlink.dict instead of parsing CSVs
+    python scripts/term_index.py --stats
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+import uuid
+from array import array
+from bisect import bisect_left
+
+from compound_index import CompoundIndex
+from dictionary_loader import DATA_DIR, load_dictionaries, normalise_key
+from fuzzy_index import MAX_DISTANCE, FuzzyIndex
+
+FIELDS = ('id', 'source', 'lang_source', 'target', 'lang_target', 'dictionary',
+          'definition', 'author', 'license', 'domain')
+TEXT_FIELDS = ('source', 'target', 'definition')
+SYMBOL_FIELDS = ('lang_source', 'lang_target', 'dictionary', 'author', 'license', 'domain')
+_NO_UUID = bytes(16)
+
+
+class TermRecord:
+    """Read-only view of one record in a TermIndex."""
+
+    __slots__ = FIELDS + ('reviewed', 'position')
+
+    def __init__(self, index, position):
+        self.id = index._get_id(position)
+        for field in TEXT_FIELDS:
+            setattr(self, field, index._get_text(field, position))
+        for field in SYMBOL_FIELDS:
+            setattr(self, field, index._symbols[field][index._codes[field][position]])
+        self.reviewed = bool(index._reviewed[position])
+        self.position = position
+
+    @classmethod
+    def from_values(cls, position, reviewed=False, **values):
+        """Build a record from plain field values (used by binary_dictionary)."""
+        record = cls.__new__(cls)
+        for field in FIELDS:
+            setattr(record, field, values.get(field, ''))
+        record.reviewed = bool(reviewed)
+        record.position = position
+        return record
+
+    def __repr__(self):
+        return f"TermRecord({self.source!r} -> {self.target!r}, {self.dictionary})"
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS + ('reviewed',)}
+
+
+def _index_add(index, key, position):
+    """Add a position to a hash index; single hits are stored as a bare int."""
+    existing = index.get(key)
+    if existing is None:
+        index[key] = position
+    elif isinstance(existing, int):
+        index[key] = (existing, position)
+    else:
+        index[key] = existing + (position,)
+
+
+def _index_get(index, key):
+    hit = index.get(key)
+    if hit is None:
+        return ()
+    return (hit,) if isinstance(hit, int) else hit
+
+
+class TermIndex:
+    """
+    Parallel-array term store with hash and prefix indexes.
+
+    Storage per record is a handful of machine words:
+      - source/target/definition text lives in one UTF-8 pool per field,
+        addressed through an array of end offsets;
+      - low-cardinality fields (languages, dictionary, author, licence,
+        domain) are interned in a symbol table and stored as 2-byte codes,
+        widened to 4 bytes for a field with more than 65,535 distinct values;
+      - UUIDs are packed into 16 bytes;
+      - the hash indexes are keyed by hash(normalised key), and candidates are
+        verified against the record on lookup, so no key strings are kept.
+
+    Usage:
+        index = TermIndex.load()
+        index.lookup('vaste inrichting')      # exact, case-insensitive
+        index.lookup_target('Betriebsstätte')
+        index.reverse('permanent establishment', lang='en-gb')   # Dutch terms, grouped
+        index.prefix('belasting', limit=10)
+        index.fuzzy('beeindigng')             # "did you mean" suggestions
+        index.compounds('verrekening')        # Dutch terms containing the word
+    """
+
+    def __init__(self):
+        self._ids = bytearray()
+        self._other_ids = {}                                    # position -> non-UUID id
+        self._chunks = {field: [] for field in TEXT_FIELDS}     # pending text
+        self._pool = dict.fromkeys(TEXT_FIELDS, b'')            # joined UTF-8 text
+        self._ends = {field: array('I') for field in TEXT_FIELDS}
+        self._lengths = dict.fromkeys(TEXT_FIELDS, 0)
+        self._symbols = {field: [] for field in SYMBOL_FIELDS}
+        self._symbol_codes = {field: {} for field in SYMBOL_FIELDS}
+        self._codes = {field: array('H') for field in SYMBOL_FIELDS}
+        self._reviewed = array('B')
+        self._source_index = {}
+        self._reverse_indexes = {}                              # lang_target -> target hash index
+        self._sorted_keys = None
+        self._fuzzy = None
+        self._compounds = None
+
+    @classmethod
+    def load(cls, data_dir=DATA_DIR):
+        """Build an index over every dictionary under data/."""
+        return cls.from_entries(load_dictionaries(data_dir))
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build an index from normalised entries (see dictionary_loader)."""
+        index = cls()
+        for entry in entries:
+            index.add(entry)
+        index.compact()
+        return index
+
+    def __len__(self):
+        return len(self._reviewed)
+
+    # ------------------------------------------------------------------ storage
+
+    def _put_id(self, position, value):
+        try:
+            self._ids += uuid.UUID(value).bytes
+        except ValueError:
+            self._ids += _NO_UUID
+            if value:
+                self._other_ids[position] = value
+
+    def _get_id(self, position):
+        if position in self._other_ids:
+            return self._other_ids[position]
+        raw = bytes(self._ids[position * 16:position * 16 + 16])
+        return '' if raw == _NO_UUID else str(uuid.UUID(bytes=raw))
+
+    def _put_text(self, field, value):
+        encoded = value.encode('utf-8')
+        self._chunks[field].append(encoded)
+        self._lengths[field] += len(encoded)
+        self._ends[field].append(self._lengths[field])
+
+    def compact(self):
+        """Join pending text into the per-field pools (done after a bulk load)."""
+        for field in TEXT_FIELDS:
+            if self._chunks[field]:
+                self._pool[field] += b''.join(self._chunks[field])
+                self._chunks[field] = []
+
+    def _get_text(self, field, position):
+        if self._chunks[field]:
+            self.compact()
+        ends = self._ends[field]
+        return self._pool[field][ends[position - 1] if position else 0:ends[position]].decode('utf-8')
+
+    def _put_symbol(self, field, value):
+        codes = self._symbol_codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._symbols[field])
+            self._symbols[field].append(value)
+            if code == 1 << 16:
+                self._codes[field] = array('I', self._codes[field])
+        self._codes[field].append(code)
+
+    def add(self, entry):
+        """
+        Add a normalised dictionary entry.
+
+        One record is stored per translation; monolingual entries get a single
+        record with an empty target.
+        """
+        source_hash = hash(normalise_key(entry['source']))
+        for target, lang_target in entry['targets'] or [('', '')]:
+            position = len(self._reviewed)
+            values = dict(entry, target=target, lang_target=lang_target)
+            self._put_id(position, values.get('id') or '')
+            for field in TEXT_FIELDS:
+                self._put_text(field, values.get(field) or '')
+            for field in SYMBOL_FIELDS:
+                self._put_symbol(field, values.get(field) or '')
+            self._reviewed.append(1 if entry.get('reviewed') else 0)
+
+            _index_add(self._source_index, source_hash, position)
+            if target:
+                reverse_index = self._reverse_indexes.get(lang_target)
+                if reverse_index is None:
+                    reverse_index = self._reverse_indexes[lang_target] = {}
+                _index_add(reverse_index, hash(normalise_key(target)), position)
+        self._sorted_keys = None
+        self._fuzzy = None
+
+    # ------------------------------------------------------------------ lookups
+
+    def record(self, position):
+        return TermRecord(self, position)
+
+    def _lookup(self, index, field, term):
+        key = normalise_key(term)
+        return [pos for pos in _index_get(index, hash(key))
+                if normalise_key(self._get_text(field, pos)) == key]
+
+    def lookup(self, term, lang=None):
+        """Records whose source term matches `term` exactly (case-insensitive)."""
+        records = [TermRecord(self, pos) for pos in self._lookup(self._source_index, 'source', term)]
+        if lang:
+            records = [r for r in records if r.lang_source == lang]
+        return records
+
+    def lookup_target(self, term, lang=None):
+        """
+        Records whose target term matches `term` exactly (case-insensitive).
+
+        With `lang` only that language's reverse index is probed; without it
+        every target language is (one hash probe each).
+        """
+        if lang:
+            indexes = [self._reverse_indexes.get(lang, {})]
+        else:
+            indexes = [self._reverse_indexes[code] for code in sorted(self._reverse_indexes)]
+        return [TermRecord(self, pos) for index in indexes for pos in self._lookup(index, 'target', term)]
+
+    def reverse(self, term, lang=None):
+        """
+        Source terms translated as `term` (e.g. German -> Dutch).
+
+        Several dictionaries, or several source terms, can translate to the
+        same target term; the records are grouped per source term.
+
+        Returns:
+            List of (source term, [records]) in first-seen order
+        """
+        groups = {}
+        for record in self.lookup_target(term, lang):
+            key = (record.lang_source, normalise_key(record.source))
+            groups.setdefault(key, (record.source, []))[1].append(record)
+        return list(groups.values())
+
+    def target_languages(self):
+        """Target languages with a reverse index, sorted."""
+        return sorted(self._reverse_indexes)
+
+    def __contains__(self, term):
+        return bool(self._lookup(self._source_index, 'source', term))
+
+    def _build_sorted_keys(self):
+        keys = {}
+        for position in range(len(self)):
+            keys.setdefault(normalise_key(self._get_text('source', position)), []).append(position)
+        self._sorted_keys = sorted(keys.items())
+
+    def prefix(self, prefix, limit=20, lang=None):
+        """
+        Records whose source term starts with `prefix` (autocomplete).
+
+        At most `limit` distinct source terms are returned, alphabetically;
+        with `lang`, only records in that source language are returned and
+        counted.
+        """
+        if self._sorted_keys is None:
+            self._build_sorted_keys()
+        key = normalise_key(prefix)
+        records, distinct = [], 0
+        for i in range(bisect_left(self._sorted_keys, (key,)), len(self._sorted_keys)):
+            candidate, positions = self._sorted_keys[i]
+            if not candidate.startswith(key) or distinct >= limit:
+                break
+            if lang:
+                positions = [position for position in positions
+                             if self._symbols['lang_source'][self._codes['lang_source'][position]] == lang]
+                if not positions:
+                    continue
+            distinct += 1
+            records.extend(TermRecord(self, pos) for pos in positions)
+        return records
+
+    def fuzzy(self, query, max_distance=MAX_DISTANCE, limit=10):
+        """
+        Typo-tolerant suggestions for a source term (see fuzzy_index).
+
+        The deletion index is built on first use; a term's frequency is the
+        number of records (translations across all dictionaries) it has.
+
+        Returns:
+            List of dicts (term, key, distance, frequency), best first
+        """
+        if self._fuzzy is None:
+            frequencies = {}
+            for position in range(len(self)):
+                source = self._get_text('source', position)
+                frequencies[source] = frequencies.get(source, 0) + 1
+            self._fuzzy = FuzzyIndex()
+            for source, frequency in frequencies.items():
+                self._fuzzy.add(source, frequency)
+        return self._fuzzy.lookup(query, max_distance, limit)
+
+    def compounds(self, word, limit=20):
+        """
+        Dutch records containing `word` as a word or compound constituent
+        ("verrekening" finds "belastingverrekening"; see compound_index).
+
+        The constituent index is built on first use.
+        """
+        if self._compounds is None:
+            sources = {}
+            for position in range(len(self)):
+                if self._symbols['lang_source'][self._codes['lang_source'][position]] == 'nl-nl':
+                    sources.setdefault(self._get_text('source', position), []).append(position)
+            self._compounds = (CompoundIndex(sources), sources)
+        index, sources = self._compounds
+        terms = sorted(index.lookup(word), key=lambda term: (len(term), normalise_key(term)))
+        return [TermRecord(self, pos) for term in terms[:limit] for pos in sources[term]]
+
+
+def measure_memory(data_dir=DATA_DIR):
+    """
+    Compare memory of dict rows (csv.DictReader style) and a TermIndex.
+
+    Returns:
+        Dict with record count and bytes used by each representation
+    """
+    import csv
+    from dictionary_loader import iter_dictionary_files
+
+    tracemalloc.start()
+    rows = []
+    for path in iter_dictionary_files(data_dir):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows.extend(csv.DictReader(f, delimiter='\t' if path.suffix == '.tsv' else ','))
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+
+    tracemalloc.start()
+    index = TermIndex.load(data_dir)
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {'records': len(index), 'dict_rows_bytes': dict_bytes, 'term_index_bytes': index_bytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up terms in all LexLink dictionaries.")
+    parser.add_argument('query', nargs='?', help="Term to look up")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--prefix', action='store_true', help="Autocomplete on the source term")
+    mode.add_argument('--target', action='store_true', help="Look up by target (translated) term")
+    mode.add_argument('--reverse', action='store_true',
+                      help="Look up by target term and group the results per source term")
+    mode.add_argument('--fuzzy', action='store_true', help="Typo-tolerant \"did you mean\" suggestions")
+    mode.add_argument('--compound', action='store_true', help="Dutch terms containing the word as a constituent")
+    parser.add_argument('--lang', help="Restrict to a language code")
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--stats', action='store_true', help="Show memory use compared to dict rows")
+    parser.add_argument('--binary', nargs='?', const='', metavar='PATH',
+                        help="Look up in a compiled binary dictionary (see binary_dictionary.py)")
+    args = parser.parse_args()
+
+    if args.stats:
+        stats = measure_memory()
+        print(f"Records:               {stats['records']}")
+        print(f"Dict rows:             {stats['dict_rows_bytes']:>10,} bytes "
+              f"({stats['dict_rows_bytes'] / stats['records']:.0f} per term)")
+        print(f"TermIndex:             {stats['term_index_bytes']:>10,} bytes "
+              f"({stats['term_index_bytes'] / stats['records']:.0f} per term)")
+        print(f"Reduction:             {stats['dict_rows_bytes'] / stats['term_index_bytes']:.1f}x")
+        return
+    if not args.query:
+        parser.error("a query is required unless --stats is given")
+
+    started = time.perf_counter()
+    if args.binary is not None:
+        from binary_dictionary import DEFAULT_BINARY_PATH, BinaryDictionary
+        if args.fuzzy or args.compound:
+            parser.error("--fuzzy and --compound need the in-memory index; drop --binary")
+        try:
+            index = BinaryDictionary(args.binary or DEFAULT_BINARY_PATH)
+        except (FileNotFoundError, ValueError) as error:
+            print(f"[X] {error}")
+            sys.exit(1)
+        if index.stale_inputs:
+            print(f"[WARNING] {index.path} is stale: {len(index.stale_inputs)} dictionary file(s) "
+                  f"changed since build; run python scripts/binary_dictionary.py build")
+    else:
+        index = TermIndex.load()
+    if args.fuzzy:
+        index.fuzzy('')
+    loaded = time.perf_counter()
+    if args.fuzzy:
+        suggestions = index.fuzzy(args.query, limit=args.limit)
+        finished = time.perf_counter()
+        for suggestion in suggestions:
+            print(f"  {suggestion['term']}  (distance {suggestion['distance']}, "
+                  f"frequency {suggestion['frequency']})")
+        print(f"\n{len(suggestions)} suggestion(s); indexed {len(index)} records in "
+              f"{(loaded - started) * 1000:.0f} ms, lookup {(finished - loaded) * 1000:.3f} ms")
+        if not suggestions:
+            sys.exit(1)
+        return
+    if args.reverse:
+        if not isinstance(index, TermIndex):
+            parser.error("--reverse needs the in-memory index; use --target with --binary")
+        groups = index.reverse(args.query, args.lang)
+        finished = time.perf_counter()
+        for source, records in groups[:args.limit]:
+            print(f"  {args.query} <- {source} ({records[0].lang_source})")
+            for record in records:
+                print(f"       {record.target} ({record.lang_target})  [{record.dictionary}]")
+        print(f"\n{len(groups)} source term(s); loaded {len(index)} records in {(loaded - started) * 1000:.0f} ms, "
+              f"lookup {(finished - loaded) * 1000:.3f} ms")
+        if not groups:
+            sys.exit(1)
+        return
+    if args.compound:
+        index.compounds('')
+        loaded = time.perf_counter()
+        records = index.compounds(args.query, args.limit)
+    elif args.prefix:
+        records = index.prefix(args.query, args.limit)
+    elif args.target:
+        records = index.lookup_target(args.query, args.lang)
+    else:
+        records = index.lookup(args.query, args.lang)
+    finished = time.perf_counter()
+
+    for record in records[:args.limit]:
+        target = f"{record.target} ({record.lang_target})" if record.target else (record.definition[:80] or '-')
+        print(f"  {record.source} ({record.lang_source}) -> {target}  [{record.dictionary}]")
+    print(f"\n{len(records)} result(s); loaded {len(index)} records in {(loaded - started) * 1000:.0f} ms, "
+          f"lookup {(finished - loaded) * 1000:.3f} ms")
+    if not records:
+        suggestions = index.fuzzy(args.query, limit=5) if isinstance(index, TermIndex) else []
+        if suggestions:
+            print("Did you mean: " + ', '.join(s['term'] for s in suggestions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Translation memory fuzzy matching over the example sentence pairs.
+
+The sentence pairs under data/examples are a translation memory (TM): given
+a new Dutch sentence, the engine returns the most similar stored sentences
+with their translations and a fuzzy-match percentage, as CAT tools do:
+
+    score = 100 * (1 - word edit distance / length of the longer sentence)
+
+100% is kept for sentences that are identical apart from whitespace; a
+match that differs only in case, punctuation or diacritics scores 99%.
+
+Candidates come from an inverted index of word tokens (example_index.tokenize).
+For a minimum score t the edit distance is bounded by
+k = (1 - t) * max(length), which gives three filters before any distance
+is computed:
+
+    length      a stored sentence of n words needs |n - m| <= k
+    prefix      a match misses at most k of the query's words, so it shares
+                one of the query's k_max + 1 rarest words and only those
+                posting lists are read
+    overlap     every distinct word missing from the other sentence costs
+                at least one edit; just before the distance is computed,
+                the same holds for every word occurrence without a
+                counterpart (distance >= max(m, n) - shared words)
+
+The survivors are verified in order of the best score they could reach,
+with a bounded edit distance (fuzzy_index.edit_distance on token tuples);
+once `top` matches are found the bound tightens to the worst of them and
+the remaining candidates are skipped.
+
+Usage:
+    python scripts/translation_memory.py "De rechter kan de zaak naar een andere rechtbank verwijzen."
+    python scripts/translation_memory.py "..." --top 3 --min-score 60
+    python scripts/translation_memory.py --benchmark 500
+    echo "Het vonnis wordt uitgesproken." | python scripts/translation_memory.py -
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+
+from dictionary_loader import DATA_DIR, iter_example_files, load_examples
+from example_index import tokenize
+from fuzzy_index import edit_distance
+
+DEFAULT_TOP = 5
+DEFAULT_MIN_SCORE = 70      # the usual lower bound for a useful fuzzy match in CAT tools
+
+
+def fuzzy_score(distance, query_length, stored_length):
+    """Word-based fuzzy-match percentage for an edit distance."""
+    longest = max(query_length, stored_length)
+    if not longest:
+        return 100
+    return 100 * (longest - distance) // longest
+
+
+def _bound(min_score, length):
+    """Largest edit distance that still scores min_score for sentences of `length` words."""
+    return (100 - min_score) * length // 100
+
+
+class TranslationMemory:
+    """
+    Inverted word index over source sentences with fuzzy-match lookup.
+
+    Usage:
+        tm = TranslationMemory.load()
+        tm.match('De rechter kan de zaak verwijzen.', top=5)
+        # [{'score': 86, 'source': ..., 'target': ..., 'id': ..., ...}]
+    """
+
+    def __init__(self, examples=()):
+        self.units = []         # unit id -> example dict (see dictionary_loader.normalise_example)
+        self.tokens = []        # unit id -> token tuple
+        self.token_sets = []    # unit id -> frozenset of tokens
+        self.counts = []        # unit id -> Counter of tokens
+        self.postings = {}      # token -> list of unit ids
+        self._seen = set()
+        for example in examples:
+            self.add(example)
+
+    @classmethod
+    def load(cls, data_dir=DATA_DIR, lang_source='nl-nl', lang_target=None):
+        """Build a TM from every example file, optionally for one target language."""
+        examples = (example for path in iter_example_files(data_dir) for example in load_examples(path)
+                    if example['lang_source'] == lang_source
+                    and (lang_target is None or example['lang_target'] == lang_target))
+        return cls(examples)
+
+    def __len__(self):
+        return len(self.units)
+
+    def add(self, example):
+        """Add a sentence pair; repeats of the same source and translation are skipped."""
+        key = (' '.join(example['sentence_source'].split()), ' '.join(example['sentence_target'].split()))
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+        unit_id = len(self.units)
+        tokens = tuple(tokenize(example['sentence_source']))
+        self.units.append(example)
+        self.tokens.append(tokens)
+        self.token_sets.append(frozenset(tokens))
+        self.counts.append(Counter(tokens))
+        for token in self.token_sets[unit_id]:
+            self.postings.setdefault(token, []).append(unit_id)
+        return unit_id
+
+    def candidates(self, tokens, min_score=DEFAULT_MIN_SCORE):
+        """
+        Unit ids that can reach min_score, by length, prefix and overlap filtering.
+
+        Returns:
+            List of (best possible score, unit id), best first
+        """
+        length = len(tokens)
+        distinct = set(tokens)
+        # The longest stored sentence that can still match allows the largest distance
+        k_max = _bound(min_score, length * 100 // min_score) if min_score > 0 else length
+        # A match misses at most k of the query's words, so it contains one of any k_max + 1 of them
+        by_rarity = sorted(distinct, key=lambda token: len(self.postings.get(token, ())))
+        seen = set()
+        result = []
+        for token in by_rarity[:k_max + 1]:
+            for unit_id in self.postings.get(token, ()):
+                if unit_id in seen:
+                    continue
+                seen.add(unit_id)
+                stored = self.token_sets[unit_id]
+                shared = len(distinct & stored)
+                # Every word missing from the other sentence costs at least one edit
+                stored_length = len(self.tokens[unit_id])
+                lower = max(abs(stored_length - length), len(distinct) - shared, len(stored) - shared)
+                best = fuzzy_score(lower, length, stored_length)
+                if best >= min_score:
+                    result.append((best, unit_id))
+        result.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+        return result
+
+    def match(self, sentence, top=DEFAULT_TOP, min_score=DEFAULT_MIN_SCORE):
+        """
+        The stored sentences most similar to `sentence`.
+
+        Candidates are verified best bound first; once `top` matches are
+        found, the distance bound tightens to the worst of them and the
+        search stops at the first candidate that cannot beat it.
+
+        Returns:
+            Up to `top` dicts (score, distance, source, target, lang_target,
+            id, legal_source_id, book, article_number), best first
+        """
+        tokens = tuple(tokenize(sentence))
+        if not tokens or top < 1:
+            return []
+        text = ' '.join(sentence.split())
+        counts = Counter(tokens)
+        found = []         # (score, distance, unit id), best first
+        floor = min_score
+        for best, unit_id in self.candidates(tokens, min_score):
+            if best < floor:
+                break
+            stored = self.tokens[unit_id]
+            k = _bound(floor, max(len(tokens), len(stored)))
+            # Tighter bound with repeated words counted, before the quadratic part
+            stored_counts = self.counts[unit_id]
+            shared = sum(min(count, stored_counts[token]) for token, count in counts.items() if token in stored_counts)
+            if max(len(tokens), len(stored)) - shared > k:
+                continue
+            distance = edit_distance(tokens, stored, k)
+            if distance > k:
+                continue
+            score = fuzzy_score(distance, len(tokens), len(stored))
+            if score == 100 and ' '.join(self.units[unit_id]['sentence_source'].split()) != text:
+                score = 99
+            found.append((score, distance, unit_id))
+            found.sort(key=lambda match: (-match[0], match[1], match[2]))
+            if len(found) >= top:
+                del found[top:]
+                floor = found[-1][0]
+
+        matches = []
+        for score, distance, unit_id in found:
+            example = self.units[unit_id]
+            matches.append({
+                'score': score,
+                'distance': distance,
+                'source': example['sentence_source'],
+                'target': example['sentence_target'],
+                'lang_target': example['lang_target'],
+                'id': example['id'],
+                'legal_source_id': example['legal_source_id'],
+                'book': example['book'],
+                'article_number': example['article_number'],
+            })
+        return matches
+
+
+def _mutate(sentence, rng):
+    """A query for the benchmark: the sentence with one word dropped or two words swapped."""
+    words = sentence.split()
+    if len(words) > 3:
+        i = rng.randrange(len(words) - 1)
+        if rng.random() < 0.5:
+            del words[i]
+        else:
+            words[i], words[i + 1] = words[i + 1], words[i]
+    return ' '.join(words)
+
+
+def benchmark(tm, count, top=DEFAULT_TOP, min_score=DEFAULT_MIN_SCORE, seed=0):
+    """
+    Time `count` queries made by mutating random stored sentences.
+
+    Returns:
+        Dict with query count, hit rate and latency percentiles in ms
+    """
+    rng = random.Random(seed)
+    queries = [_mutate(tm.units[rng.randrange(len(tm))]['sentence_source'], rng) for _ in range(count)]
+    latencies, hits = [], 0
+    for query in queries:
+        started = time.perf_counter()
+        hits += bool(tm.match(query, top, min_score))
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {'queries': count, 'hit_rate': hits / count if count else 0,
+            'p50_ms': latencies[len(latencies) // 2], 'p99_ms': latencies[int(len(latencies) * 0.99)],
+            'max_ms': latencies[-1]}
+
+
+def print_matches(query, matches):
+    print(f"\n{query}")
+    if not matches:
+        print("   (no match)")
+    for match in matches:
+        print(f"   {match['score']:>3}%  {match['source']}")
+        print(f"         -> {match['target']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy-match Dutch sentences against the example translation memory.")
+    parser.add_argument('query', nargs='?', help="Dutch sentence ('-' reads one sentence per line from stdin)")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP)
+    parser.add_argument('--min-score', type=int, default=DEFAULT_MIN_SCORE, help="Lowest fuzzy-match percentage")
+    parser.add_argument('--lang-target', help="Only translations into this language")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Time N queries made from stored sentences")
+    args = parser.parse_args()
+    if not args.query and not args.benchmark:
+        parser.error("a query is required unless --benchmark is given")
+
+    started = time.perf_counter()
+    tm = TranslationMemory.load(lang_target=args.lang_target)
+    loaded = time.perf_counter() - started
+
+    if args.benchmark:
+        print("="*80)
+        print("TRANSLATION MEMORY BENCHMARK")
+        print("="*80)
+        result = benchmark(tm, args.benchmark, args.top, args.min_score)
+        print(f"\nUnits: {len(tm)} (indexed in {loaded:.2f}s) | Words: {len(tm.postings)}")
+        print(f"Queries: {result['queries']} | With a match >= {args.min_score}%: {result['hit_rate']:.0%}")
+        print(f"Latency: p50 {result['p50_ms']:.2f} ms | p99 {result['p99_ms']:.2f} ms | max {result['max_ms']:.2f} ms")
+        return
+
+    queries = (line.strip() for line in sys.stdin) if args.query == '-' else [args.query]
+    found = False
+    for query in queries:
+        if query:
+            matches = tm.match(query, args.top, args.min_score)
+            found = found or bool(matches)
+            print_matches(query, matches)
+    if not found:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
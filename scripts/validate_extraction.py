@@ -1,339 +1,485 @@
 #!/usr/bin/env python3
-"""Validate extracted legal translation terms."""
+"""
+Validate every dictionary and example file under data/.
 
+Each CSV/TSV is streamed once, row by row, and checked against the schema
+rules of its dictionary shape (detected from the header):
+
+    - required columns present, required values non-empty
+    - ids are UUIDs and unique
+    - boolean and date columns well-formed
+    - language columns match the languages in the folder / file name
+    - no stray leading/trailing whitespace in terms
+
+Duplicates are found with hash indexes while streaming: exact duplicate
+source/target pairs, and conflicts (same source term with different
+targets). Rows whose source term is one of the translation spot checks are
+collected in the same pass. Files are validated in parallel worker
+processes; ids and pairs shared between files are reported afterwards,
+along with the spot checks. A JSON report is written for CI.
+
+Usage:
+    python scripts/validate_extraction.py
+    python scripts/validate_extraction.py --jobs 1 --report validation-report.json
+    python scripts/validate_extraction.py --expect "Verdrag=Abkommen@de-de"
+    python scripts/validate_extraction.py --jobs 1 --profile validate.pstats --trace-memory
+"""
+
+import argparse
 import csv
-from collections import defaultdict
-from io import StringIO
-
-# The extracted data
-data = """id	source	lang-source	target	lang-target	author	license	sme-reviewed	premium	lang-target-dict
-	Verdrag	nl-nl	Abkommen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Koninkrijk der Nederlanden	nl-nl	Königreich der Niederlande	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Bondsrepubliek Duitsland	nl-nl	Bundesrepublik Deutschland	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	dubbele belasting	nl-nl	Doppelbesteuerung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	ontgaan van belasting	nl-nl	Steuerverkürzung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastingen naar het inkomen	nl-nl	Steuern vom Einkommen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	rechtspersoon	nl-nl	juristische Person	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	plaats van de werkelijke leiding	nl-nl	Ort der tatsächlichen Geschäftsleitung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	grensoverschrijdend bedrijventerrein	nl-nl	grenzüberschreitendes Gewerbegebiet	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	gemeenschappelijke grens	nl-nl	gemeinsame Grenze	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vaste bedrijfsinrichting	nl-nl	feste Geschäftseinrichtung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	verdragsluitende staten	nl-nl	Vertragsstaaten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	inwoner	nl-nl	ansässig	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	eenduidig vastgesteld	nl-nl	eindeutig bestimmt	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	het grootste deel van de gebruikte oppervlakte	nl-nl	größerer Teil der genutzten Fläche	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	gebouw	nl-nl	Gebäude	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	werkelijke leiding van de onderneming	nl-nl	tatsächliche Geschäftsleitung des Unternehmens	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vloeroppervlak gebruikt door de onderneming	nl-nl	vom Unternehmen genutzte Fläche	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	recht tot belastingheffing	nl-nl	Besteuerungsrecht	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	voorbeelden	nl-nl	Beispielsfälle	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	voorbeeld	nl-nl	Beispielsfall	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	onderneming	nl-nl	Unternehmen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	inkomsten van de onderneming	nl-nl	Gewinne des Unternehmens	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	economische betrekkingen	nl-nl	wirtschaftlichen Beziehungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	samenwerking op het gebied van belastingzaken	nl-nl	Zusammenarbeit in Steuersachen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	doeltreffende en juiste belastingheffing	nl-nl	wirksame und zutreffende Steuererhebung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	heffingsbevoegdheden	nl-nl	Besteuerungsrechte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vermijden van dubbele heffing	nl-nl	Vermeidung der Doppelbesteuerung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	personen die inwoner zijn van een verdragsluitende staat	nl-nl	Personen, die in einem Vertragsstaat ansässig sind	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastingen naar het gehele inkomen	nl-nl	Steuern, die vom Gesamteinkommen erhoben werden	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	roerende of onroerende zaken	nl-nl	beweglichen oder unbeweglichen Vermögens	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	loonbelasting	nl-nl	Lohnsummensteuern	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	ondernemingsbelasting	nl-nl	Gewerbesteuer	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	mijnbouwwet	nl-nl	Bergbaugesetz	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bevoegde autoriteiten	nl-nl	zuständigen Behörden	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	wezenlijke wijzigingen	nl-nl	wesentlichen Änderungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	algemene begripsomschrijvingen	nl-nl	Allgemeine Begriffsbestimmungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	verdragsluitende staat	nl-nl	Vertragsstaat	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Duitsland	nl-nl	Deutschland	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Nederland	nl-nl	Niederlande	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	persoon	nl-nl	Person	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	lichaam	nl-nl	Gesellschaft	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bedrijfsuitoefening	nl-nl	Geschäftstätigkeit	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	internationaal verkeer	nl-nl	internationaler Verkehr	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	onderdaan	nl-nl	Staatsangehöriger	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bevoegde autoriteit	nl-nl	zuständige Behörde	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	inwoner	nl-nl	ansässige Person	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	duurzaam tehuis	nl-nl	ständige Wohnstätte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	middelpunt van de levensbelangen	nl-nl	Mittelpunkt der Lebensinteressen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	gewoonlijk verblijft	nl-nl	gewöhnlichen Aufenthalt	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	plaats van de werkelijke leiding	nl-nl	Ort der tatsächlichen Geschäftsleitung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vaste inrichting	nl-nl	Betriebsstätte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	werkzaamheden buitengaats	nl-nl	Tätigkeiten vor der Küste	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bouwwerk of constructiewerkzaamheden	nl-nl	Bauausführung oder Montage	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	makelaar of commissionair	nl-nl	Makler oder Kommissionär	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	onafhankelijke vertegenwoordiger	nl-nl	unabhängiger Vertreter	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	filiaal	nl-nl	Zweigniederlassung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	fabriek	nl-nl	Fabrikationsstätte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	werkplaats	nl-nl	Werkstätte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	mijn	nl-nl	Bergwerk	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	olie- of gasbron	nl-nl	Öl- oder Gasvorkommen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	(steen)groeve	nl-nl	Steinbruch	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	natuurlijke rijkdommen	nl-nl	natürliche Ressourcen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	inkomsten uit onroerende zaken	nl-nl	Einkünfte aus unbeweglichem Vermögen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	onroerende zaken	nl-nl	unbewegliches Vermögen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	landbouw- of bosbedrijven	nl-nl	land- und forstwirtschaftliche Betriebe	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vruchtgebruik	nl-nl	Nutzungsrechte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	minerale aardlagen	nl-nl	Mineralvorkommen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bronnen en andere natuurlijke rijkdommen	nl-nl	Quellen und andere natürliche Ressourcen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	winst uit onderneming	nl-nl	Unternehmensgewinne	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vaste inrichting	nl-nl	Betriebsstätte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	zeevaart, binnenvaart en luchtvervoer	nl-nl	Seeschifffahrt, Binnenschifffahrt und Luftfahrt	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	schepen of luchtvaartuigen in internationaal verkeer	nl-nl	Seeschiffe oder Luftfahrzeuge im internationalen Verkehr	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	binnenschepen	nl-nl	Binnenschiffe	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	containers	nl-nl	Container	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	pool	nl-nl	Pool	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	gemeenschappelijke onderneming	nl-nl	Betriebsgemeinschaft	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	gelieerde ondernemingen	nl-nl	verbundene Unternehmen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	handelsbetrekkingen of financiële betrekkingen	nl-nl	kaufmännischen oder finanziellen Beziehungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	dividenden	nl-nl	Dividenden	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	pensioenfonds	nl-nl	Pensionsfonds	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	winstaandelen of winstbewijzen	nl-nl	Genussrechte oder Genussscheine	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	mijnaandelen	nl-nl	Kuxen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	oprichtersaandelen	nl-nl	Gründeranteile	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	interest	nl-nl	Zinsen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	schuldvorderingen	nl-nl	Forderungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	obligaties	nl-nl	Obligationen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	schuldbewijzen	nl-nl	Losanleihen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	boetes voor te late betaling	nl-nl	Zuschläge für verspätete Zahlung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	royalty's	nl-nl	Lizenzgebühren	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	auteursrecht	nl-nl	Urheberrechten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	octrooi	nl-nl	Patenten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	fabrieks- of handelsmerk	nl-nl	Warenzeichen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	tekening of model	nl-nl	Muster oder Modellen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	geheim recept of geheime werkwijze	nl-nl	geheime Formeln oder Verfahren	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	ervaringen op het gebied van nijverheid, handel of wetenschap	nl-nl	gewerblicher, kaufmännischer oder wissenschaftlicher Erfahrungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vermogenswinsten	nl-nl	Gewinne aus der Veräußerung von Vermögen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vervreemding van onroerende zaken	nl-nl	Veräußerung unbeweglichen Vermögens	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	aandelen of vergelijkbare belangen	nl-nl	Aktien oder vergleichbaren Anteilen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	erkende effectenbeurs	nl-nl	anerkannte Börse	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bedrijfsvermogen	nl-nl	Betriebsvermögen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	roerende zaken	nl-nl	beweglichen Vermögens	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vervreemder	nl-nl	Veräußerer	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	waardevermeerdering van vermogen	nl-nl	Vermögenszuwachs	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	inkomsten uit dienstbetrekking	nl-nl	Einkünfte aus unselbständiger Arbeit	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	dienstbetrekking	nl-nl	unselbständige Arbeit	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	salarissen, lonen en andere soortgelijke beloningen	nl-nl	Gehälter, Löhne und ähnliche Vergütungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	verordening (EEG) 1408/71	nl-nl	Verordnung (EWG) Nr. 1408/71	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	verordening (EG) 883/2004	nl-nl	Verordnung (EG) Nr. 883/2004	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	directeursbeloningen	nl-nl	Aufsichtsrats- oder Verwaltungsratsvergütungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	lid van de raad van beheer	nl-nl	Mitglied des Aufsichts- oder Verwaltungsrats	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	artiesten en sportbeoefenaars	nl-nl	Künstler und Sportler	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	toneelspeler, film-, radio- of televisie-artiest of musicus	nl-nl	Bühnen-, Film-, Rundfunk- und Fernsehkünstler sowie Musiker	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	persoonlijke werkzaamheden	nl-nl	persönlich ausgeübte Tätigkeit	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	socialezekerheidsuitkeringen	nl-nl	Sozialversicherungsleistungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	pensioenen en lijfrenten	nl-nl	Ruhegehälter und Renten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	socialezekerheidspensioenen	nl-nl	Sozialversicherungsrenten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	periodieke betalingen	nl-nl	regelmäßig wiederkehrender Art	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	schadevergoeding wegens politieke vervolging	nl-nl	Entschädigung für politische Verfolgung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	algemene belang	nl-nl	öffentlichen Interesse	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	overheidsfuncties	nl-nl	öffentlicher Dienst	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bezoekende hoogleraren en docenten	nl-nl	Gastprofessoren und Lehrer	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	studenten	nl-nl	Studenten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	overige inkomsten	nl-nl	Andere Einkünfte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vermijden van dubbele belasting	nl-nl	vermeidung der Doppelbesteuerung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastinggrondslag	nl-nl	Bemessungsgrundlage	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bestanddeel van het inkomen	nl-nl	Einkünfte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	werkelijk wordt belast	nl-nl	tatsächlich besteuert werden	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	samenwerkingsverband	nl-nl	Personengesellschaft	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	kapitaal	nl-nl	Kapital	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	winst van het lichaam	nl-nl	Gewinne der ausschüttenden Gesellschaft	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	verrekening van buitenlandse belasting	nl-nl	Anrechnung ausländischer Steuern	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	ingevolge het Nederlandse belastingrecht	nl-nl	nach niederländischem Recht	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	directeursbeloningen	nl-nl	Aufsichtsrats- und Verwaltungsratsvergütungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	pensioenen, lijfrenten en socialezekerheidsuitkeringen	nl-nl	Ruhegehälter, Renten und Sozialversicherungsleistungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastingtarief	nl-nl	Steuersatz	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	diplomatieke weg	nl-nl	diplomatischem Weg	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastingverrekening	nl-nl	Steueranrechnung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Tweede Wereldoorlog	nl-nl	Zweiten Weltkrieg	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	dwangarbeider	nl-nl	Zwangsarbeiter	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	invaliditeitspensioenen	nl-nl	Verletztenrenten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	socialezekerheidswetgeving	nl-nl	Sozialversicherungsgesetze	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastingvermindering	nl-nl	Steuerermäßigung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	fiscale faciliëring	nl-nl	Steuervergünstigung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belasting over deze bestanddelen van het inkomen	nl-nl	Steuer auf diese Einkünfte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	wettelijke vereisten	nl-nl	rechtlichen Voraussetzungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Toepassing van het Verdrag in bijzondere gevallen	nl-nl	Anwendung des Abkommens in bestimmten Fällen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	non-discriminatie	nl-nl	Gleichbehandlung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	onderdanen	nl-nl	Staatsangehörige	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	staatlozen	nl-nl	Staatenlose	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vaste inrichting	nl-nl	Betriebsstätte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	persoonlijke aftrekken, tegemoetkomingen en verminderingen	nl-nl	Steuerfreibeträge, -vergünstigungen und -ermäßigungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	interest, royalty's en andere uitgaven	nl-nl	Zinsen, Lizenzgebühren und andere Entgelte	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	pensioenregeling	nl-nl	Altersversorgungssystem	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	publiekrechtelijk socialezekerheidsstelsel	nl-nl	staatlichen Sozialversicherungssystems	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	procedure voor onderling overleg	nl-nl	Verständigungsverfahren	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	boekenonderzoeken op grensoverschrijdende bedrijventerreinen	nl-nl	Außenprüfungen in grenzüberschreitenden Gewerbegebieten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	uitwisseling van informatie	nl-nl	Informationsaustausch	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bijstand bij de invordering van belastingen	nl-nl	Amtshilfe bei der Erhebung von Steuern	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	procedures voor belastingheffing aan de bron	nl-nl	Verfahrensregeln für die Quellenbesteuerung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	leden van diplomatieke vertegenwoordigingen en consulaire posten	nl-nl	Mitglieder diplomatischer Missionen und konsularischer Vertretungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bijlage en Protocol	nl-nl	Anlage und Protokoll	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	uitbreiding tot andere gebieden	nl-nl	Ausweitung des räumlichen Geltungsbereichs	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	inwerkingtreding	nl-nl	Inkrafttreten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	bekrachtiging	nl-nl	Ratifikation	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	akten van bekrachtiging	nl-nl	Ratifikationsurkunden	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	in werking treden	nl-nl	in Kraft treten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastingen geheven aan de bron	nl-nl	im Abzugsweg erhobenen Steuern	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	overige belastingen	nl-nl	übrigen Steuern	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	kalenderjaar	nl-nl	Kalenderjahr	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Overeenkomst van 1959	nl-nl	Abkommen von 1959	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Aanvullend Protocol	nl-nl	Zusatzprotokoll	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Tweede Aanvullend Protocol	nl-nl	Zweite Zusatzprotokoll	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Derde Aanvullend Protocol	nl-nl	Dritte Zusatzprotokoll	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	openstaande gevallen	nl-nl	offenen Fällen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	belastingen, belastingjaren en -tijdvakken	nl-nl	Steuern, Veranlagungsjahre und -zeiträume	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	voordelen	nl-nl	Vergünstigungen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	beëindiging	nl-nl	Kündigung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	beëindigen	nl-nl	kündigen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	kennisgeving van beëindiging	nl-nl	Kündigung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	langs diplomatieke weg	nl-nl	auf diplomatischem Weg	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	verstrijken van een tijdvak van vijf jaar	nl-nl	Ablauf von fünf Jahren	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	GEDAAN te Berlijn	nl-nl	GESCHEHEN zu Berlin	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Onderlinge overeenkomst tussen het Koninkrijk der Nederlanden en de Bondsrepubliek Duitsland	nl-nl	Verständigungsvereinbarung zwischen dem Königreich der Niederlande und der Bundesrepublik Deutschland	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	arbitrageprocedure	nl-nl	Schiedsverfahren	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	verzoek om arbitrage	nl-nl	Schiedsantrag	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	arbiters	nl-nl	Schiedsrichter	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	voorzitter	nl-nl	Vorsitzender	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	hoogstgeplaatste functionaris van het Secretariaat van het Centre for Tax Policy and Administration van de OESO	nl-nl	hochrangigste Mitglied des Sekretariats des Zentrums für Steuerpolitik und Steuerverwaltung der OECD	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	gestroomlijnde arbitrageprocedure	nl-nl	vereinfachtes Schiedsverfahren	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	vertrouwelijkheid	nl-nl	Vertraulichkeit	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	procedure en bewijsvoering	nl-nl	Verfahrens- und Beweisregeln	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	deelname door de persoon die om de arbitrage heeft verzocht	nl-nl	Beteiligung des Antragstellers	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	logistieke maatregelen	nl-nl	Organisatorisches	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	kosten	nl-nl	Kosten	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	toepasselijke rechtsbeginselen	nl-nl	anzuwendende Rechtsgrundsätze	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	arbitrale uitspraak	nl-nl	Schiedsspruch	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	definitieve uitspraak	nl-nl	Endgültige Entscheidung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	tenuitvoerlegging van de arbitrale uitspraak	nl-nl	Umsetzung des Schiedsspruchs	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	Europees Parlement	nl-nl	Europäisches Parlament	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	stille vennoot	nl-nl	stiller Gesellschafter	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	lening met een rentepercentage gekoppeld aan de winst van de schuldenaar	nl-nl	partiarisches Darlehen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	obligaties met winstdeling	nl-nl	Gewinnobligationen	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	besloten fondsen voor gemene rekening	nl-nl	geschlossene Fonds für gemeinsame Rechnung	de-de	van Gassen	All rights reserved	TRUE	FALSE
-	investeringsregelingen of samenwerkingsverbanden	nl-nl	Investmentvermögen oder Personengesellschaften	de-de	van Gassen	All rights reserved	TRUE	FALSE"""
+import hashlib
+import json
+import re
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
 
-def main():
-    """Main validation function."""
-    reader = csv.DictReader(StringIO(data), delimiter='\t')
-    rows = list(reader)
-
-    print(f"Total terms extracted: {len(rows)}\n")
-
-    # Track duplicates
-    source_terms = defaultdict(list)
-    target_terms = defaultdict(list)
-    source_target_pairs = defaultdict(int)
-
-    # Track empty fields
-    empty_ids = 0
-    empty_lang_target_dict = 0
-
-    for idx, row in enumerate(rows, 1):
-        source = row.get('source', '').strip() if row.get('source') else ''
-        target = row.get('target', '').strip() if row.get('target') else ''
-
-        # Check for empty fields
-        row_id = row.get('id', '') or ''
-        if not row_id.strip():
-            empty_ids += 1
-        lang_target_dict = row.get('lang-target-dict', '') or ''
-        if not lang_target_dict.strip():
-            empty_lang_target_dict += 1
-
-        # Track duplicates
-        source_terms[source].append(idx)
-        target_terms[target].append(idx)
-        source_target_pairs[(source, target)] += 1
-
-    # Report findings
+from dictionary_loader import BASE_DIR, DATA_DIR, normalise_key, normalise_row
+from instrumentation import add_arguments, instrumented
+
+DEFAULT_REPORT_PATH = BASE_DIR / 'validation-report.json'
+MAX_ISSUES_PER_FILE = 200
+LANG_RE = re.compile(r'^[a-z]{2}-[a-z]{2}$')
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+PAIR_LANGS_RE = re.compile(r'([a-z]{2}-[a-z]{2})_([a-z]{2}-[a-z]{2})')
+
+# (source, expected target, target language) - checked against all dictionaries
+DEFAULT_SPOT_CHECKS = [
+    ("Verdrag", "Abkommen", "de-de"),
+    ("dubbele belasting", "Doppelbesteuerung", "de-de"),
+    ("vaste inrichting", "Betriebsstätte", "de-de"),
+    ("belastingverdrag", "Steuerabkommen", "de-de"),
+]
+
+# Schema rules per dictionary shape, matched on the header in this order.
+#   detect:       columns that identify the shape
+#   required:     values that must be non-empty
+#   id:           column holding a UUID that must be unique
+#   source/targets: term columns used for duplicate and conflict detection
+#   languages:    column -> 'source' or index into the expected target languages
+SCHEMAS = [
+    {
+        'name': 'examples',
+        'detect': ['example_id', 'sentence_nl_nl', 'sentence_en_gb'],
+        'required': ['example_id', 'sentence_nl_nl', 'sentence_en_gb', 'legal_source_id', 'book_identifier'],
+        'id': 'example_id',
+        'source': 'sentence_nl_nl',
+        'targets': ['sentence_en_gb'],
+        'booleans': {},
+        'dates': ['translation_date'],
+        'languages': {},
+    },
+    {
+        'name': 'tmx_glossary',
+        'detect': ['dictionary_term_id', 'term_nl_nl', 'term_en_gb'],
+        'required': ['dictionary_term_id', 'term_nl_nl', 'term_en_gb', 'language_source', 'language_target'],
+        'id': 'dictionary_term_id',
+        'source': 'term_nl_nl',
+        'targets': ['term_en_gb'],
+        'booleans': {'expert_reviewed': ('yes', 'no'), 'premium_content': ('yes', 'no')},
+        'dates': ['translation_date'],
+        'languages': {'language_source': 'source', 'language_target': 0},
+    },
+    {
+        'name': 'treaty_extraction',
+        'detect': ['term_id', 'term_nl_nl', 'term_fr_fr'],
+        'required': ['term_id', 'term_nl_nl', 'term_fr_fr', 'language_source', 'language_target', 'bwb_id'],
+        'id': 'term_id',
+        'source': 'term_nl_nl',
+        'targets': ['term_fr_fr'],
+        'booleans': {},
+        'dates': ['extraction_date'],
+        'languages': {'language_source': 'source', 'language_target': 0},
+    },
+    {
+        'name': 'trilingual',
+        'detect': ['id', 'source', 'target-de-de', 'target-fr-fr'],
+        'required': ['id', 'source', 'lang-source', 'target-de-de', 'target-fr-fr', 'author', 'license'],
+        'id': 'id',
+        'source': 'source',
+        'targets': ['target-de-de', 'target-fr-fr'],
+        'booleans': {'sme-reviewed': ('true', 'false'), 'premium': ('true', 'false')},
+        'dates': [],
+        'languages': {'lang-source': 'source', 'lang-target-1': 0, 'lang-target-2': 1},
+    },
+    {
+        'name': 'bilingual',
+        'detect': ['id', 'source', 'target'],
+        'required': ['id', 'source', 'lang-source', 'target', 'lang-target', 'author', 'license'],
+        'id': 'id',
+        'source': 'source',
+        'targets': ['target'],
+        'booleans': {'sme-reviewed': ('true', 'false'), 'premium': ('true', 'false')},
+        'dates': [],
+        'languages': {'lang-source': 'source', 'lang-target': 0},
+    },
+    {
+        'name': 'monolingual',
+        'detect': ['id', 'source', 'lang-source-dict'],
+        'required': ['id', 'source', 'lang-source', 'lang-source-dict', 'author', 'license'],
+        'id': 'id',
+        'source': 'source',
+        'targets': [],
+        'booleans': {'sme-reviewed': ('true', 'false'), 'premium': ('true', 'false')},
+        'dates': [],
+        'languages': {'lang-source': 'source'},
+    },
+]
+
+
+def iter_data_files(data_dir=DATA_DIR):
+    """
+    Yield every CSV/TSV file under data/, sorted.
+
+    As in dictionary_loader, a .tsv with a .csv of the same stem next to it
+    is an export of that file and is skipped. data/raw holds the original
+    import files and is not validated.
+    """
+    raw_dir = Path(data_dir) / 'raw'
+    for path in sorted(Path(data_dir).rglob('*')):
+        if raw_dir in path.parents:
+            continue
+        if path.suffix == '.csv' or (path.suffix == '.tsv' and not path.with_suffix('.csv').exists()):
+            yield path
+
+
+def detect_schema(fieldnames):
+    """Return the first schema whose detect columns are all present, or None."""
+    columns = set(fieldnames or ())
+    for schema in SCHEMAS:
+        if columns.issuperset(schema['detect']):
+            return schema
+    return None
+
+
+def expected_languages(path):
+    """
+    Languages implied by the folder or file name.
+
+    data/dictionaries/nl-nl_de-de_fr-fr/... -> ('nl-nl', ['de-de', 'fr-fr'])
+    data/examples/examples_nl-nl_en-gb_...  -> ('nl-nl', ['en-gb'])
+
+    Returns:
+        (source language, list of target languages); (None, []) if unknown
+    """
+    path = Path(path)
+    langs = [part for part in path.parent.name.split('_') if LANG_RE.match(part)]
+    if langs and len(langs) == len(path.parent.name.split('_')):
+        return langs[0], langs[1:]
+    match = PAIR_LANGS_RE.search(path.stem)
+    if match:
+        return match.group(1), [match.group(2)]
+    return None, []
+
+
+def pair_digest(source, target):
+    """Short hash of a normalised (source, target) pair for cross-file comparison."""
+    key = f"{normalise_key(source)}\0{normalise_key(target)}".encode('utf-8')
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
+class _FileResult:
+    """Collects issues for one file, keeping full counts but bounded detail."""
+
+    def __init__(self, path, schema):
+        self.data = {
+            'file': path,
+            'schema': schema,
+            'rows': 0,
+            'errors': 0,
+            'warnings': 0,
+            'issue_counts': {},
+            'issues': [],
+            'duplicate_pairs': 0,
+            'conflicts': 0,
+        }
+
+    def add(self, level, code, row, message):
+        self.data['errors' if level == 'error' else 'warnings'] += 1
+        self.data['issue_counts'][code] = self.data['issue_counts'].get(code, 0) + 1
+        if len(self.data['issues']) < MAX_ISSUES_PER_FILE:
+            self.data['issues'].append({'level': level, 'code': code, 'row': row, 'message': message})
+
+
+def validate_file(path, data_dir=DATA_DIR, spot_keys=()):
+    """
+    Validate one file in a single streaming pass.
+
+    Runs in a worker process, so it only takes and returns plain values.
+    Dictionary rows whose normalised source term is in `spot_keys` are
+    returned as (source key, target, target language) spot-check hits.
+
+    Returns:
+        Result dict (counts, capped issue list) plus 'ids' and 'pairs' for
+        cross-file checks and 'spot_hits' for the spot checks
+    """
+    path = Path(path)
+    if (Path(data_dir) / 'dictionaries') not in path.parents:
+        spot_keys = ()
+    try:
+        relative = str(path.relative_to(Path(data_dir).parent))
+    except ValueError:
+        relative = str(path)
+    delimiter = '\t' if path.suffix == '.tsv' else ','
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        schema = detect_schema(reader.fieldnames)
+        result = _FileResult(relative, schema['name'] if schema else None)
+        if schema is None:
+            result.add('error', 'unknown_schema', 0, f"Unrecognised columns: {', '.join(reader.fieldnames or [])}")
+            result.data.update(ids=[], pairs=[], spot_hits=[])
+            return result.data
+
+        source_lang, target_langs = expected_languages(path)
+        seen_ids = {}       # id -> first row
+        pairs = {}          # (source key, target key) -> first row
+        sources = {}        # source key -> (first target key, first row)
+        conflicted = set()
+        spot_hits = []
+
+        for row_number, row in enumerate(reader, 1):
+            result.data['rows'] = row_number
+            values = {column: (value or '') for column, value in row.items() if column is not None}
+            if None in row:
+                result.add('error', 'extra_fields', row_number, f"{len(row[None])} value(s) beyond the header")
+
+            for column in schema['required']:
+                if not values.get(column, '').strip():
+                    result.add('error', 'missing_value', row_number, f"Empty '{column}'")
+
+            row_id = values.get(schema['id'], '').strip()
+            if row_id:
+                try:
+                    uuid.UUID(row_id)
+                except ValueError:
+                    result.add('error', 'invalid_id', row_number, f"'{row_id}' is not a UUID")
+                if row_id in seen_ids:
+                    result.add('error', 'duplicate_id', row_number,
+                               f"Id {row_id} already used in row {seen_ids[row_id]}")
+                else:
+                    seen_ids[row_id] = row_number
+
+            for column, allowed in schema['booleans'].items():
+                value = values.get(column, '').strip()
+                if value and value.lower() not in allowed:
+                    result.add('error', 'invalid_boolean', row_number,
+                               f"'{column}' is '{value}', expected {'/'.join(allowed)}")
+
+            for column in schema['dates']:
+                value = values.get(column, '').strip()
+                if value and not DATE_RE.match(value):
+                    result.add('error', 'invalid_date', row_number, f"'{column}' is '{value}', expected YYYY-MM-DD")
+
+            for column, role in schema['languages'].items():
+                value = values.get(column, '').strip()
+                expected = source_lang if role == 'source' else (
+                    target_langs[role] if role < len(target_langs) else None)
+                if value and expected and value != expected:
+                    result.add('error', 'language_mismatch', row_number,
+                               f"'{column}' is '{value}', expected '{expected}' from the file location")
+
+            source = values.get(schema['source'], '')
+            for column in [schema['source']] + schema['targets']:
+                text = values.get(column, '')
+                if text and text != text.strip():
+                    result.add('warning', 'whitespace', row_number, f"Leading/trailing whitespace in '{column}'")
+
+            source_key = normalise_key(source)
+            if not source_key:
+                continue
+            if source_key in spot_keys:
+                entry = normalise_row(values)
+                if entry is not None:
+                    spot_hits.extend((source_key, target, lang) for target, lang in entry['targets'])
+            target_key = ' | '.join(normalise_key(values.get(column, '')) for column in schema['targets'])
+            pair = (source_key, target_key)
+            if pair in pairs:
+                result.data['duplicate_pairs'] += 1
+                result.add('warning', 'duplicate_pair', row_number,
+                           f"'{source.strip()}' -> same translation as row {pairs[pair]}")
+            else:
+                pairs[pair] = row_number
+
+            first = sources.get(source_key)
+            if first is None:
+                sources[source_key] = (target_key, row_number)
+            elif first[0] != target_key and source_key not in conflicted:
+                conflicted.add(source_key)
+                result.data['conflicts'] += 1
+                result.add('warning', 'conflict', row_number,
+                           f"'{source.strip()}' has a different translation than in row {first[1]}")
+
+    result.data['ids'] = list(seen_ids)
+    result.data['pairs'] = [pair_digest(*pair) for pair in pairs if pair[1]]
+    result.data['spot_hits'] = spot_hits
+    return result.data
+
+
+def cross_file_checks(results):
+    """
+    Find ids and translation pairs that occur in more than one file.
+
+    Returns:
+        Dict with 'duplicate_ids' and 'shared_pairs' (file pairs with counts)
+    """
+    id_files = {}
+    pair_files = {}
+    for result in results:
+        for row_id in result.pop('ids'):
+            id_files.setdefault(row_id, []).append(result['file'])
+        for digest in result.pop('pairs'):
+            pair_files.setdefault(digest, []).append(result['file'])
+
+    duplicate_ids = [{'id': row_id, 'files': files} for row_id, files in id_files.items() if len(files) > 1]
+    shared = {}
+    for files in pair_files.values():
+        if len(files) > 1:
+            key = tuple(sorted(set(files)))
+            shared[key] = shared.get(key, 0) + 1
+    shared_pairs = [{'files': list(files), 'pairs': count} for files, count in sorted(shared.items())]
+    return {'duplicate_ids': duplicate_ids[:MAX_ISSUES_PER_FILE], 'duplicate_id_count': len(duplicate_ids),
+            'shared_pairs': shared_pairs}
+
+
+def run_spot_checks(checks, results):
+    """
+    Compare expected translations with the spot-check hits of all files.
+
+    Pops 'spot_hits' from each file result, as cross_file_checks does with
+    'ids' and 'pairs'.
+    """
+    found = {}
+    for result in results:
+        for source_key, target, lang_target in result.pop('spot_hits'):
+            found.setdefault((source_key, lang_target), []).append(target)
+
+    spot = []
+    for source, expected, lang_target in checks:
+        targets = found.get((normalise_key(source), lang_target), [])
+        status = 'missing' if not targets else ('ok' if expected in targets else 'mismatch')
+        spot.append({'source': source, 'expected': expected, 'lang_target': lang_target,
+                     'found': sorted(set(targets)), 'status': status})
+    return spot
+
+
+def parse_expectation(spec):
+    """Parse SOURCE=TARGET@LANG (e.g. "Verdrag=Abkommen@de-de")."""
+    match = re.match(r'^(.+?)=(.+)@([a-z]{2}-[a-z]{2})$', spec)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Expected SOURCE=TARGET@LANG, got '{spec}'")
+    return match.group(1).strip(), match.group(2).strip(), match.group(3)
+
+
+def validate_all(data_dir=DATA_DIR, jobs=None, spot_checks=DEFAULT_SPOT_CHECKS):
+    """
+    Validate every file under data/ (in parallel unless jobs == 1).
+
+    Returns:
+        Report dict
+    """
+    files = [str(path) for path in iter_data_files(data_dir)]
+    spot_keys = frozenset(normalise_key(source) for source, _, _ in spot_checks or ())
+    started = time.perf_counter()
+    if jobs == 1 or len(files) < 2:
+        results = [validate_file(path, data_dir, spot_keys) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(validate_file, files, [data_dir] * len(files), [spot_keys] * len(files)))
+    cross_file = cross_file_checks(results)
+    spot = run_spot_checks(spot_checks or [], results)
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'data_dir': str(data_dir),
+        'seconds': round(time.perf_counter() - started, 3),
+        'totals': {
+            'files': len(results),
+            'rows': sum(r['rows'] for r in results),
+            'errors': sum(r['errors'] for r in results) + cross_file['duplicate_id_count'],
+            'warnings': sum(r['warnings'] for r in results),
+            'duplicate_pairs': sum(r['duplicate_pairs'] for r in results),
+            'conflicts': sum(r['conflicts'] for r in results),
+        },
+        'files': results,
+        'cross_file': cross_file,
+        'spot_checks': spot,
+    }
+
+
+def print_report(report):
     print("=" * 80)
     print("VALIDATION REPORT")
     print("=" * 80)
 
-    print("\n1. MISSING DATA:")
-    print(f"   - Empty 'id' fields: {empty_ids}/{len(rows)}")
-    print(f"   - Empty 'lang-target-dict' fields: {empty_lang_target_dict}/{len(rows)}")
-
-    print("\n2. DUPLICATE SOURCE TERMS (Dutch):")
-    duplicates_found = False
-    for term, occurrences in sorted(source_terms.items()):
-        if len(occurrences) > 1:
-            duplicates_found = True
-            print(f"   - '{term}' appears {len(occurrences)} times (rows: {', '.join(map(str, occurrences))})")
-            for occ in occurrences:
-                src = rows[occ-1].get('source', '') or ''
-                tgt = rows[occ-1].get('target', '') or ''
-                print(f"     -> Row {occ}: {src} -> {tgt}")
-    if not duplicates_found:
-        print("   [OK] No duplicate source terms")
-
-    print("\n3. DUPLICATE TARGET TERMS (German):")
-    duplicates_found = False
-    for term, occurrences in sorted(target_terms.items()):
-        if len(occurrences) > 1:
-            duplicates_found = True
-            print(f"   - '{term}' appears {len(occurrences)} times (rows: {', '.join(map(str, occurrences))})")
-    if not duplicates_found:
-        print("   [OK] No duplicate target terms")
-
-    print("\n4. EXACT DUPLICATE PAIRS:")
-    exact_duplicates = [(pair, count) for pair, count in source_target_pairs.items() if count > 1]
-    if exact_duplicates:
-        for (source, target), count in exact_duplicates:
-            print(f"   - '{source}' -> '{target}' appears {count} times")
+    print("\n1. FILES:")
+    for result in report['files']:
+        status = "[X]" if result['errors'] else "[OK]"
+        print(f"   {status} {result['file']} ({result['schema'] or 'unknown'}, {result['rows']} rows): "
+              f"{result['errors']} error(s), {result['warnings']} warning(s)")
+        for code, count in sorted(result['issue_counts'].items()):
+            print(f"       - {code}: {count}")
+
+    print("\n2. FIRST ERRORS:")
+    shown = 0
+    for result in report['files']:
+        for issue in result['issues']:
+            if issue['level'] == 'error' and shown < 20:
+                print(f"   - {result['file']} row {issue['row']}: {issue['message']}")
+                shown += 1
+    if not shown:
+        print("   [OK] No errors")
+
+    print("\n3. ACROSS FILES:")
+    cross_file = report['cross_file']
+    if cross_file['duplicate_id_count']:
+        print(f"   [X] {cross_file['duplicate_id_count']} id(s) used in more than one file")
     else:
-        print("   [OK] No exact duplicate translation pairs")
-
-    print("\n5. DATA CONSISTENCY:")
-    all_consistent = True
-    for row in rows:
-        if row.get('lang-source') != 'nl-nl':
-            print(f"   [X] Inconsistent source language: {row.get('lang-source')}")
-            all_consistent = False
-        if row.get('lang-target') != 'de-de':
-            print(f"   [X] Inconsistent target language: {row.get('lang-target')}")
-            all_consistent = False
-        if row.get('author') != 'van Gassen':
-            print(f"   [X] Inconsistent author: {row.get('author')}")
-            all_consistent = False
-        if row.get('sme-reviewed') != 'TRUE':
-            print(f"   [X] Not SME reviewed: {row.get('source')}")
-            all_consistent = False
-    if all_consistent:
-        print("   [OK] All metadata fields are consistent")
-
-    print("\n6. TRANSLATION QUALITY SPOT CHECK:")
-    spot_check = [
-        ("Verdrag", "Abkommen", "Treaty/Agreement"),
-        ("dubbele belasting", "Doppelbesteuerung", "Double taxation"),
-        ("vaste inrichting", "Betriebsstätte", "Permanent establishment"),
-        ("belastingverdrag", "Steuerabkommen", "Tax treaty"),
-    ]
-
-    for nl_term, expected_de, meaning in spot_check:
-        matches = [row for row in rows if row.get('source') == nl_term]
-        if matches:
-            actual_de = matches[0].get('target', '')
-            status = "[OK]" if actual_de == expected_de else "[?]"
-            print(f"   {status} '{nl_term}' -> '{actual_de}' ({meaning})")
-        else:
-            print(f"   - '{nl_term}' not found in extraction")
+        print("   [OK] Ids are unique across files")
+    for shared in cross_file['shared_pairs']:
+        print(f"   - {shared['pairs']} translation pair(s) shared by: {', '.join(shared['files'])}")
 
+    if report['spot_checks']:
+        print("\n4. TRANSLATION QUALITY SPOT CHECK:")
+        for check in report['spot_checks']:
+            if check['status'] == 'missing':
+                print(f"   - '{check['source']}' not found ({check['lang_target']})")
+            else:
+                status = "[OK]" if check['status'] == 'ok' else "[?]"
+                print(f"   {status} '{check['source']}' -> '{', '.join(check['found'])}' "
+                      f"(expected '{check['expected']}')")
+
+    totals = report['totals']
     print("\n" + "=" * 80)
-    print("RECOMMENDATIONS:")
+    print(f"Files: {totals['files']} | Rows: {totals['rows']} | Errors: {totals['errors']} | "
+          f"Warnings: {totals['warnings']} | Duplicate pairs: {totals['duplicate_pairs']} | "
+          f"Conflicts: {totals['conflicts']} | {report['seconds']:.2f}s")
     print("=" * 80)
-    print("\n1. Generate UUIDs for the 'id' field")
-    print("2. Decide on strategy for duplicate source terms:")
-    print("   - Keep context-dependent variations")
-    print("   - OR merge with usage notes")
-    print("3. Populate 'lang-target-dict' if needed for dictionary references")
-    print("4. Consider adding:")
-    print("   - Definition/context field")
-    print("   - Example sentences")
-    print("   - Term frequency/importance score")
-    print("   - Article/section reference from source XML")
-    print("\n")
+
+
+def main():
+    """Main validation function."""
+    parser = argparse.ArgumentParser(description="Validate all dictionary and example files under data/.")
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--report', type=Path, default=DEFAULT_REPORT_PATH, help="JSON report path")
+    parser.add_argument('--expect', action='append', type=parse_expectation, metavar='SOURCE=TARGET@LANG',
+                        help="Spot check a translation (repeatable; replaces the defaults)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumented(args, 'validate_extraction'):
+        report = validate_all(args.data_dir, args.jobs, args.expect or DEFAULT_SPOT_CHECKS)
+        print_report(report)
+
+    args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\n[OK] Report written to: {args.report}")
+    if report['totals']['errors']:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
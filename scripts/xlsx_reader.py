@@ -0,0 +1,134 @@
+"""
+Read-only, streaming reader for XLSX workbooks (standard library only).
+
+An .xlsx file is a zip archive of XML parts:
+
+    xl/workbook.xml              sheet names and relationship ids
+    xl/_rels/workbook.xml.rels   relationship id -> worksheet part
+    xl/sharedStrings.xml         the workbook's string table
+    xl/worksheets/sheet1.xml     <row><c r="A1" t="s"><v>0</v></c>...</row>
+
+Worksheets are read straight from the archive with iterparse and every row
+is cleared after it is yielded, so a large sheet is never held in memory;
+only the shared string table is (Excel stores each distinct string once).
+Cell values are returned as strings: shared and inline strings as written,
+booleans as TRUE/FALSE and numbers without a trailing '.0'. Formulas yield
+their cached value.
+"""
+
+import posixpath
+import xml.etree.ElementTree as ET
+import zipfile
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _column_index(reference):
+    """Zero-based column of a cell reference ('C7' -> 2)."""
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def _sheet_parts(archive):
+    """Ordered (sheet name, worksheet part) pairs of a workbook."""
+    rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for rel in rels.iter(f'{PACKAGE_REL_NS}Relationship'):
+        target = rel.get('Target', '')
+        targets[rel.get('Id')] = target.lstrip('/') if target.startswith('/') else posixpath.normpath(
+            posixpath.join('xl', target))
+    workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+    return [(sheet.get('name'), targets.get(sheet.get(f'{REL_NS}id'), ''))
+            for sheet in workbook.iter(f'{MAIN_NS}sheet')]
+
+
+def _shared_strings(archive):
+    """The shared string table (rich text runs joined, phonetic hints dropped)."""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    si_tag, t_tag, r_tag = f'{MAIN_NS}si', f'{MAIN_NS}t', f'{MAIN_NS}r'
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, element in ET.iterparse(f):
+            if element.tag != si_tag:
+                continue
+            # Plain <t>, or rich text runs <r><t>; <rPh> phonetic runs are skipped
+            parts = []
+            for child in element:
+                if child.tag == t_tag:
+                    parts.append(child.text or '')
+                elif child.tag == r_tag:
+                    parts.extend(t.text or '' for t in child if t.tag == t_tag)
+            strings.append(''.join(parts))
+            element.clear()
+    return strings
+
+
+def _cell_value(cell, strings):
+    kind = cell.get('t', 'n')
+    if kind == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(f'{MAIN_NS}t'))
+    value = cell.find(f'{MAIN_NS}v')
+    text = value.text if value is not None and value.text is not None else ''
+    if kind == 's' and text:
+        return strings[int(text)]
+    if kind == 'b':
+        return 'TRUE' if text == '1' else 'FALSE'
+    if kind == 'n' and text.endswith('.0'):
+        return text[:-2]
+    return text
+
+
+def sheet_names(path):
+    """Names of the worksheets in a workbook, in workbook order."""
+    with zipfile.ZipFile(path) as archive:
+        return [name for name, _ in _sheet_parts(archive)]
+
+
+def iter_sheet_rows(path, sheet=None):
+    """
+    Yield the rows of one worksheet as lists of strings.
+
+    Args:
+        path: Path to the .xlsx file
+        sheet: Sheet name (default: the first sheet)
+
+    Missing cells in a row are returned as ''; empty rows are skipped.
+    """
+    with zipfile.ZipFile(path) as archive:
+        parts = _sheet_parts(archive)
+        if sheet is None:
+            part = parts[0][1] if parts else ''
+        else:
+            part = dict(parts).get(sheet)
+            if part is None:
+                raise KeyError(f"no sheet named {sheet!r} in {path}")
+        strings = _shared_strings(archive)
+
+        sheet_data = None
+        with archive.open(part) as f:
+            for event, element in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == f'{MAIN_NS}sheetData':
+                        sheet_data = element
+                    continue
+                if element.tag != f'{MAIN_NS}row':
+                    continue
+                cells = []
+                for cell in element.iter(f'{MAIN_NS}c'):
+                    reference = cell.get('r')
+                    index = _column_index(reference) if reference else len(cells)
+                    if index > len(cells):
+                        cells.extend([''] * (index - len(cells)))
+                    cells.append(_cell_value(cell, strings))
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+                if any(cells):
+                    yield cells